@@ -173,6 +173,67 @@ app.get('/dashboard', requireAuth,(req, res) => {
 //    }
 //});
 
+// Static JSON Shards
+// Serves the homepage carousel endpoints from the precompressed files written by
+// "auto insert to db/export_static_json.py" (listed in public/data/manifest.json).
+// Falls through to the regular database-backed routes when no shard exists.
+const shardDirectory = path.join(publicDirectory, 'data');
+const shardManifestPath = path.join(shardDirectory, 'manifest.json');
+const shardRoutes = [
+    '/anime/animespotlight-animes',
+    '/anime/new-animes',
+    '/anime/upcoming-animes',
+    '/anime/recommended-animes',
+    '/anime/all-tags',
+];
+let shardManifest = {};
+
+function loadShardManifest() {
+    try {
+        shardManifest = JSON.parse(fs.readFileSync(shardManifestPath, 'utf8'));
+    } catch (err) {
+        shardManifest = {};
+    }
+}
+
+loadShardManifest();
+fs.watchFile(shardManifestPath, { interval: 5000 }, loadShardManifest);
+
+app.get(shardRoutes, (req, res, next) => {
+    const shard = shardManifest[req.path];
+    if (!shard) return next();
+
+    const accepted = req.headers['accept-encoding'] || '';
+    let encoding = 'identity';
+    if (shard.encodings.br && accepted.includes('br')) {
+        encoding = 'br';
+    } else if (shard.encodings.gzip && accepted.includes('gzip')) {
+        encoding = 'gzip';
+    }
+    const shardFile = path.join(shardDirectory, shard.encodings[encoding]);
+    // Check before setting any header, so the database route never inherits this shard's ETag/encoding.
+    if (!fs.existsSync(shardFile)) return next();
+
+    res.setHeader('ETag', shard.etag);
+    res.setHeader('Cache-Control', 'public, max-age=60');
+    res.setHeader('Vary', 'Accept-Encoding');
+    if (req.headers['if-none-match'] === shard.etag) {
+        return res.status(304).end();
+    }
+
+    if (encoding !== 'identity') {
+        res.setHeader('Content-Encoding', encoding);
+    }
+    res.type('application/json');
+    res.sendFile(shardFile, { etag: false, lastModified: false }, (err) => {
+        if (err && !res.headersSent) {
+            // Unreadable (or removed since the check): fall back to the database route with clean headers.
+            ['ETag', 'Cache-Control', 'Vary', 'Content-Encoding', 'Content-Type'].forEach((header) => res.removeHeader(header));
+            next();
+        }
+    });
+});
+
 // Route Declarations
 // Mounts the authentication routes (login, register, etc.) on both the root ('/') and '/auth' paths.
 app.use('/', require('./routes/auth'));
@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import tqdm
+from db_connection import get_connection
+from jikan_http import JikanSession, JIKAN_ROOT
+from autoinsert3 import STATUS_MAP, map_score_to_rating, episode_count
+
+# Refreshes status, episodes, air dates and rating of the anime that can still
+# change (status Airing / Upcoming) without crawling the whole top/anime list.
+#
+#   1. the seasons/now and seasons/upcoming listings (a few pages each)
+#   2. one anime/{mal_id} lookup per Airing/Upcoming row that is in neither
+#      listing (finished shows, delayed premieres, leftovers of older seasons)
+#
+# Only rows whose values actually differ are written, one UPDATE ... WHERE
+# AnimeID = N per row, to refresh_airing.sql or straight to the database with
+# --apply. Anime in the season listings that the database doesn't have yet are
+# only reported; autoinsert3.py --delta adds them.
+#
+# Needs the mal_id column (see autoinsert3.py --delta).
+#
+# Usage:
+#   python airing_refresh.py
+#   python airing_refresh.py --apply
+
+SEASON_URLS = {'now': f"{JIKAN_ROOT}/seasons/now", 'upcoming': f"{JIKAN_ROOT}/seasons/upcoming"}
+ANIME_URL = f"{JIKAN_ROOT}/anime/{{}}"
+MAX_CONCURRENT_REQUESTS = 3
+OUTPUT_FILE = 'refresh_airing.sql'
+REFRESH_COLUMNS = ['status', 'episodes', 'airing_start', 'airing_end', 'rating']
+
+async def fetch_json(session, url, params, semaphore):
+    """GET with in-place 429 retries (see autoinsert3.fetch_page). Returns (status, payload)."""
+    async with semaphore:
+        while True:
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status == 429:
+                        await asyncio.sleep(2)
+                        continue
+                    if response.status != 200:
+                        return response.status, None
+                    payload = await response.json()
+                    await asyncio.sleep(0.5)
+                    return 200, payload
+            except Exception as e:
+                print(f"⚠️ Error on {url}: {e}")
+                return None, None
+
+async def fetch_listing(session, url, semaphore):
+    params = {'page': 1, 'sfw': 'true'}
+    status, first = await fetch_json(session, url, params, semaphore)
+    if first is None:
+        print(f"❌ Failed to fetch {url}: {status}")
+        return []
+    anime = list(first.get('data', []))
+    last_page = first.get('pagination', {}).get('last_visible_page', 1)
+    pages = await asyncio.gather(*(fetch_json(session, url, {'page': page, 'sfw': 'true'}, semaphore)
+                                   for page in range(2, last_page + 1)))
+    for page, (status, payload) in enumerate(pages, start=2):
+        if payload is None:
+            print(f"❌ Failed to fetch {url} page {page}: {status}")
+            continue
+        anime.extend(payload.get('data', []))
+    return anime
+
+async def fetch_anime(session, mal_id, semaphore):
+    status, payload = await fetch_json(session, ANIME_URL.format(mal_id), None, semaphore)
+    return mal_id, status, (payload or {}).get('data')
+
+def refresh_values(anime):
+    """The REFRESH_COLUMNS of one Jikan anime, as Python values comparable to the DB row."""
+    aired = anime.get('aired') or {}
+    start, end = aired.get('from'), aired.get('to')
+    return {
+        'status': STATUS_MAP.get(anime.get('status'), 'Upcoming'),
+        'episodes': episode_count(anime),
+        'airing_start': start[:10] if start else None,
+        'airing_end': end[:10] if end else None,
+        'rating': int(map_score_to_rating(anime.get('score'))),
+    }
+
+def load_rows(conn, where, params=()):
+    """{mal_id: (AnimeID, {column: value})} for the anime matching `where`."""
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT AnimeID, mal_id, {', '.join(REFRESH_COLUMNS)} FROM anime WHERE {where}", params)
+        rows = {}
+        for anime_id, mal_id, *values in cursor.fetchall():
+            stored = dict(zip(REFRESH_COLUMNS, values))
+            for column in ('airing_start', 'airing_end'):
+                if stored[column] is not None:
+                    stored[column] = stored[column].isoformat()
+            rows[mal_id] = (anime_id, stored)
+    return rows
+
+def sql_value(value):
+    return 'NULL' if value is None else (str(value) if isinstance(value, int) else f"'{value}'")
+
+def build_updates(rows, fresh):
+    """One (AnimeID, {column: new value}) per row whose refreshed values differ from the stored ones."""
+    updates = []
+    for mal_id, (anime_id, stored) in rows.items():
+        anime = fresh.get(mal_id)
+        if anime is None:
+            continue
+        changed = {c: v for c, v in refresh_values(anime).items() if stored[c] != v}
+        if changed:
+            updates.append((anime_id, changed))
+    return sorted(updates)
+
+def update_statement(anime_id, changed):
+    return f"UPDATE anime SET {', '.join(f'{c} = {sql_value(v)}' for c, v in changed.items())} WHERE AnimeID = {anime_id};"
+
+async def fetch_fresh(tracked_ids):
+    """Season listings plus per-ID lookups for tracked anime missing from them. Returns ({mal_id: anime}, gone, requests)."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    fresh = {}
+    async with JikanSession() as session:
+        for name, url in SEASON_URLS.items():
+            listing = await fetch_listing(session, url, semaphore)
+            print(f"📅 seasons/{name}: {len(listing)} anime")
+            for anime in listing:
+                fresh.setdefault(anime.get('mal_id'), anime)
+
+        missing = sorted(tracked_ids - fresh.keys())
+        gone = []
+        tasks = [fetch_anime(session, mal_id, semaphore) for mal_id in missing]
+        for f in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="🔎 Looking up by ID", unit="anime"):
+            mal_id, status, anime = await f
+            if anime:
+                fresh[mal_id] = anime
+            elif status == 404:
+                gone.append(mal_id)
+    return fresh, gone, len(missing)
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh Airing/Upcoming anime from the Jikan season listings.")
+    parser.add_argument('--apply', action='store_true', help="Run the updates against the database instead of writing them to a file")
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        tracked = load_rows(conn, "status IN ('Airing', 'Upcoming') AND mal_id IS NOT NULL")
+        print(f"📺 {len(tracked)} Airing/Upcoming anime in the database.")
+
+        fresh, gone, lookups = asyncio.run(fetch_fresh(set(tracked)))
+        print(f"🌐 {lookups} per-ID lookups for anime outside the season listings.")
+
+        # Season entries we store under another status (e.g. marked Completed too early).
+        others = sorted(m for m in fresh.keys() - tracked.keys() if m is not None)
+        rows = dict(tracked)
+        if others:
+            rows.update(load_rows(conn, f"mal_id IN ({', '.join(['%s'] * len(others))})", others))
+        unknown = len(fresh.keys() - rows.keys())
+
+        updates = build_updates(rows, fresh)
+        print(f"🔍 {len(updates)} anime changed, {unknown} in the season listings are not in the database (run autoinsert3.py --delta).")
+        if gone:
+            print(f"⚠️ {len(gone)} tracked anime no longer exist on MyAnimeList: {', '.join(map(str, gone[:10]))}{' ...' if len(gone) > 10 else ''}")
+
+        if args.apply:
+            if updates:
+                with conn.cursor() as cursor:
+                    for anime_id, changed in tqdm.tqdm(updates, desc="💾 Applying updates", unit="row"):
+                        cursor.execute(update_statement(anime_id, changed))
+                conn.commit()
+        else:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write("START TRANSACTION;\n")
+                for anime_id, changed in updates:
+                    f.write(update_statement(anime_id, changed) + "\n")
+                f.write("COMMIT;\n")
+            print(f"💾 Updates written to {args.output}")
+    finally:
+        conn.close()
+
+    print("✅ All done!")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,26 @@
-import aiohttp
+import argparse
 import asyncio
 import tqdm
 import os
+import json
+import re
 from collections import defaultdict
+from collation import collation_key, CollationMap
+from jikan_http import JikanSession
+from jikan_decode import decode_page
+from catalog_store import AnimeRecord, date_to_int, date_literal
+from profiling import Profiler, add_profile_argument
+import delta_seed
+from id_registry import IdRegistry, REGISTRY_FILE
 
 # GLOBAL CONFIGURATION
 MAX_CONCURRENT_REQUESTS = 3
 BASE_URL = "https://api.jikan.moe/v4/top/anime"
+SYNOPSIS_SHORT_CHARS = 200 # Character budget for synopsis_short (list views)
+MIRROR_IMAGES = False # Download images and build local thumbnails (see image_mirror.py)
+IMAGE_PLACEHOLDERS = False # Compute blurhash/dominant color/aspect ratio (see image_placeholders.py)
+RAW_SNAPSHOT_FILE = "raw_anime_snapshot.json" # Raw Jikan payload, reused by offline jobs
+COLUMNAR_CATALOG = True # Also write catalog/*.arrow and *.parquet for offline jobs (see catalog_columnar.py, needs pyarrow)
 
 # --- HELPER FUNCTIONS ---
 
@@ -81,49 +95,63 @@ def generate_tag_map_fallback(sql_file):
 def map_score_to_rating(score):
     return str(round(score)) if score else '5'
 
+def episode_count(anime):
+    """Jikan reports an unknown episode count as null or 0, both are stored as NULL."""
+    return anime.get('episodes') or None
+
+SENTENCE_END = re.compile(r'[.!?]["\')\]]*(?=\s)')
+
+def shorten_synopsis(text, budget=SYNOPSIS_SHORT_CHARS):
+    """
+    Truncates a synopsis to at most `budget` characters for list views.
+    Cuts at the last sentence end that fits; if that would drop more than
+    half of the budget, cuts at the last word boundary and adds an ellipsis.
+    """
+    if not text:
+        return ''
+    text = ' '.join(text.split())
+    if len(text) <= budget:
+        return text
+
+    # One extra character so a sentence ending exactly at the budget still
+    # sees the whitespace that follows it.
+    window = text[:budget + 1]
+    cut = 0
+    for match in SENTENCE_END.finditer(window):
+        cut = match.end()
+    if cut >= budget // 2:
+        return text[:cut]
+
+    words = text[:budget - 1].rsplit(' ', 1)[0]
+    return words.rstrip(',;:-') + '…'
+
 def sanitize(text):
     # Standard SQL escape for single quotes
     return text.replace("'", "''") if text else ''
 
-# --- ASYNC NETWORK FUNCTIONS ---
+# --- TRANSFORM / OUTPUT ---
 
-async def fetch_page(session, page, semaphore):
-    async with semaphore:
-        # 'sfw': 'true' filters out Adult content on the API side
-        params = {'page': page, 'sfw': 'true'}
-        try:
-            async with session.get(BASE_URL, params=params) as response:
-                if response.status == 429:
-                    print(f"⚠️ Rate limit hit on page {page}. Cooling down...")
-                    await asyncio.sleep(2)
-                    return await fetch_page(session, page, semaphore)
-                
-                if response.status != 200:
-                    print(f"❌ Failed to fetch page {page}: {response.status}")
-                    return []
-
-                payload = await response.json()
-                await asyncio.sleep(0.5)
-                return payload.get('data', [])
-        except Exception as e:
-            print(f"⚠️ Error on page {page}: {e}")
-            return []
-
-async def get_pagination_limit():
-    async with aiohttp.ClientSession() as session:
-        params = {'page': 1, 'sfw': 'true'}
-        async with session.get(BASE_URL, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                return data['pagination']['last_visible_page']
-            return 1
-
-# --- MAIN LOGIC ---
+def live_anime_rows():
+    """Rows in the target database's anime table, or None if it cannot be reached (or has no anime table)."""
+    try:
+        from db_connection import get_connection
+        conn = get_connection()
+    except Exception:
+        return None
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM anime")
+            return cursor.fetchone()[0]
+    except Exception:
+        return None
+    finally:
+        conn.close()
 
-async def main():
-    print("🚀 Starting Auto-Insert Process (Async Mode)")
-    
-    # 1. LOAD MAPS (Priority: TXT -> Fallback: SQL)
+def load_maps():
+    """
+    Loads studio_map / tag_map (Priority: TXT -> Fallback: SQL).
+    Returns (None, None) if either is missing.
+    """
     studio_map = load_map_from_text('studio_map.txt', 'studio_map')
     if not studio_map:
         print("⚠️ studio_map.txt not found. Attempting to parse SQL...")
@@ -138,144 +166,346 @@ async def main():
         print("\n❌ CRITICAL ERROR: Could not load Studio or Tag maps.")
         print("   Please ensure 'studio_map.txt' and 'tag_map.txt' exist.")
         print("   (Or provide 'studio_inserts.sql' and 'insert_tags.sql' as fallback).")
-        return
+        return None, None
 
-    print(f"✅ Loaded {len(studio_map)} Studios and {len(tag_map)} Tags.")
+    # Names are matched like MySQL would (case/accent-insensitive) when there is no exact hit.
+    return CollationMap(studio_map), CollationMap(tag_map)
 
-    # 2. CHECK PAGES
-    print("🔍 Checking total pages available...")
-    total_pages = await get_pagination_limit()
-    print(f"📄 Found {total_pages} pages. Starting parallel fetch...")
+def load_studio_mal_ids():
+    """{studio mal_id: StudioID} from the ID registry ({} without one)."""
+    if not os.path.exists(REGISTRY_FILE):
+        return {}
+    with IdRegistry() as registry:
+        return dict(registry.index('studio').by_mal_id)
 
-    # 3. FETCH DATA
-    all_anime_data = []
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
-    
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for page in range(1, total_pages + 1):
-            tasks.append(fetch_page(session, page, semaphore))
-        
-        for f in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="🚀 Downloading Pages", unit="page"):
-            page_data = await f
-            all_anime_data.extend(page_data)
+ANIME_COLUMNS = "mal_id, title, type, episodes, status, airing_start, airing_end, rating, synopsis, synopsis_short, StudioID, image_url"
+VALID_TYPES = ['TV', 'Movie', 'ONA', 'OVA', 'Special']
+STATUS_MAP = {'Currently Airing': 'Airing', 'Finished Airing': 'Completed', 'Not yet aired': 'Upcoming'}
 
-    print(f"📥 Download complete. Processing {len(all_anime_data)} anime entries...")
+def transform_anime(anime, studio_map, tag_map, seen_titles, studio_mal_ids=None):
+    """
+    Turns one raw Jikan anime entry into an AnimeRecord (see catalog_store.py).
+    Returns (record, None) for accepted anime and (None, skip_reason) for
+    skipped ones. `seen_titles` holds collation keys of the titles accepted so
+    far and is updated in place. `studio_mal_ids` ({mal_id: StudioID}) is tried
+    before the name lookup in `studio_map`.
+    """
+    title = anime.get('title') or ''
 
-    # 4. PROCESS DATA
-    skipped_animes = []
-    anime_insert_values = []
-    anime_tags_insert_values = []
-    seen_titles = set()
-    anime_id_counter = 1
+    # anime.title is UNIQUE under utf8mb4_0900_ai_ci, so dedupe the way MySQL compares.
+    title_key = collation_key(title)
+    if title_key in seen_titles:
+        return None, f"{title} - Duplicate title"
+    seen_titles.add(title_key)
 
-    for anime in tqdm.tqdm(all_anime_data, desc="⚙️ Processing Data", colour="green"):
-        title = sanitize(anime.get('title'))
+    type_ = anime.get('type')
+    if type_ == 'Music':
+        return None, f"{title} - Type: Music"
 
-        if title in seen_titles:
-            skipped_animes.append(f"{title} - Duplicate title")
-            continue
-        seen_titles.add(title)
+    if type_ in ['TV Special', 'PV', 'CM']:
+        type_ = 'Special'
 
-        type_ = anime.get('type')
-        if type_ == 'Music':
-            skipped_animes.append(f"{title} - Type: Music")
-            continue
+    if type_ not in VALID_TYPES:
+        return None, f"{title} - Invalid type: {type_}"
 
-        if type_ in ['TV Special', 'PV', 'CM']:
-            type_ = 'Special'
+    status = STATUS_MAP.get(anime.get('status'), 'Upcoming')
 
-        if type_ not in ['TV', 'Movie', 'ONA', 'OVA', 'Special']:
-            skipped_animes.append(f"{title} - Invalid type: {type_}")
-            continue
+    start = anime.get('aired', {}).get('from')
+    end = anime.get('aired', {}).get('to')
 
-        status_map = {'Currently Airing': 'Airing', 'Finished Airing': 'Completed', 'Not yet aired': 'Upcoming'}
-        status = status_map.get(anime.get('status'), 'Upcoming')
+    episodes = episode_count(anime)
+    score = anime.get('score')
+    rating = int(map_score_to_rating(score))
+    synopsis = anime.get('synopsis') or ''
+    image_url = anime.get('images', {}).get('jpg', {}).get('image_url', '')
 
-        start = anime.get('aired', {}).get('from')
-        end = anime.get('aired', {}).get('to')
-        airing_start = f"'{start[:10]}'" if start else 'NULL'
-        airing_end = f"'{end[:10]}'" if end else 'NULL'
-        
-        episodes = anime.get('episodes') or 'NULL'
-        score = anime.get('score')
-        rating = map_score_to_rating(score)
-        synopsis = sanitize(anime.get('synopsis') or '')
-        image_url = sanitize(anime.get('images', {}).get('jpg', {}).get('image_url', ''))
-
-        # Studio Mapping
-        studios = anime.get('studios')
-        if not studios:
-            skipped_animes.append(f"{title} - No studio")
-            continue
-        
-        studio_name = studios[0]['name']
-        
-        # Try direct match
-        StudioID = studio_map.get(studio_name)
-        
-        # Try unescaped match (if API has "Brain's Base" but map has it differently)
-        if not StudioID and "'" in studio_name:
-             StudioID = studio_map.get(studio_name.replace("'", "''"))
+    # Studio Mapping
+    studios = anime.get('studios')
+    if not studios:
+        return None, f"{title} - No studio"
+    
+    studio_name = studios[0]['name']
+    
+    # Match by mal_id first, the name can differ from the one the studio was registered under
+    StudioID = (studio_mal_ids or {}).get(studios[0].get('mal_id'))
 
-        if not StudioID:
-            skipped_animes.append(f"{title} - Unknown studio: {studio_name}")
+    # Try direct match
+    if not StudioID:
+        StudioID = studio_map.get(studio_name)
+    
+    # Try unescaped match (if API has "Brain's Base" but map has it differently)
+    if not StudioID and "'" in studio_name:
+         StudioID = studio_map.get(studio_name.replace("'", "''"))
+
+    if not StudioID:
+        return None, f"{title} - Unknown studio: {studio_name}"
+
+    # Tag Mapping
+    genres = anime.get('genres', [])
+    themes = anime.get('themes', [])
+    genre_names = [g['name'] for g in genres]
+    theme_names = [t['name'] for t in themes]
+    all_tags = genre_names + theme_names
+
+    # Safety Check
+    if any(x in all_tags for x in ['Hentai', 'NSFW', 'Erotica']):
+        return None, f"{title} - Skipped due to NSFW tags"
+
+    tag_ids = [tag_map[tag_name] for tag_name in all_tags if tag_name in tag_map]
+    if not tag_ids:
+        if 'NO TAGS' in tag_map:
+            tag_ids = [tag_map['NO TAGS']]
+
+    return AnimeRecord(anime.get('mal_id'), title, type_, status, episodes, date_to_int(start), date_to_int(end),
+                       rating, synopsis, StudioID, image_url, tag_ids), None
+
+def record_fields(record):
+    """SQL literals for ANIME_COLUMNS (plus the record's extra image columns), built when the row is written."""
+    return [
+        f"{record.mal_id or 'NULL'}", f"'{sanitize(record.title)}'", f"'{record.type}'", f"{record.episodes or 'NULL'}",
+        f"'{record.status}'", date_literal(record.airing_start), date_literal(record.airing_end), f"'{record.rating}'",
+        f"'{sanitize(record.synopsis)}'", f"'{sanitize(shorten_synopsis(record.synopsis))}'", f"{record.studio_id}",
+        f"'{sanitize(record.image_url)}'", *record.extra,
+    ]
+
+def write_anime_inserts(f, anime_columns, records, first_id=1, anime_ids=None):
+    """
+    Writes the Anime INSERTs for a batch of AnimeRecords plus one Anime_Tags
+    INSERT for their tags. Can be called repeatedly on the same file to stream
+    a large catalog in chunks (pass the running `first_id`); the caller writes
+    START TRANSACTION / COMMIT.
+    With `anime_ids` (from id_registry) every row gets its permanent AnimeID
+    explicitly instead of the next AUTO_INCREMENT value.
+    """
+    tag_values = []
+    for curr_id, record in enumerate(records, start=first_id):
+        fields = record_fields(record)
+        if anime_ids:
+            anime_id = anime_ids[curr_id - first_id]
+            f.write(f"INSERT INTO Anime (AnimeID, {anime_columns}) VALUES ({anime_id}, {', '.join(fields)});\n")
+            tag_values.extend(f"({anime_id}, {tag_id})" for tag_id in record.tag_ids)
             continue
+        f.write(f"INSERT INTO Anime ({anime_columns}) VALUES ({', '.join(fields)});\n")
+        f.write(f"SET @anime_id_{curr_id} = LAST_INSERT_ID();\n")
+        tag_values.extend(f"(@anime_id_{curr_id}, {tag_id})" for tag_id in record.tag_ids)
 
-        # Tag Mapping
-        genres = anime.get('genres', [])
-        themes = anime.get('themes', [])
-        genre_names = [g['name'] for g in genres]
-        theme_names = [t['name'] for t in themes]
-        all_tags = genre_names + theme_names
+    if tag_values:
+        f.write("\nINSERT INTO Anime_Tags (AnimeID, TagID) VALUES\n")
+        f.write(",\n".join(tag_values) + ";\n")
 
-        # Safety Check
-        if any(x in all_tags for x in ['Hentai', 'NSFW', 'Erotica']):
-            skipped_animes.append(f"{title} - Skipped due to NSFW tags")
-            continue
+# --- ASYNC NETWORK FUNCTIONS ---
+
+async def fetch_page(session, page, semaphore):
+    async with semaphore:
+        # 'sfw': 'true' filters out Adult content on the API side
+        params = {'page': page, 'sfw': 'true'}
+        # Retry in a loop: retrying by recursion re-acquired the semaphore while
+        # still holding it and deadlocked once every slot was cooling down.
+        while True:
+            try:
+                async with session.get(BASE_URL, params=params) as response:
+                    if response.status == 429:
+                        print(f"⚠️ Rate limit hit on page {page}. Cooling down...")
+                        await asyncio.sleep(2)
+                        continue
+
+                    if response.status != 200:
+                        print(f"❌ Failed to fetch page {page}: {response.status}")
+                        return []
+
+                    # Only the fields the pipeline reads are decoded (jikan_decode.py).
+                    payload = decode_page(await response.read())
+                    await asyncio.sleep(0.5)
+                    return payload.get('data') or []
+            except Exception as e:
+                print(f"⚠️ Error on page {page}: {e}")
+                return []
+
+async def fetch_numbered_page(session, page, semaphore):
+    return page, await fetch_page(session, page, semaphore)
+
+async def get_pagination_limit():
+    async with JikanSession() as session:
+        params = {'page': 1, 'sfw': 'true'}
+        while True:
+            async with session.get(BASE_URL, params=params) as response:
+                if response.status == 429:
+                    await asyncio.sleep(2)
+                    continue
+                if response.status == 200:
+                    data = await response.json()
+                    return data['pagination']['last_visible_page']
+                return 1
 
-        tag_ids = [tag_map[tag_name] for tag_name in all_tags if tag_name in tag_map]
-        if not tag_ids:
-            if 'NO TAGS' in tag_map:
-                tag_ids = [tag_map['NO TAGS']]
+# --- MAIN LOGIC ---
 
-        # Build SQL
-        anime_insert_values.append(
-            f"('{title}', '{type_}', {episodes}, '{status}', {airing_start}, {airing_end}, '{rating}', '{synopsis}', {StudioID}, '{image_url}')"
-        )
+async def main(profiler, delta=False, from_snapshot=False):
+    print("🚀 Starting Auto-Insert Process (Async Mode)")
+    
+    # 1. LOAD MAPS (Priority: TXT -> Fallback: SQL)
+    studio_map, tag_map = load_maps()
+    if not studio_map:
+        return
 
-        for tag_id in tag_ids:
-            anime_tags_insert_values.append(f"(@anime_id_{anime_id_counter}, {tag_id})")
+    studio_mal_ids = load_studio_mal_ids()
+    print(f"✅ Loaded {len(studio_map)} Studios and {len(tag_map)} Tags.")
+    profiler.checkpoint("load_maps")
+
+    if from_snapshot:
+        # Crawled beforehand, e.g. by crawl_coordinator.py
+        with open(RAW_SNAPSHOT_FILE, "r", encoding="utf-8") as f:
+            all_anime_data = json.load(f)
+        print(f"📂 Loaded {len(all_anime_data)} anime entries from {RAW_SNAPSHOT_FILE}.")
+        profiler.checkpoint("load_snapshot")
+    else:
+        # 2. CHECK PAGES
+        print("🔍 Checking total pages available...")
+        total_pages = await get_pagination_limit()
+        print(f"📄 Found {total_pages} pages. Starting parallel fetch...")
+
+        # 3. FETCH DATA
+        pages = {}
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async with JikanSession() as session:
+            tasks = []
+            for page in range(1, total_pages + 1):
+                tasks.append(fetch_numbered_page(session, page, semaphore))
+
+            for f in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="🚀 Downloading Pages", unit="page"):
+                page, page_data = await f
+                pages[page] = page_data
+
+        # Flatten in page order, not completion order, so rows (and AnimeIDs) keep the API rank order.
+        all_anime_data = [anime for page in sorted(pages) for anime in pages[page]]
+        print(f"📥 Download complete. Processing {len(all_anime_data)} anime entries...")
+
+        # Keep the raw payload so offline jobs can reuse it without another crawl.
+        with open(RAW_SNAPSHOT_FILE, "w", encoding="utf-8") as f:
+            json.dump(all_anime_data, f)
+        profiler.checkpoint("fetch")
 
-        anime_id_counter += 1
+    # 4. PROCESS DATA
+    skipped_animes = []
+    records = []
+    seen_titles = set()
 
-    # 5. WRITE FILES
+    for anime in tqdm.tqdm(all_anime_data, desc="⚙️ Processing Data", colour="green"):
+        record, skip_reason = transform_anime(anime, studio_map, tag_map, seen_titles, studio_mal_ids)
+        if skip_reason:
+            skipped_animes.append(skip_reason)
+            continue
+        records.append(record)
+
+    # Later stages only need the compact records (catalog_store.py), not the raw payload.
+    del all_anime_data
+    profiler.checkpoint("transform")
+
+    # 5. IMAGE STAGES (optional)
+    anime_columns = ANIME_COLUMNS
+    count = len(records)
+    accepted_image_urls = [record.image_url for record in records]
+
+    if MIRROR_IMAGES:
+        from image_mirror import mirror_images
+        print("🖼️ Mirroring images locally...")
+        mirrored = await mirror_images(accepted_image_urls)
+        anime_columns += ", image_local, image_width, image_height"
+        image_manifest = []
+        for record in records:
+            url = record.image_url
+            info = mirrored.get(url)
+            if info:
+                record.extra += (f"'{info['card']}'", f"{info['width']}", f"{info['height']}")
+            else:
+                record.extra += ('NULL', 'NULL', 'NULL')
+            image_manifest.append({'image_url': url, **(info or {})})
+
+        with open(f"image_manifest_{count}.json", "w", encoding="utf-8") as f:
+            json.dump(image_manifest, f)
+
+    if IMAGE_PLACEHOLDERS:
+        from image_placeholders import compute_placeholders
+        print("🎨 Computing image placeholders...")
+        placeholders = await compute_placeholders(accepted_image_urls)
+        anime_columns += ", image_blurhash, image_color, image_aspect"
+        for record in records:
+            info = placeholders.get(record.image_url)
+            if info:
+                record.extra += (f"'{sanitize(info['blurhash'])}'", f"'{info['color']}'", f"{info['aspect_ratio']}")
+            else:
+                record.extra += ('NULL', 'NULL', 'NULL')
+
+    if MIRROR_IMAGES or IMAGE_PLACEHOLDERS:
+        profiler.checkpoint("images")
+
+    # 6. WRITE FILES
     print("💾 Writing logs and SQL files...")
     
     # Dynamic Filename Logic
-    count = len(anime_insert_values)
     output_filename = f"insert_anime_{count}.sql"
     
     with open("skipped_animes.txt", "w", encoding="utf-8") as log_file:
         log_file.write("Skipped Anime Log:\n")
         log_file.write("\n".join(skipped_animes))
 
-    with open(output_filename, "w", encoding="utf-8") as f:
-        f.write("START TRANSACTION;\n")
-        curr_id = 1
-        for val in anime_insert_values:
-            f.write(f"INSERT INTO Anime (title, type, episodes, status, airing_start, airing_end, rating, synopsis, StudioID, image_url) VALUES {val};\n")
-            f.write(f"SET @anime_id_{curr_id} = LAST_INSERT_ID();\n")
-            curr_id += 1
-
-        if anime_tags_insert_values:
-            f.write("\nINSERT INTO Anime_Tags (AnimeID, TagID) VALUES\n")
-            f.write(",\n".join(anime_tags_insert_values) + ";\n")
-
-        f.write("COMMIT;\n")
-
-    print(f"✅ Anime insert script generated as: {output_filename}")
+    # Permanent AnimeIDs: an anime keeps its ID across runs, new ones are appended.
+    with IdRegistry() as registry:
+        live_rows = None if registry.index('anime').names else live_anime_rows()
+        if live_rows:
+            # Fresh registry IDs would not match the rows (and watchlists) already in the database.
+            print(f"⚠️ {REGISTRY_FILE} has no anime but the database already has {live_rows}. "
+                  "Run `python id_registry.py --import-db` once; using AUTO_INCREMENT AnimeIDs for now.")
+            anime_ids = None
+        else:
+            anime_ids = [registry.resolve('anime', record.title, record.mal_id) for record in records]
+        studio_names = registry.name_map('studio') or studio_map
+        tag_names = registry.name_map('tag') or tag_map
+
+    state = delta_seed.build_state(records, record_fields)
+
+    if delta:
+        previous = delta_seed.load_state()
+        new, changed, removed = delta_seed.diff_state(previous, state)
+        print(f"🔁 Delta vs previous snapshot: {len(new)} new, {len(changed)} changed, {len(removed)} removed")
+        if previous and len(removed) > len(previous) * delta_seed.MAX_DELETE_FRACTION:
+            print(f"⚠️ {len(removed)} anime missing from this crawl, more than {delta_seed.MAX_DELETE_FRACTION:.0%}. Not deleting any (failed pages?).")
+            # Keep their hashes so they are not reported as new once the crawl sees them again.
+            state.update({mal_id: previous[mal_id] for mal_id in removed})
+            removed = set()
+
+        with open(delta_seed.DELTA_FILE, "w", encoding="utf-8") as f:
+            delta_seed.write_delta(f, anime_columns, records, record_fields, new | changed, removed, anime_ids)
+        print(f"✅ Delta script generated as: {delta_seed.DELTA_FILE}")
+    else:
+        with open(output_filename, "w", encoding="utf-8") as f:
+            f.write("START TRANSACTION;\n")
+            write_anime_inserts(f, anime_columns, records, anime_ids=anime_ids)
+            f.write("COMMIT;\n")
+        print(f"✅ Anime insert script generated as: {output_filename}")
+
+    delta_seed.save_state(state)
     print(f"📦 Total Entries: {count}")
+    profiler.checkpoint("write_sql")
+
+    # 7. COLUMNAR CATALOG (optional)
+    if COLUMNAR_CATALOG:
+        import catalog_columnar
+        if catalog_columnar.pa is None:
+            print("⚠️ pyarrow not installed, skipping the columnar catalog.")
+        elif anime_ids is None:
+            print("⚠️ No registry AnimeIDs, skipping the columnar catalog.")
+        else:
+            # The full catalog, also in --delta mode.
+            rows = catalog_columnar.write_catalog(records, anime_ids, studio_names, tag_names)
+            print(f"🗂️ Columnar catalog written to {catalog_columnar.CATALOG_DIR}/: " + ', '.join(f"{name} {n}" for name, n in rows.items()))
+            profiler.checkpoint("write_catalog")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fetch the Jikan top anime catalog and generate insert_anime_{count}.sql.")
+    parser.add_argument('--delta', action='store_true', help=f"Write only new/changed/removed anime to {delta_seed.DELTA_FILE} (compared with {delta_seed.STATE_FILE})")
+    parser.add_argument('--from-snapshot', action='store_true', help=f"Skip the crawl and process {RAW_SNAPSHOT_FILE} (see crawl_coordinator.py)")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    with Profiler(args.profile, "autoinsert3") as profiler:
+        asyncio.run(main(profiler, delta=args.delta, from_snapshot=args.from_snapshot))
\ No newline at end of file
@@ -0,0 +1,53 @@
+import argparse
+import tqdm
+from autoinsert3 import shorten_synopsis, SYNOPSIS_SHORT_CHARS
+from db_connection import get_connection
+
+# Fills anime.synopsis_short for rows loaded before the column existed (or
+# after changing SYNOPSIS_SHORT_CHARS). Uses the same truncation as
+# autoinsert3.py and only updates rows whose stored value differs.
+
+BATCH_SIZE = 2000
+
+def ensure_column(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'anime' AND COLUMN_NAME = 'synopsis_short'
+        """)
+        if cursor.fetchone()[0] == 0:
+            print("🛠️ Adding anime.synopsis_short column...")
+            cursor.execute("ALTER TABLE anime ADD COLUMN synopsis_short varchar(255) DEFAULT NULL AFTER synopsis")
+
+def collect_updates(conn, budget):
+    updates = []
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT AnimeID, synopsis, synopsis_short FROM anime")
+        for anime_id, synopsis, current in tqdm.tqdm(cursor, desc="✂️ Shortening synopses", unit="anime"):
+            short = shorten_synopsis(synopsis or '', budget)
+            if short != current:
+                updates.append((short, anime_id))
+    return updates
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill anime.synopsis_short for existing rows.")
+    parser.add_argument('--budget', type=int, default=SYNOPSIS_SHORT_CHARS, help="Character budget (max 255)")
+    args = parser.parse_args()
+
+    conn = get_connection(streaming=True)
+    try:
+        ensure_column(conn)
+        updates = collect_updates(conn, min(args.budget, 255))
+        print(f"🔍 {len(updates)} rows need a new synopsis_short.")
+
+        with conn.cursor() as cursor:
+            for i in tqdm.tqdm(range(0, len(updates), BATCH_SIZE), desc="💾 Updating", unit="batch"):
+                cursor.executemany("UPDATE anime SET synopsis_short = %s WHERE AnimeID = %s", updates[i:i + BATCH_SIZE])
+        conn.commit()
+    finally:
+        conn.close()
+
+    print("✅ All done!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from datetime import date
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from pyarrow.fs import LocalFileSystem
+except ImportError:
+    pa = None
+
+# Columnar snapshot of the normalized catalog for offline jobs.
+#
+# autoinsert3.py writes, next to its SQL, the tables it just produced as
+#
+#   catalog/<table>.arrow    Arrow IPC, uncompressed: memory-mapped and read
+#                            zero-copy, the pages are shared by every process
+#                            that opens the file
+#   catalog/<table>.parquet  zstd Parquet with row-group statistics, for
+#                            predicate pushdown and copying the catalog around
+#
+# for the tables anime, anime_tags, studios and tags, with the same IDs as the
+# generated INSERTs. Recommendation, counter or search jobs call open_table()
+# instead of parsing insert_anime_N.sql or crawling again. Every file is
+# replaced atomically, so readers that still map the previous file keep a
+# consistent copy.
+#
+# Needs pyarrow (optional: without it autoinsert3.py skips this step).
+#
+# Usage (table sizes and load times):
+#   python catalog_columnar.py
+#   python catalog_columnar.py --directory catalog --repeat 20
+
+CATALOG_DIR = 'catalog'
+TABLES = ('anime', 'anime_tags', 'studios', 'tags')
+PARQUET_ROW_GROUP = 16_384
+PARQUET_COMPRESSION = 'zstd'
+
+if pa is not None:
+    SCHEMAS = {
+        'anime': pa.schema([
+            ('anime_id', pa.int32()), ('mal_id', pa.int32()), ('title', pa.string()),
+            ('type', pa.dictionary(pa.int8(), pa.string())), ('status', pa.dictionary(pa.int8(), pa.string())),
+            ('episodes', pa.int32()), ('airing_start', pa.date32()), ('airing_end', pa.date32()), ('rating', pa.int8()),
+            ('synopsis', pa.string()), ('studio_id', pa.int32()), ('image_url', pa.string()),
+        ]),
+        'anime_tags': pa.schema([('anime_id', pa.int32()), ('tag_id', pa.int16())]),
+        'studios': pa.schema([('studio_id', pa.int32()), ('studio_name', pa.string())]),
+        'tags': pa.schema([('tag_id', pa.int16()), ('tag', pa.string())]),
+    }
+
+def int_to_date(value):
+    """20240401 (AnimeRecord date) -> date(2024, 4, 1), or None."""
+    return None if value is None else date(value // 10000, value // 100 % 100, value % 100)
+
+def id_names(name_map):
+    """{name: id} (aliases allowed) -> [(id, first name)] sorted by id."""
+    names = {}
+    for name, id_ in name_map.items():
+        names.setdefault(id_, name)
+    return sorted(names.items())
+
+def build_tables(records, anime_ids, studio_map, tag_map):
+    """pyarrow Tables for the AnimeRecords (see catalog_store.py) and the studio / tag maps, sorted by ID."""
+    order = sorted(range(len(records)), key=anime_ids.__getitem__)
+    rows = [records[i] for i in order]
+    anime_id = [anime_ids[i] for i in order]
+    anime = pa.table({
+        'anime_id': anime_id,
+        'mal_id': [r.mal_id for r in rows],
+        'title': [r.title for r in rows],
+        'type': [r.type for r in rows],
+        'status': [r.status for r in rows],
+        'episodes': [r.episodes for r in rows],
+        'airing_start': [int_to_date(r.airing_start) for r in rows],
+        'airing_end': [int_to_date(r.airing_end) for r in rows],
+        'rating': [r.rating for r in rows],
+        'synopsis': [r.synopsis for r in rows],
+        'studio_id': [r.studio_id for r in rows],
+        'image_url': [r.image_url for r in rows],
+    }, schema=SCHEMAS['anime'])
+    anime_tags = pa.table({
+        'anime_id': [a for a, r in zip(anime_id, rows) for _ in r.tag_ids],
+        'tag_id': [t for r in rows for t in r.tag_ids],
+    }, schema=SCHEMAS['anime_tags'])
+    studios = id_names(studio_map)
+    tags = id_names(tag_map)
+    return {
+        'anime': anime,
+        'anime_tags': anime_tags,
+        'studios': pa.table({'studio_id': [i for i, _ in studios], 'studio_name': [n for _, n in studios]}, schema=SCHEMAS['studios']),
+        'tags': pa.table({'tag_id': [i for i, _ in tags], 'tag': [n for _, n in tags]}, schema=SCHEMAS['tags']),
+    }
+
+def write_tables(tables, directory=CATALOG_DIR):
+    """Writes <table>.arrow and <table>.parquet for every table, each via a temporary file and os.replace."""
+    os.makedirs(directory, exist_ok=True)
+    for name, table in tables.items():
+        path = os.path.join(directory, f"{name}.arrow")
+        with pa.OSFile(path + '.tmp', 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(path + '.tmp', path)
+
+        path = os.path.join(directory, f"{name}.parquet")
+        pq.write_table(table, path + '.tmp', row_group_size=PARQUET_ROW_GROUP, compression=PARQUET_COMPRESSION)
+        os.replace(path + '.tmp', path)
+
+def write_catalog(records, anime_ids, studio_map, tag_map, directory=CATALOG_DIR):
+    """Builds and writes the columnar catalog. Returns {table: rows}."""
+    tables = build_tables(records, anime_ids, studio_map, tag_map)
+    write_tables(tables, directory)
+    return {name: table.num_rows for name, table in tables.items()}
+
+def open_table(name, columns=None, filter=None, directory=CATALOG_DIR, fmt='arrow'):
+    """
+    Reads one catalog table, only `columns` and only the rows matching the
+    `filter` expression, e.g.
+
+        open_table('anime', ['anime_id', 'title'], ds.field('status') == 'Airing')
+
+    'arrow' memory-maps the IPC file (unfiltered columns are zero-copy views of
+    the mapping); 'parquet' skips row groups whose statistics rule the filter out.
+    """
+    path = os.path.join(directory, f"{name}.{fmt}")
+    if fmt == 'arrow':
+        dataset = ds.dataset(path, format='ipc', filesystem=LocalFileSystem(use_mmap=True))
+    else:
+        dataset = ds.dataset(path, format='parquet')
+    return dataset.to_table(columns=columns, filter=filter)
+
+# --- BENCHMARK ---
+
+def best_time(load, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = load()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.readlines()
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the columnar catalog tables and how fast typical reads are.")
+    parser.add_argument('--directory', default=CATALOG_DIR)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    if pa is None:
+        print("❌ pyarrow is not installed (pip install pyarrow).")
+        sys.exit(1)
+    if not os.path.exists(os.path.join(args.directory, 'anime.arrow')):
+        print(f"❌ No catalog in {args.directory}/. Run autoinsert3.py first.")
+        sys.exit(1)
+
+    print(f"{'table':<12}{'rows':>10}{'arrow KB':>12}{'parquet KB':>12}")
+    for name in TABLES:
+        rows = pq.ParquetFile(os.path.join(args.directory, f"{name}.parquet")).metadata.num_rows
+        sizes = [os.path.getsize(os.path.join(args.directory, f"{name}.{fmt}")) / 1024 for fmt in ('arrow', 'parquet')]
+        print(f"{name:<12}{rows:>10,}{sizes[0]:>12,.0f}{sizes[1]:>12,.0f}")
+
+    airing = ds.field('status') == 'Airing'
+    queries = [
+        ("anime, all columns", lambda fmt: open_table('anime', directory=args.directory, fmt=fmt)),
+        ("anime_id + title + rating", lambda fmt: open_table('anime', ['anime_id', 'title', 'rating'], directory=args.directory, fmt=fmt)),
+        ("Airing anime titles", lambda fmt: open_table('anime', ['anime_id', 'title'], airing, directory=args.directory, fmt=fmt)),
+        ("anime_tags", lambda fmt: open_table('anime_tags', directory=args.directory, fmt=fmt)),
+    ]
+    print(f"\n{'query':<28}{'arrow ms':>10}{'heap KB':>10}{'parquet ms':>12}{'heap KB':>10}{'rows':>9}")
+    for label, query in queries:
+        cells = []
+        for fmt in ('arrow', 'parquet'):
+            before = pa.total_allocated_bytes()
+            seconds, table = best_time(lambda: query(fmt), args.repeat)
+            # Memory the table holds on the Arrow heap; mapped file pages are not counted.
+            cells.append(f"{seconds * 1000:>10.2f}{(pa.total_allocated_bytes() - before) / 1024:>10,.0f}")
+            del table
+        rows = query('arrow').num_rows
+        print(f"{label:<28}{cells[0]}  {cells[1]}{rows:>9,}")
+    print()
+
+    # For comparison: what a job without the catalog starts with.
+    for pattern, label, load in (('raw_anime_snapshot.json', "json.load", load_json), ('insert_anime_*.sql', "Reading the lines of", read_lines)):
+        paths = glob.glob(pattern)
+        if paths:
+            path = max(paths, key=os.path.getsize)
+            seconds, _ = best_time(lambda: load(path), min(args.repeat, 3))
+            print(f"📂 {label} {path}: {seconds * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from array import array
+
+# Compact in-memory anime records for the stages between transform and emit.
+#
+# autoinsert3.py used to keep every accepted anime twice: as the raw Jikan dict
+# and as a list of formatted SQL literals (title, synopsis and synopsis_short
+# each quoted and escaped). AnimeRecord keeps one normalized copy instead:
+#
+#   - __slots__, no per-instance dict
+#   - type / status interned, so all records share a handful of strings
+#   - dates as YYYYMMDD ints, rating as a small int
+#   - tag IDs in an array('H') (2 bytes per tag)
+#   - synopsis_short and all SQL literals derived when a row is emitted
+#
+# The transform (autoinsert3.transform_anime), image stages, delta hashing and
+# the SQL writers all work on these records.
+#
+# Usage (memory per 100k anime, old representation vs records):
+#   python catalog_store.py
+#   python catalog_store.py --count 20000
+
+class AnimeRecord:
+    __slots__ = ('mal_id', 'title', 'type', 'status', 'episodes', 'airing_start', 'airing_end',
+                 'rating', 'synopsis', 'studio_id', 'image_url', 'tag_ids', 'extra')
+
+    def __init__(self, mal_id, title, type_, status, episodes, airing_start, airing_end, rating, synopsis, studio_id, image_url, tag_ids):
+        self.mal_id = mal_id
+        self.title = title
+        self.type = sys.intern(type_)
+        self.status = sys.intern(status)
+        self.episodes = episodes
+        self.airing_start = airing_start
+        self.airing_end = airing_end
+        self.rating = rating
+        self.synopsis = synopsis
+        self.studio_id = studio_id
+        self.image_url = image_url
+        self.tag_ids = array('H', tag_ids)
+        self.extra = () # SQL literals of optional columns appended by later stages (image mirror/placeholders)
+
+    def astuple(self):
+        """Every value of the record, for hashing and comparisons."""
+        return (self.mal_id, self.title, self.type, self.status, self.episodes, self.airing_start, self.airing_end,
+                self.rating, self.synopsis, self.studio_id, self.image_url, tuple(self.tag_ids), self.extra)
+
+def date_to_int(value):
+    """'2024-04-01...' (Jikan ISO timestamp) -> 20240401, or None."""
+    if not value:
+        return None
+    return int(value[0:4]) * 10000 + int(value[5:7]) * 100 + int(value[8:10])
+
+def date_literal(value):
+    if value is None:
+        return 'NULL'
+    return f"'{value // 10000:04d}-{value // 100 % 100:02d}-{value % 100:02d}'"
+
+# --- BENCHMARK ---
+
+def measure(build):
+    """Bytes retained by the object `build()` returns."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+def main():
+    from autoinsert3 import load_maps, transform_anime, record_fields, RAW_SNAPSHOT_FILE
+    from synth_catalog import CatalogModel, load_snapshot, seed_catalog
+
+    parser = argparse.ArgumentParser(description="Compare the memory of raw dicts, SQL literal lists and AnimeRecords.")
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    studio_map, tag_map = load_maps()
+    if not studio_map:
+        sys.exit(1)
+    rng = random.Random(args.seed)
+    if os.path.exists(RAW_SNAPSHOT_FILE):
+        model = CatalogModel(load_snapshot(RAW_SNAPSHOT_FILE), studio_map)
+    else:
+        model = CatalogModel(seed_catalog(studio_map, tag_map, rng), studio_map)
+
+    def raw():
+        sample_rng = random.Random(args.seed)
+        return [model.sample(sample_rng, i) for i in range(1, args.count + 1)]
+
+    def records():
+        # The raw dicts are dropped once transformed, only what the records reference stays.
+        seen_titles = set()
+        accepted = []
+        for anime in raw():
+            record, skip_reason = transform_anime(anime, studio_map, tag_map, seen_titles)
+            if record:
+                accepted.append(record)
+        return accepted
+
+    def literal_rows():
+        # What autoinsert3 held per anime before AnimeRecord: a list of SQL literals plus a tag list.
+        return [(record_fields(r), list(r.tag_ids)) for r in records()]
+
+    accepted = len(records())
+    scale = 100_000 / accepted
+    raw_size, literal_size = measure(raw), measure(literal_rows)
+    results = [
+        ("raw Jikan dicts", raw_size),
+        ("SQL literal lists + tags", literal_size),
+        ("previous total (both)", raw_size + literal_size),
+        ("AnimeRecord", measure(records)),
+    ]
+    print(f"🧮 {accepted:,} accepted anime (of {args.count:,} sampled), scaled to 100k:\n")
+    print(f"{'representation':<28}{'MB / 100k':>12}{'bytes / anime':>16}")
+    for label, size in results:
+        print(f"{label:<28}{size * scale / 1e6:>12.1f}{size / accepted:>16,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import shutil
+import time
+import tqdm
+from jikan_http import JikanSession
+from jikan_decode import decode_page
+from autoinsert3 import BASE_URL, RAW_SNAPSHOT_FILE, get_pagination_limit
+
+# Multi-process top/anime crawl under one shared rate limit.
+#
+# autoinsert3.py fetches and decodes every page in a single asyncio loop, and
+# its MAX_CONCURRENT_REQUESTS only limits that one process. This coordinator
+# splits the page range across --workers processes (each with its own event
+# loop, so JSON decoding runs on several cores) and makes all of them draw
+# from one SharedTokenBucket in shared memory:
+#
+#   - --rate requests per second overall, bursts of at most --burst
+#   - at most --per-minute requests in any 60 seconds (Jikan's second limit)
+#   - a 429 seen by any worker pauses every worker for COOL_DOWN_SECONDS
+#
+# Workers append `page<TAB>data` lines to crawl_parts/part_<n>.jsonl and
+# report into a shared metrics array, shown as one progress bar. At the end
+# the parts are stitched, in page order and without decoding them again, into
+# raw_anime_snapshot.json, which autoinsert3.py --from-snapshot turns into SQL.
+#
+# Usage:
+#   python crawl_coordinator.py --workers 4 --rate 3
+#   python autoinsert3.py --from-snapshot
+
+PARTS_DIR = 'crawl_parts'
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 3.0 # Jikan allows 3 requests/second...
+DEFAULT_BURST = 3
+DEFAULT_PER_MINUTE = 60 # ...and 60 requests/minute
+COOL_DOWN_SECONDS = 2
+MAX_CONCURRENT_PER_WORKER = 3
+METRICS = ['pages', 'anime', 'failed', 'requests', 'throttled']
+
+class SharedTokenBucket:
+    """
+    Token bucket shared by all processes: [tokens, last refill, paused until,
+    ring position, the times of the last `per_minute` requests] in a
+    lock-protected multiprocessing.Array. The ring enforces the per-minute
+    budget exactly: a request may go once the one `per_minute` requests ago
+    is 60 seconds old. Waiting happens outside the lock.
+    """
+
+    def __init__(self, rate, burst, per_minute=DEFAULT_PER_MINUTE):
+        self.rate = rate
+        self.burst = burst
+        self.per_minute = per_minute
+        self.state = mp.Array('d', [float(burst), time.monotonic(), 0.0, 0.0] + [float('-inf')] * per_minute)
+
+    def try_acquire(self):
+        """Takes a token and returns 0, or returns the seconds to wait before trying again."""
+        with self.state.get_lock():
+            now = time.monotonic()
+            tokens, last, paused_until = self.state[:3]
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            self.state[1] = now
+            if now < paused_until:
+                self.state[0] = tokens
+                return paused_until - now
+            if tokens >= 1:
+                position = int(self.state[3])
+                oldest = self.state[4 + position]
+                if now - oldest < 60:
+                    self.state[0] = tokens
+                    return oldest + 60 - now
+                self.state[0] = tokens - 1
+                self.state[4 + position] = now
+                self.state[3] = (position + 1) % self.per_minute
+                return 0
+            self.state[0] = tokens
+            return (1 - tokens) / self.rate
+
+    async def acquire(self):
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def cool_down(self, seconds):
+        """Pauses every worker, e.g. after a 429."""
+        with self.state.get_lock():
+            self.state[0] = 0.0
+            self.state[2] = max(self.state[2], time.monotonic() + seconds)
+
+class WorkerMetrics:
+    """Per-worker counters in one shared array, readable by the coordinator without locking."""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.values = mp.Array('q', workers * len(METRICS), lock=False)
+
+    def add(self, worker, name, amount=1):
+        self.values[worker * len(METRICS) + METRICS.index(name)] += amount
+
+    def get(self, worker, name):
+        return self.values[worker * len(METRICS) + METRICS.index(name)]
+
+    def total(self, name):
+        return sum(self.get(w, name) for w in range(self.workers))
+
+async def fetch_page(session, page, semaphore, bucket, metrics, worker):
+    """autoinsert3.fetch_page with the shared bucket instead of a per-process sleep."""
+    async with semaphore:
+        params = {'page': page, 'sfw': 'true'}
+        while True:
+            await bucket.acquire()
+            metrics.add(worker, 'requests')
+            try:
+                async with session.get(BASE_URL, params=params) as response:
+                    if response.status == 429:
+                        metrics.add(worker, 'throttled')
+                        bucket.cool_down(COOL_DOWN_SECONDS)
+                        continue
+                    if response.status != 200:
+                        return None
+                    payload = decode_page(await response.read())
+                    return payload.get('data') or []
+            except Exception:
+                return None
+
+async def crawl_pages(worker, pages, bucket, metrics, out_path):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PER_WORKER)
+    async with JikanSession() as session:
+        with open(out_path, 'w', encoding='utf-8') as out:
+            tasks = [asyncio.ensure_future(fetch_page(session, page, semaphore, bucket, metrics, worker)) for page in pages]
+            for page, task in zip(pages, tasks):
+                data = await task
+                if data is None:
+                    metrics.add(worker, 'failed')
+                    continue
+                out.write(f"{page}\t{json.dumps(data)}\n")
+                metrics.add(worker, 'anime', len(data))
+                metrics.add(worker, 'pages')
+
+def worker_main(worker, pages, bucket, metrics, out_path):
+    asyncio.run(crawl_pages(worker, pages, bucket, metrics, out_path))
+
+def split_pages(total_pages, workers):
+    """Interleaved page sets, so every worker crawls ranks across the whole catalog at the same pace."""
+    return [list(range(first, total_pages + 1, workers)) for first in range(1, workers + 1)]
+
+def stitch_snapshot(part_paths, out_path):
+    """Concatenates the part files' page arrays in page order into one JSON array, without re-decoding them."""
+    pages = {}
+    for path in part_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                page, data = line.rstrip('\n').split('\t', 1)
+                pages[int(page)] = data
+    with open(out_path, 'w', encoding='utf-8') as out:
+        out.write('[' + ', '.join(pages[p][1:-1] for p in sorted(pages) if pages[p] != '[]') + ']')
+    return len(pages)
+
+def progress_postfix(metrics, elapsed):
+    per_worker = ' '.join(f"w{w}:{metrics.get(w, 'pages')}" for w in range(metrics.workers))
+    return f"{per_worker} | {metrics.total('requests') / max(elapsed, 1e-9):.1f} req/s | 429s {metrics.total('throttled')} | failed {metrics.total('failed')}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl Jikan top/anime with several processes sharing one rate limit.")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="Requests per second across all workers")
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help="Token bucket size")
+    parser.add_argument('--per-minute', type=int, default=DEFAULT_PER_MINUTE, help="Requests per rolling minute across all workers")
+    parser.add_argument('--pages', type=int, help="Crawl only the first N pages")
+    parser.add_argument('--output', default=RAW_SNAPSHOT_FILE)
+    args = parser.parse_args()
+
+    print("🔍 Checking total pages available...")
+    total_pages = asyncio.run(get_pagination_limit())
+    if args.pages:
+        total_pages = min(total_pages, args.pages)
+    print(f"📄 {total_pages} pages over {args.workers} worker(s) at {args.rate:g} req/s, {args.per_minute} req/min.")
+
+    if os.path.isdir(PARTS_DIR):
+        shutil.rmtree(PARTS_DIR)
+    os.makedirs(PARTS_DIR)
+
+    bucket = SharedTokenBucket(args.rate, args.burst, args.per_minute)
+    metrics = WorkerMetrics(args.workers)
+    part_paths = [os.path.join(PARTS_DIR, f"part_{w}.jsonl") for w in range(args.workers)]
+    processes = [
+        mp.Process(target=worker_main, args=(w, pages, bucket, metrics, part_paths[w]))
+        for w, pages in enumerate(split_pages(total_pages, args.workers))
+    ]
+
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    with tqdm.tqdm(total=total_pages, desc="🚀 Downloading Pages", unit="page") as bar:
+        while any(p.is_alive() for p in processes):
+            time.sleep(0.5)
+            bar.n = metrics.total('pages') + metrics.total('failed')
+            bar.set_postfix_str(progress_postfix(metrics, time.perf_counter() - start))
+        bar.n = metrics.total('pages') + metrics.total('failed')
+        bar.set_postfix_str(progress_postfix(metrics, time.perf_counter() - start))
+    for process in processes:
+        process.join()
+
+    crashed = [w for w, p in enumerate(processes) if p.exitcode != 0]
+    if crashed:
+        print(f"❌ Worker(s) {', '.join(map(str, crashed))} crashed; their remaining pages are missing.")
+    if metrics.total('failed'):
+        print(f"⚠️ {metrics.total('failed')} page(s) failed.")
+
+    stitched = stitch_snapshot(part_paths, args.output)
+    print(f"📥 {metrics.total('anime')} anime from {stitched} pages written to {args.output} in {time.perf_counter() - start:.1f}s")
+    print("✅ Now run: python autoinsert3.py --from-snapshot")
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,7 @@ CREATE TABLE `studio` (
 DROP TABLE IF EXISTS `anime`;
 CREATE TABLE `anime` (
   `AnimeID` int NOT NULL AUTO_INCREMENT,
+  `mal_id` int DEFAULT NULL,
   `title` varchar(500) NOT NULL,
   `type` enum('TV','Movie','ONA','OVA','Special') NOT NULL,
   `episodes` int DEFAULT '12',
@@ -35,10 +36,18 @@ CREATE TABLE `anime` (
   `airing_end` date DEFAULT NULL,
   `rating` enum('1','2','3','4','5','6','7','8','9','10') DEFAULT NULL,
   `synopsis` text,
+  `synopsis_short` varchar(255) DEFAULT NULL,
   `StudioID` int NOT NULL,
   `image_url` varchar(255) DEFAULT NULL,
+  `image_local` varchar(255) DEFAULT NULL,
+  `image_width` smallint unsigned DEFAULT NULL,
+  `image_height` smallint unsigned DEFAULT NULL,
+  `image_blurhash` varchar(32) DEFAULT NULL,
+  `image_color` char(7) DEFAULT NULL,
+  `image_aspect` decimal(5,3) DEFAULT NULL,
   PRIMARY KEY (`AnimeID`),
   UNIQUE KEY `title` (`title`),
+  UNIQUE KEY `mal_id` (`mal_id`),
   KEY `StudioID` (`StudioID`),
   CONSTRAINT `anime_ibfk_1`
         FOREIGN KEY (`StudioID`) REFERENCES `studio` (`StudioID`)
@@ -127,3 +136,53 @@ CREATE TABLE `comments` (
   CONSTRAINT `comments_ibfk_2`
         FOREIGN KEY (`UserID`) REFERENCES `user` (`UserID`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- ------------------------------------------------------
+-- Table: anime_random_rank
+-- Shuffled permutation of AnimeIDs maintained by random_pool.py
+-- ------------------------------------------------------
+DROP TABLE IF EXISTS `anime_random_rank`;
+CREATE TABLE `anime_random_rank` (
+  `AnimeID` int NOT NULL,
+  `random_rank` int NOT NULL,
+  PRIMARY KEY (`AnimeID`),
+  KEY `idx_random_rank` (`random_rank`),
+  CONSTRAINT `anime_random_rank_ibfk_1`
+        FOREIGN KEY (`AnimeID`) REFERENCES `anime` (`AnimeID`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- ------------------------------------------------------
+-- Table: anime_counters
+-- Materialized popularity/engagement counters, seeded by randomwatchlist.py /
+-- randomcomments.py and kept in sync by reconcile_counters.py
+-- ------------------------------------------------------
+DROP TABLE IF EXISTS `anime_counters`;
+CREATE TABLE `anime_counters` (
+  `AnimeID` int NOT NULL,
+  `watchlist_count` int NOT NULL DEFAULT '0',
+  `completed_count` int NOT NULL DEFAULT '0',
+  `watching_count` int NOT NULL DEFAULT '0',
+  `plan_to_watch_count` int NOT NULL DEFAULT '0',
+  `comment_count` int NOT NULL DEFAULT '0',
+  PRIMARY KEY (`AnimeID`),
+  KEY `idx_watchlist_count` (`watchlist_count`),
+  CONSTRAINT `anime_counters_ibfk_1`
+        FOREIGN KEY (`AnimeID`) REFERENCES `anime` (`AnimeID`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- ------------------------------------------------------
+-- Table: anime_trending
+-- Top decayed trending scores per window, written by trending.py
+-- ------------------------------------------------------
+DROP TABLE IF EXISTS `anime_trending`;
+CREATE TABLE `anime_trending` (
+  `window_name` varchar(8) NOT NULL,
+  `trend_rank` int NOT NULL,
+  `AnimeID` int NOT NULL,
+  `score` double NOT NULL,
+  `computed_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`window_name`, `trend_rank`),
+  KEY `AnimeID` (`AnimeID`),
+  CONSTRAINT `anime_trending_ibfk_1`
+        FOREIGN KEY (`AnimeID`) REFERENCES `anime` (`AnimeID`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
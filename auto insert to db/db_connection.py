@@ -0,0 +1,40 @@
+import os
+import pymysql
+
+# Shared MySQL connection helper for the offline jobs in this folder.
+# Reads the same .env file as config/database.js so the Python jobs and the
+# Express server always point at the same database.
+
+ENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.env')
+
+def load_env(path=ENV_PATH):
+    """
+    Minimal .env reader (KEY=VALUE per line). Values already present in the
+    process environment win, same as dotenv's default behaviour.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            os.environ.setdefault(key.strip(), value.strip().strip('"').strip("'"))
+
+def get_connection(streaming=False, database=None):
+    """
+    Opens a connection to the anime_tracker database (or `database`, e.g. a
+    scratch copy used for benchmarking).
+    With streaming=True the default cursor is unbuffered (SSCursor), so large
+    tables can be read row by row without loading them into memory.
+    """
+    load_env()
+    return pymysql.connect(
+        host=os.environ.get('HOST', 'localhost'),
+        user=os.environ.get('USER'),
+        password=os.environ.get('PASSWORD'),
+        database=database or os.environ.get('DATABASE', 'anime_tracker'),
+        charset='utf8mb4',
+        cursorclass=pymysql.cursors.SSCursor if streaming else pymysql.cursors.Cursor,
+    )
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+
+# Delta output for autoinsert3.py --delta.
+#
+# Every run stores a content hash per anime, keyed by Jikan mal_id, in
+# catalog_state.json. A delta run compares the freshly transformed catalog with
+# that state and writes only what changed:
+#
+#   new / changed anime  -> INSERT ... ON DUPLICATE KEY UPDATE on the anime row
+#                           (matched by the UNIQUE mal_id or title), then its
+#                           anime_tags are replaced. A registry AnimeID is only
+#                           used for a row no existing anime matches and whose
+#                           ID is still free, so an ID that drifted from the
+#                           database can never overwrite another anime's row.
+#   anime no longer seen -> DELETE by mal_id (its watchlist rows first, the
+#                           other child tables cascade)
+#
+# Watchlists and comments of untouched anime are never modified, so a daily
+# refresh no longer needs database_creation.sql. The first delta run against a
+# database loaded before mal_id existed has no state and upserts every row,
+# which also attaches mal_ids to the existing rows through their titles.
+#
+# Apply the delta file before the next run: the state is updated when it is written.
+
+STATE_FILE = 'catalog_state.json'
+DELTA_FILE = 'delta_anime.sql'
+MAX_DELETE_FRACTION = 0.05 # More missing anime than this looks like a failed crawl, not real removals
+
+def content_hash(fields, tag_ids):
+    payload = '\x1f'.join(fields) + '\x1e' + ','.join(str(t) for t in sorted(tag_ids))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+def load_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return {int(mal_id): digest for mal_id, digest in json.load(f).items()}
+
+def save_state(state, path=STATE_FILE):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({str(mal_id): digest for mal_id, digest in state.items()}, f)
+    os.replace(tmp_path, path)
+
+def build_state(records, record_fields):
+    """{mal_id: hash} over the AnimeRecords' SQL literals (`record_fields` is autoinsert3.record_fields)."""
+    return {r.mal_id: content_hash(record_fields(r), r.tag_ids) for r in records if r.mal_id is not None}
+
+def diff_state(previous, current):
+    """Returns (new, changed, removed) mal_id sets."""
+    previous = previous or {}
+    new = current.keys() - previous.keys()
+    changed = {m for m in current.keys() & previous.keys() if current[m] != previous[m]}
+    removed = previous.keys() - current.keys()
+    return new, changed, removed
+
+def write_delta(f, anime_columns, records, record_fields, upsert_ids, delete_ids, anime_ids=None):
+    columns = [c.strip() for c in anime_columns.split(',')]
+    title_index = columns.index('title')
+    updates = ', '.join(f"{c} = VALUES({c})" for c in columns if c != 'mal_id')
+    var_id = 0
+
+    f.write("START TRANSACTION;\n")
+    for i, record in enumerate(records):
+        mal_id, tag_ids = record.mal_id, record.tag_ids
+        if mal_id not in upsert_ids:
+            continue
+        fields = record_fields(record)
+        var_id += 1
+        if anime_ids:
+            # Registry IDs (id_registry.py): a really new anime gets its permanent AnimeID.
+            # Inserted only if neither its mal_id/title nor the ID exists yet; the upsert
+            # below then matches it by mal_id (or adds it with AUTO_INCREMENT if the ID was taken).
+            f.write(f"INSERT INTO Anime (AnimeID, {anime_columns}) SELECT {anime_ids[i]}, {', '.join(fields)} FROM DUAL"
+                    f" WHERE NOT EXISTS (SELECT 1 FROM Anime WHERE AnimeID = {anime_ids[i]} OR mal_id = {mal_id} OR title = {fields[title_index]});\n")
+        # No AnimeID here: an existing row is matched by its UNIQUE mal_id or title only.
+        f.write(f"INSERT INTO Anime ({anime_columns}) VALUES ({', '.join(fields)}) ON DUPLICATE KEY UPDATE mal_id = VALUES(mal_id), {updates};\n")
+        # LAST_INSERT_ID() is not set when the row was updated, so look the id up.
+        f.write(f"SET @anime_id_{var_id} = (SELECT AnimeID FROM Anime WHERE mal_id = {mal_id});\n")
+        f.write(f"DELETE FROM Anime_Tags WHERE AnimeID = @anime_id_{var_id};\n")
+        if tag_ids:
+            f.write("INSERT INTO Anime_Tags (AnimeID, TagID) VALUES " + ', '.join(f"(@anime_id_{var_id}, {t})" for t in tag_ids) + ";\n")
+
+    if delete_ids:
+        id_list = ', '.join(str(m) for m in sorted(delete_ids))
+        f.write(f"DELETE w FROM watchlist w JOIN Anime a ON a.AnimeID = w.AnimeID WHERE a.mal_id IN ({id_list});\n")
+        f.write(f"DELETE FROM Anime WHERE mal_id IN ({id_list});\n")
+    f.write("COMMIT;\n")
@@ -0,0 +1,172 @@
+import argparse
+import datetime
+import decimal
+import gzip
+import hashlib
+import json
+import os
+from db_connection import get_connection
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Pre-renders the homepage carousel endpoints into static JSON shards under
+# public/data/. Each shard is versioned by its content hash (which doubles as
+# the ETag) and written alongside .gz / .br precompressed copies. app.js serves
+# these files for the matching routes, so those requests never touch MySQL.
+#
+# Files are only rewritten when their content hash changes; manifest.json maps
+# each route to its current file.
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public', 'data')
+MANIFEST_NAME = 'manifest.json'
+
+# Same SELECT list as the carousel queries in controllers/animeController.js
+ANIME_CARD_SELECT = """
+    SELECT
+        a.AnimeID, a.title, a.type, a.episodes, a.status, a.airing_start,
+        a.airing_end, a.rating, a.synopsis_short AS synopsis, a.image_url,
+        s.studio_name, s.rating AS studio_rating,
+        GROUP_CONCAT(t.tag ORDER BY t.tag SEPARATOR ', ') AS genres
+    FROM Anime a
+    JOIN Studio s ON a.StudioID = s.StudioID
+    JOIN Anime_Tags at ON a.AnimeID = at.AnimeID
+    JOIN Tags t ON at.TagID = t.TagID
+"""
+
+SHARDS = {
+    '/anime/animespotlight-animes': ('animespotlight-animes', ANIME_CARD_SELECT + """
+        WHERE a.rating >= 10
+        GROUP BY a.AnimeID
+        ORDER BY a.title ASC
+        LIMIT 10
+    """),
+    '/anime/new-animes': ('new-animes', ANIME_CARD_SELECT + """
+        WHERE a.status = 'Airing'
+        GROUP BY a.AnimeID
+        ORDER BY a.airing_start DESC
+    """),
+    '/anime/upcoming-animes': ('upcoming-animes', ANIME_CARD_SELECT + """
+        WHERE a.status = 'Upcoming'
+        GROUP BY a.AnimeID
+        ORDER BY a.airing_start DESC
+    """),
+    '/anime/recommended-animes': ('recommended-animes', ANIME_CARD_SELECT + """
+        WHERE a.rating IN ('8','9')
+        GROUP BY a.AnimeID
+        ORDER BY a.rating DESC
+        LIMIT 15
+    """),
+    '/anime/all-tags': ('all-tags', "SELECT DISTINCT tag FROM Tags ORDER BY tag"),
+}
+
+def js_date_json(value):
+    """
+    mysql2 (default timezone 'local') turns DATE / DATETIME values into a JS Date
+    at local time, and JSON.stringify writes that as a UTC ISO timestamp with
+    milliseconds: DATE 2020-04-01 on a UTC+2 server -> "2020-03-31T22:00:00.000Z".
+    Same conversion here, so run this in the server's timezone.
+    """
+    utc = value.astimezone(datetime.timezone.utc)
+    return utc.strftime('%Y-%m-%dT%H:%M:%S.') + f"{utc.microsecond // 1000:03d}Z"
+
+def json_default(value):
+    # Match what mysql2 + JSON.stringify produce for DATE / TIMESTAMP / DECIMAL columns.
+    if isinstance(value, datetime.datetime):
+        return js_date_json(value)
+    if isinstance(value, datetime.date):
+        return js_date_json(datetime.datetime.combine(value, datetime.time()))
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f"Unserializable value: {value!r}")
+
+def run_query(conn, query):
+    with conn.cursor() as cursor:
+        cursor.execute(query)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_if_changed(path, data):
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+def write_shard(name, body):
+    """Writes <name>.<hash>.json plus precompressed variants. Returns the manifest entry."""
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    filename = f"{name}.{digest}.json"
+    path = os.path.join(OUTPUT_DIR, filename)
+
+    variants = {'identity': filename}
+    write_if_changed(path, body)
+    # mtime=0 keeps the gzip output byte-identical between runs.
+    write_if_changed(path + '.gz', gzip.compress(body, compresslevel=9, mtime=0))
+    variants['gzip'] = filename + '.gz'
+    if brotli is not None:
+        write_if_changed(path + '.br', brotli.compress(body, quality=11))
+        variants['br'] = filename + '.br'
+
+    return {'file': filename, 'etag': f'"{digest}"', 'bytes': len(body), 'encodings': variants}
+
+def remove_stale_versions(old_entry, new_entry):
+    if not old_entry or old_entry['file'] == new_entry['file']:
+        return
+    for filename in old_entry.get('encodings', {}).values():
+        path = os.path.join(OUTPUT_DIR, filename)
+        if os.path.exists(path):
+            os.remove(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export homepage endpoints as static precompressed JSON shards.")
+    parser.add_argument('--only', choices=list(SHARDS), action='append', help="Export only the given route(s)")
+    args = parser.parse_args()
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    manifest_path = os.path.join(OUTPUT_DIR, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    if brotli is None:
+        print("⚠️ brotli not installed, only gzip variants will be written.")
+
+    conn = get_connection()
+    changed = 0
+    try:
+        for route in args.only or SHARDS:
+            name, query = SHARDS[route]
+            rows = run_query(conn, query)
+            body = json.dumps(rows, default=json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+            entry = write_shard(name, body)
+            old_entry = manifest.get(route)
+            if old_entry and old_entry['etag'] == entry['etag']:
+                print(f"   = {route} unchanged ({len(rows)} rows)")
+                continue
+
+            remove_stale_versions(old_entry, entry)
+            manifest[route] = entry
+            changed += 1
+            print(f"   ✏️ {route} -> {entry['file']} ({len(rows)} rows, {entry['bytes']} bytes)")
+    finally:
+        conn.close()
+
+    if changed:
+        body = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+        write_if_changed(manifest_path, body)
+
+    print(f"✅ {changed} shard(s) updated.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import argparse
+import os
+import sqlite3
+from collation import collation_key
+
+# Permanent StudioID / TagID / AnimeID assignment, shared by all seeding scripts.
+#
+# studiomapcreator2.py and tagmapcreator.py number studios and tags by their
+# position in the generated SQL, so one new studio that sorts early shifts
+# every later StudioID (and with it every anime row). The registry is a small
+# SQLite file that remembers the ID handed out for every external key:
+#
+#   - the Jikan mal_id, when the entity has one (studios, genres, anime)
+#   - the name's collation key, so case/accent variants reuse the same ID
+#     exactly like the UNIQUE keys in MySQL would
+#
+# IDs are append-only: a key seen before always gets its old ID back, a new
+# key gets max(id) + 1, and nothing is ever renumbered or reused. The
+# generators write these IDs explicitly into their INSERTs, and the maps
+# autoinsert3.py reads are exported from here instead of from the SQL files.
+#
+# All lookups hit in-memory dicts loaded once per kind; SQLite is only touched
+# to persist new allocations.
+#
+# Usage:
+#   python id_registry.py --import-db            # adopt the IDs of an existing database
+#   python id_registry.py --import-maps          # same, from studio_map.txt / tag_map.txt only
+#   python id_registry.py --export-maps          # rewrite studio_map.txt / tag_map.txt
+#   python id_registry.py --stats
+
+REGISTRY_FILE = 'id_registry.sqlite3'
+KINDS = ('studio', 'tag', 'anime')
+MAP_FILES = {'studio': ('studio_map.txt', 'studio_map'), 'tag': ('tag_map.txt', 'tag_map')}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entity (
+    kind TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    mal_id INTEGER,
+    PRIMARY KEY (kind, id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS entity_mal_id ON entity (kind, mal_id) WHERE mal_id IS NOT NULL;
+CREATE TABLE IF NOT EXISTS entity_name (
+    kind TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    PRIMARY KEY (kind, name_key)
+);
+"""
+
+class KindIndex:
+    """In-memory view of one kind: mal_id -> id (and back), name key -> id, id -> name."""
+
+    def __init__(self, rows, names):
+        self.by_mal_id = {mal_id: id_ for id_, _, mal_id in rows if mal_id is not None}
+        self.mal_ids = {id_: mal_id for mal_id, id_ in self.by_mal_id.items()}
+        self.names = {id_: name for id_, name, _ in rows}
+        self.by_key = dict(names)
+        self.next_id = max(self.names, default=0) + 1
+
+class IdRegistry:
+    def __init__(self, path=REGISTRY_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self.kinds = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.commit()
+        self.conn.close()
+
+    def index(self, kind):
+        if kind not in self.kinds:
+            rows = self.conn.execute("SELECT id, name, mal_id FROM entity WHERE kind = ?", (kind,)).fetchall()
+            names = self.conn.execute("SELECT name_key, id FROM entity_name WHERE kind = ?", (kind,)).fetchall()
+            self.kinds[kind] = KindIndex(rows, names)
+        return self.kinds[kind]
+
+    def lookup(self, kind, name=None, mal_id=None):
+        """
+        Returns the registered ID or None, without allocating. An unknown mal_id
+        only falls back to the name for an entity registered without a mal_id,
+        so two MAL entries with the same name are never merged.
+        """
+        index = self.index(kind)
+        if mal_id is not None and mal_id in index.by_mal_id:
+            return index.by_mal_id[mal_id]
+        if name is not None:
+            existing = index.by_key.get(collation_key(name))
+            if existing is not None and (mal_id is None or existing not in index.mal_ids):
+                return existing
+        return None
+
+    def resolve(self, kind, name, mal_id=None, id_=None):
+        """
+        Returns the permanent ID for (name, mal_id), allocating the next free ID
+        for unseen keys (or `id_`, when adopting an existing database). A known
+        mal_id wins over the name, so a renamed studio keeps its ID; the old
+        name stays registered as an alias.
+        """
+        index = self.index(kind)
+        key = collation_key(name)
+        existing = self.lookup(kind, name, mal_id)
+        if existing is not None:
+            if key not in index.by_key:
+                # Renamed upstream: keep the old name as an alias, export the new one.
+                index.by_key[key] = existing
+                index.names[existing] = name
+                self.conn.execute("INSERT INTO entity_name VALUES (?, ?, ?)", (kind, key, existing))
+                self.conn.execute("UPDATE entity SET name = ? WHERE kind = ? AND id = ?", (name, kind, existing))
+            if mal_id is not None and mal_id not in index.by_mal_id:
+                index.by_mal_id[mal_id] = existing
+                index.mal_ids[existing] = mal_id
+                self.conn.execute("UPDATE entity SET mal_id = ? WHERE kind = ? AND id = ? AND mal_id IS NULL", (mal_id, kind, existing))
+            return existing
+
+        new_id = id_ if id_ is not None else index.next_id
+        if new_id in index.names:
+            raise ValueError(f"{kind} id {new_id} is already registered for {index.names[new_id]!r}")
+        index.next_id = max(index.next_id, new_id + 1)
+        index.names[new_id] = name
+        if mal_id is not None:
+            index.by_mal_id[mal_id] = new_id
+            index.mal_ids[new_id] = mal_id
+        self.conn.execute("INSERT INTO entity VALUES (?, ?, ?, ?)", (kind, new_id, name, mal_id))
+        if key not in index.by_key:
+            # A same-named entity with another mal_id keeps the name for name-only lookups.
+            index.by_key[key] = new_id
+            self.conn.execute("INSERT INTO entity_name VALUES (?, ?, ?)", (kind, key, new_id))
+        return new_id
+
+    def add_alias(self, kind, name, id_):
+        """Registers `name` as another name of entity `id_`, without renaming it."""
+        index = self.index(kind)
+        key = collation_key(name)
+        if key not in index.by_key:
+            index.by_key[key] = id_
+            self.conn.execute("INSERT INTO entity_name VALUES (?, ?, ?)", (kind, key, id_))
+
+    def name_map(self, kind):
+        """{registered name: id}, in ID order."""
+        return {name: id_ for id_, name in sorted(self.index(kind).names.items())}
+
+    def commit(self):
+        self.conn.commit()
+
+def write_map_file(mapping, path, variable_name):
+    """Writes the `name = {...}` text format autoinsert3.load_map_from_text reads."""
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write(f"{variable_name} = {{\n")
+        for name, id_ in mapping.items():
+            out.write(f"    {name!r}: {id_},\n")
+        out.write("}\n")
+
+def export_maps(registry):
+    for kind, (path, variable_name) in MAP_FILES.items():
+        mapping = registry.name_map(kind)
+        if mapping:
+            write_map_file(mapping, path, variable_name)
+            print(f"💾 {len(mapping)} {kind} IDs exported to {path}")
+
+def seeded_anime_ids(path=REGISTRY_FILE):
+    """
+    AnimeIDs of the last generated catalog, for the comment/watchlist generators.
+    Prefers catalog/anime.arrow (exactly the rows autoinsert3.py wrote), then the
+    registry (append-only, so it may also hold anime a --delta run removed).
+    Returns [] when neither exists.
+    """
+    import catalog_columnar
+    if catalog_columnar.pa is not None and os.path.exists(os.path.join(catalog_columnar.CATALOG_DIR, 'anime.arrow')):
+        return catalog_columnar.open_table('anime', ['anime_id']).column('anime_id').to_pylist()
+    if not os.path.exists(path):
+        return []
+    conn = sqlite3.connect(path)
+    try:
+        return [id_ for (id_,) in conn.execute("SELECT id FROM entity WHERE kind = 'anime' ORDER BY id")]
+    finally:
+        conn.close()
+
+def adopt(registry, kind, rows, source):
+    """Registers (id, name, mal_id) rows under their existing IDs and reports keys already registered differently."""
+    conflicts = 0
+    for id_, name, mal_id in rows:
+        if registry.resolve(kind, name, mal_id, id_=id_) != id_:
+            conflicts += 1
+    print(f"📥 {len(rows)} {kind} IDs imported from {source}")
+    if conflicts:
+        print(f"⚠️ {conflicts} {kind} entries were already registered under another ID (kept the registered one).")
+
+def import_maps(registry):
+    """Adopts the IDs in studio_map.txt / tag_map.txt, i.e. the ones an existing database already uses."""
+    from autoinsert3 import load_map_from_text
+    for kind, (path, variable_name) in MAP_FILES.items():
+        mapping = load_map_from_text(path, variable_name) or {}
+        adopt(registry, kind, [(id_, name, None) for name, id_ in mapping.items()], path)
+
+def import_database(registry):
+    """Adopts the IDs of the live database, including AnimeIDs (needed before --delta runs against it)."""
+    from db_connection import get_connection
+    queries = {
+        'studio': "SELECT StudioID, studio_name, NULL FROM studio",
+        'tag': "SELECT TagID, tag, NULL FROM tags",
+        'anime': "SELECT AnimeID, title, mal_id FROM anime",
+    }
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            for kind, query in queries.items():
+                cursor.execute(query)
+                adopt(registry, kind, cursor.fetchall(), "the database")
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the persistent StudioID / TagID / AnimeID registry.")
+    parser.add_argument('--registry', default=REGISTRY_FILE)
+    parser.add_argument('--import-maps', action='store_true', help="Register the IDs from studio_map.txt / tag_map.txt")
+    parser.add_argument('--import-db', action='store_true', help="Register the studio, tag and anime IDs of the live database")
+    parser.add_argument('--export-maps', action='store_true', help="Write studio_map.txt / tag_map.txt from the registry")
+    parser.add_argument('--stats', action='store_true')
+    args = parser.parse_args()
+
+    with IdRegistry(args.registry) as registry:
+        if args.import_maps:
+            import_maps(registry)
+        if args.import_db:
+            import_database(registry)
+        if args.export_maps:
+            export_maps(registry)
+        if args.stats or not (args.import_maps or args.import_db or args.export_maps):
+            for kind in KINDS:
+                index = registry.index(kind)
+                print(f"  {kind:<8}{len(index.names):>8,} IDs, {len(index.by_mal_id):,} with mal_id, next {index.next_id}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import aiohttp
+import asyncio
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import tqdm
+
+# Image stage for autoinsert3.py.
+# Downloads every anime image_url with bounded concurrency, stores the original
+# content-addressed (sha256) under public/images/, and generates WebP (and AVIF,
+# when Pillow supports it) thumbnails in a process pool.
+#
+# A url -> result cache (image_cache.json) makes reruns skip images that were
+# already mirrored. Nothing here is tied to the Jikan/MAL host, so the stage can
+# be exercised against a local server, e.g.:
+#     python -m http.server 8000 --directory sample_images
+#     python image_mirror.py http://localhost:8000/a.jpg http://localhost:8000/b.jpg
+
+IMAGE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public', 'images')
+PUBLIC_PREFIX = '/images'
+CACHE_FILE = 'image_cache.json'
+MAX_CONCURRENT_DOWNLOADS = 8
+THUMBNAIL_WIDTHS = [160, 320, 640]
+CARD_WIDTH = 320 # Thumbnail used as anime.image_local
+MAX_RETRIES = 3
+
+def content_dir(sha):
+    return os.path.join(IMAGE_ROOT, sha[:2])
+
+def public_path(sha, filename):
+    return f"{PUBLIC_PREFIX}/{sha[:2]}/{filename}"
+
+def load_cache(path=CACHE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_cache(cache, path=CACHE_FILE):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+def is_cached(entry):
+    """A cache entry is only trusted if all of its files are still on disk."""
+    if not entry:
+        return False
+    sha = entry['sha256']
+    files = [entry['original']] + [v['path'] for v in entry['thumbnails']]
+    return all(os.path.exists(os.path.join(content_dir(sha), os.path.basename(f))) for f in files)
+
+def make_thumbnails(data, sha):
+    """
+    Runs in a worker process: decodes the original once and writes every
+    thumbnail size. Returns the original dimensions and the thumbnail list.
+    """
+    from PIL import Image, features
+
+    formats = ['webp'] + (['avif'] if features.check('avif') else [])
+    out_dir = content_dir(sha)
+    os.makedirs(out_dir, exist_ok=True)
+
+    with Image.open(io.BytesIO(data)) as img:
+        img = img.convert('RGB')
+        width, height = img.size
+        thumbnails = []
+        for target in THUMBNAIL_WIDTHS:
+            # Never upscale; small originals just get re-encoded at their own size.
+            w = min(target, width)
+            h = max(1, round(height * w / width))
+            resized = img if w == width else img.resize((w, h), Image.LANCZOS)
+            for fmt in formats:
+                filename = f"{sha}_{target}.{fmt}"
+                path = os.path.join(out_dir, filename)
+                if not os.path.exists(path):
+                    resized.save(path, fmt.upper(), quality=80)
+                thumbnails.append({'width': w, 'height': h, 'format': fmt, 'path': public_path(sha, filename)})
+
+    return width, height, thumbnails
+
+def save_original(data, url):
+    sha = hashlib.sha256(data).hexdigest()
+    ext = os.path.splitext(url.split('?', 1)[0])[1].lower() or '.jpg'
+    filename = f"{sha}{ext}"
+    os.makedirs(content_dir(sha), exist_ok=True)
+    path = os.path.join(content_dir(sha), filename)
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+    return sha, public_path(sha, filename)
+
+async def download(session, url, semaphore):
+    async with semaphore:
+        # Retry in a loop, like autoinsert3.fetch_page: recursing here re-acquired
+        # the semaphore while still holding it and could deadlock.
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                async with session.get(url) as response:
+                    if response.status == 429 and attempt < MAX_RETRIES:
+                        await asyncio.sleep(2 * attempt)
+                        continue
+                    if response.status != 200:
+                        print(f"❌ Failed to fetch image {url}: {response.status}")
+                        return None
+                    return await response.read()
+            except Exception as e:
+                print(f"⚠️ Error downloading {url}: {e}")
+                return None
+
+async def mirror_one(session, url, semaphore, pool, cache):
+    if is_cached(cache.get(url)):
+        return url, cache[url]
+
+    data = await download(session, url, semaphore)
+    if data is None:
+        return url, None
+
+    sha, original = save_original(data, url)
+    loop = asyncio.get_running_loop()
+    try:
+        width, height, thumbnails = await loop.run_in_executor(pool, make_thumbnails, data, sha)
+    except Exception as e:
+        print(f"⚠️ Could not process image {url}: {e}")
+        return url, None
+
+    card = next((t['path'] for t in thumbnails if t['format'] == 'webp' and f"_{CARD_WIDTH}." in t['path']), original)
+    return url, {
+        'sha256': sha,
+        'original': original,
+        'width': width,
+        'height': height,
+        'card': card,
+        'thumbnails': thumbnails,
+    }
+
+async def mirror_images(urls, concurrency=MAX_CONCURRENT_DOWNLOADS, cache_path=CACHE_FILE):
+    """
+    Mirrors every url and returns {url: info} (info is None for failures).
+    Duplicate urls are only fetched once.
+    """
+    cache = load_cache(cache_path)
+    unique_urls = [u for u in dict.fromkeys(urls) if u]
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {}
+
+    with ProcessPoolExecutor() as pool:
+        async with aiohttp.ClientSession() as session:
+            tasks = [mirror_one(session, url, semaphore, pool, cache) for url in unique_urls]
+            for f in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="🖼️ Mirroring Images", unit="img"):
+                url, info = await f
+                results[url] = info
+                if info:
+                    cache[url] = info
+
+    save_cache(cache, cache_path)
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python image_mirror.py <image_url> [<image_url> ...]")
+        sys.exit(1)
+    mirrored = asyncio.run(mirror_images(sys.argv[1:]))
+    print(json.dumps(mirrored, indent=2))
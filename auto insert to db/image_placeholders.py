@@ -0,0 +1,216 @@
+import aiohttp
+import asyncio
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import tqdm
+from image_mirror import content_dir, load_cache as load_mirror_cache, MAX_CONCURRENT_DOWNLOADS, MAX_RETRIES
+
+# Placeholder stage for autoinsert3.py.
+# For every anime image computes a BlurHash string, the dominant color and the
+# aspect ratio, so cards can paint a correctly sized placeholder before the
+# real image arrives.
+#
+# Images already mirrored by image_mirror.py are read from disk; anything else
+# is downloaded. Results are cached by the sha256 of the image bytes in
+# placeholder_cache.json, so unchanged images are never recomputed.
+# placeholder_urls.json remembers the sha256 and the ETag / Last-Modified of
+# every downloaded URL, so the next run sends a conditional GET and an
+# unchanged image (304 Not Modified) is not downloaded again.
+
+CACHE_FILE = 'placeholder_cache.json'
+URL_CACHE_FILE = 'placeholder_urls.json'
+BLURHASH_COMPONENTS = (4, 3) # x, y
+SAMPLE_SIZE = 32 # Images are downscaled to this before encoding
+BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+def encode_base83(value, length):
+    return ''.join(BASE83[(value // 83 ** (length - i - 1)) % 83] for i in range(length))
+
+def srgb_to_linear(values):
+    v = values / 255.0
+    return np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+def linear_to_srgb(value):
+    v = min(max(value, 0.0), 1.0)
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * v ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+def blurhash(pixels, components=BLURHASH_COMPONENTS):
+    """
+    BlurHash encoder (https://blurha.sh) over an RGB uint8 array of shape (h, w, 3).
+    """
+    cx, cy = components
+    height, width = pixels.shape[:2]
+    linear = srgb_to_linear(pixels.astype(np.float64))
+
+    xs = np.arange(width)
+    ys = np.arange(height)
+    factors = []
+    for j in range(cy):
+        basis_y = np.cos(np.pi * j * ys / height)
+        for i in range(cx):
+            basis_x = np.cos(np.pi * i * xs / width)
+            basis = np.outer(basis_y, basis_x)
+            scale = (1 if i == 0 and j == 0 else 2) / (width * height)
+            factors.append(scale * np.tensordot(basis, linear, axes=([0, 1], [0, 1])))
+
+    dc, ac = factors[0], factors[1:]
+    result = encode_base83((cx - 1) + (cy - 1) * 9, 1)
+
+    if ac:
+        actual_max = max(float(np.abs(f).max()) for f in ac)
+        quantised_max = int(max(0, min(82, np.floor(actual_max * 166 - 0.5))))
+        max_value = (quantised_max + 1) / 166
+        result += encode_base83(quantised_max, 1)
+    else:
+        max_value = 1
+        result += encode_base83(0, 1)
+
+    r, g, b = (linear_to_srgb(c) for c in dc)
+    result += encode_base83((r << 16) + (g << 8) + b, 4)
+
+    for factor in ac:
+        q = [int(max(0, min(18, np.floor(np.sign(v) * abs(v / max_value) ** 0.5 * 9 + 9.5)))) for v in factor]
+        result += encode_base83(q[0] * 19 * 19 + q[1] * 19 + q[2], 2)
+
+    return result
+
+def dominant_color(img):
+    """Most common color after reducing the image to a 5-color palette, as #rrggbb."""
+    small = img.resize((64, 64)).quantize(colors=5)
+    palette = small.getpalette()
+    _, index = max(small.getcolors())
+    r, g, b = palette[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def compute_placeholder(data):
+    """Runs in a worker process."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as img:
+        img = img.convert('RGB')
+        width, height = img.size
+        sample = np.asarray(img.resize((SAMPLE_SIZE, max(1, round(SAMPLE_SIZE * height / width)))))
+        return {
+            'blurhash': blurhash(sample),
+            'color': dominant_color(img),
+            'aspect_ratio': round(width / height, 3),
+            'width': width,
+            'height': height,
+        }
+
+def load_cache(path=CACHE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_cache(cache, path=CACHE_FILE):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+def read_mirrored(entry):
+    """Returns the original bytes for an image_mirror cache entry, if still on disk."""
+    if not entry:
+        return None
+    path = os.path.join(content_dir(entry['sha256']), os.path.basename(entry['original']))
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+async def fetch_image(session, url, semaphore, entry=None):
+    """
+    GETs `url`, conditional on the ETag / Last-Modified in its placeholder_urls.json
+    `entry`. Returns (status, data, validators); data is None for 304 and failures.
+    """
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    async with semaphore:
+        # Same bounded retry loop as image_mirror.download
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 429 and attempt < MAX_RETRIES:
+                        await asyncio.sleep(2 * attempt)
+                        continue
+                    if response.status == 304:
+                        return 304, None, None
+                    if response.status != 200:
+                        print(f"❌ Failed to fetch image {url}: {response.status}")
+                        return response.status, None, None
+                    validators = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+                    return 200, await response.read(), validators
+            except Exception as e:
+                print(f"⚠️ Error downloading {url}: {e}")
+                return None, None, None
+
+async def placeholder_for(session, url, semaphore, pool, cache, url_cache, mirror_cache):
+    validators = {}
+    data = read_mirrored(mirror_cache.get(url))
+    if data is None:
+        # Only revalidate when the placeholder for the last seen bytes is still cached
+        entry = url_cache.get(url)
+        if entry and entry['sha256'] not in cache:
+            entry = None
+        status, data, validators = await fetch_image(session, url, semaphore, entry)
+        if status == 304:
+            return url, cache[entry['sha256']]
+    if data is None:
+        return url, None
+
+    sha = hashlib.sha256(data).hexdigest()
+    url_cache[url] = {'sha256': sha, **validators}
+    if sha in cache:
+        return url, cache[sha]
+
+    loop = asyncio.get_running_loop()
+    try:
+        info = await loop.run_in_executor(pool, compute_placeholder, data)
+    except Exception as e:
+        print(f"⚠️ Could not process image {url}: {e}")
+        return url, None
+
+    cache[sha] = info
+    return url, info
+
+async def compute_placeholders(urls, concurrency=MAX_CONCURRENT_DOWNLOADS, cache_path=CACHE_FILE, url_cache_path=URL_CACHE_FILE):
+    """
+    Returns {url: {'blurhash', 'color', 'aspect_ratio', 'width', 'height'}}
+    (None for images that could not be fetched or decoded).
+    """
+    cache = load_cache(cache_path)
+    url_cache = load_cache(url_cache_path)
+    mirror_cache = load_mirror_cache()
+    unique_urls = [u for u in dict.fromkeys(urls) if u]
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {}
+
+    with ProcessPoolExecutor() as pool:
+        async with aiohttp.ClientSession() as session:
+            tasks = [placeholder_for(session, url, semaphore, pool, cache, url_cache, mirror_cache) for url in unique_urls]
+            for f in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="🎨 Computing Placeholders", unit="img"):
+                url, info = await f
+                results[url] = info
+
+    save_cache(cache, cache_path)
+    save_cache(url_cache, url_cache_path)
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python image_placeholders.py <image_url> [<image_url> ...]")
+        sys.exit(1)
+    print(json.dumps(asyncio.run(compute_placeholders(sys.argv[1:])), indent=2))
@@ -0,0 +1,244 @@
+import argparse
+import gc
+import glob
+import json
+import os
+import random
+import time
+import tracemalloc
+from typing import Union
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Projected decoding of Jikan anime listing pages (top/anime, seasons/*).
+#
+# A Jikan anime entry carries trailers, broadcast info, title arrays, several
+# image variants, producers, licensors and more, while the pipeline reads about
+# a dozen fields. decode_page() turns the raw response bytes into the usual
+# {'data': [...], 'pagination': {...}} shape but keeps only ANIME_FIELDS, so
+# the rest is never materialized as Python objects (and never lands in
+# raw_anime_snapshot.json):
+#
+#   msgspec  typed Struct schema, unknown fields skipped inside the C decoder
+#   orjson   fast full parse, then projection
+#   json     standard library fallback, same projection
+#
+# All three return identical dicts; missing keys stay missing, nulls stay None.
+# A page msgspec rejects (unexpected types) is decoded again with the fallback.
+#
+# Usage (benchmark, decode time and memory per page):
+#   python jikan_decode.py
+#   python jikan_decode.py --cassettes jikan_cassettes --repeat 20
+
+# Fields consumed by autoinsert3, studiocatcher2, synth_catalog and airing_refresh.
+# None keeps the value as is, a dict projects a nested object, a one-item list each list element.
+NAMED = {'mal_id': None, 'name': None}
+ANIME_FIELDS = {
+    'mal_id': None,
+    'title': None,
+    'type': None,
+    'status': None,
+    'episodes': None,
+    'score': None,
+    'synopsis': None,
+    'aired': {'from': None, 'to': None},
+    'images': {'jpg': {'image_url': None}},
+    'studios': [NAMED],
+    'genres': [NAMED],
+    'themes': [NAMED],
+    'explicit_genres': [NAMED],
+    'demographics': [NAMED],
+}
+PAGE_FIELDS = {'data': [ANIME_FIELDS], 'pagination': None}
+BENCH_PAGES = 40
+BENCH_PER_PAGE = 25
+
+def project(value, spec):
+    if spec is None or value is None:
+        return value
+    if isinstance(spec, list):
+        return [project(item, spec[0]) for item in value] if isinstance(value, list) else value
+    if isinstance(value, dict):
+        return {key: project(value[key], sub) for key, sub in spec.items() if key in value}
+    return value
+
+if msgspec is not None:
+    UNSET = msgspec.UNSET
+    Unset = msgspec.UnsetType
+
+    class Named(msgspec.Struct):
+        mal_id: Union[int, None, Unset] = UNSET
+        name: Union[str, None, Unset] = UNSET
+
+    class Aired(msgspec.Struct):
+        from_: Union[str, None, Unset] = msgspec.field(default=UNSET, name='from')
+        to: Union[str, None, Unset] = UNSET
+
+    class ImageSet(msgspec.Struct):
+        image_url: Union[str, None, Unset] = UNSET
+
+    class Images(msgspec.Struct):
+        jpg: Union[ImageSet, None, Unset] = UNSET
+
+    class Anime(msgspec.Struct):
+        mal_id: Union[int, None, Unset] = UNSET
+        title: Union[str, None, Unset] = UNSET
+        type: Union[str, None, Unset] = UNSET
+        status: Union[str, None, Unset] = UNSET
+        episodes: Union[int, None, Unset] = UNSET
+        score: Union[float, None, Unset] = UNSET
+        synopsis: Union[str, None, Unset] = UNSET
+        aired: Union[Aired, None, Unset] = UNSET
+        images: Union[Images, None, Unset] = UNSET
+        studios: Union[list[Named], None, Unset] = UNSET
+        genres: Union[list[Named], None, Unset] = UNSET
+        themes: Union[list[Named], None, Unset] = UNSET
+        explicit_genres: Union[list[Named], None, Unset] = UNSET
+        demographics: Union[list[Named], None, Unset] = UNSET
+
+    class Page(msgspec.Struct):
+        data: Union[list[Anime], None, Unset] = UNSET
+        pagination: Union[dict, None, Unset] = UNSET
+
+    PAGE_DECODER = msgspec.json.Decoder(Page)
+
+def decode_msgspec(raw):
+    try:
+        return msgspec.to_builtins(PAGE_DECODER.decode(raw))
+    except msgspec.ValidationError:
+        return decode_json(raw)
+
+def decode_orjson(raw):
+    return project(orjson.loads(raw), PAGE_FIELDS)
+
+def decode_json(raw):
+    return project(json.loads(raw), PAGE_FIELDS)
+
+DECODERS = {'msgspec': decode_msgspec, 'orjson': decode_orjson, 'json': decode_json}
+AVAILABLE = [name for name, module in (('msgspec', msgspec), ('orjson', orjson), ('json', json)) if module is not None]
+DEFAULT_DECODER = os.environ.get('JIKAN_DECODER', AVAILABLE[0])
+
+def decode_page(raw, decoder=DEFAULT_DECODER):
+    """Raw page bytes -> {'data': [projected anime], 'pagination': {...}}."""
+    return DECODERS[decoder](raw)
+
+# --- BENCHMARK ---
+
+def full_anime(anime, rng):
+    """Pads a projected anime with the other fields a real Jikan v4 entry carries, at realistic sizes."""
+    mal_id = anime.get('mal_id') or rng.randint(1, 60000)
+    image = lambda kind: f"https://cdn.myanimelist.net/images/anime/{mal_id % 2000}/{mal_id}{kind}.jpg"
+    names = lambda key: [dict(n, type='anime', url=f"https://myanimelist.net/anime/{key}/{n.get('mal_id')}") for n in anime.get(key) or []]
+    title = anime.get('title') or 'Untitled'
+    return {
+        **anime,
+        'url': f"https://myanimelist.net/anime/{mal_id}/{title.replace(' ', '_')}",
+        'images': {
+            'jpg': {'image_url': image(''), 'small_image_url': image('t'), 'large_image_url': image('l')},
+            'webp': {'image_url': image('').replace('.jpg', '.webp'), 'small_image_url': image('t').replace('.jpg', '.webp'), 'large_image_url': image('l').replace('.jpg', '.webp')},
+        },
+        'trailer': {
+            'youtube_id': 'dQw4w9WgXcQ', 'url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'embed_url': 'https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ?enablejsapi=1&wmode=opaque&autoplay=1',
+            'images': {k: f"https://img.youtube.com/vi/dQw4w9WgXcQ/{k}.jpg" for k in ('image_url', 'small_image_url', 'medium_image_url', 'large_image_url', 'maximum_image_url')},
+        },
+        'approved': True,
+        'titles': [{'type': 'Default', 'title': title}, {'type': 'Japanese', 'title': title}, {'type': 'English', 'title': title}, {'type': 'Synonym', 'title': title.upper()}],
+        'title_english': title, 'title_japanese': title, 'title_synonyms': [title.upper()],
+        'source': 'Manga', 'airing': anime.get('status') == 'Currently Airing',
+        'aired': {
+            **(anime.get('aired') or {}),
+            'prop': {'from': {'day': 1, 'month': 4, 'year': 2020}, 'to': {'day': 30, 'month': 9, 'year': 2020}},
+            'string': 'Apr 1, 2020 to Sep 30, 2020',
+        },
+        'duration': '24 min per ep', 'rating': 'PG-13 - Teens 13 or older',
+        'scored_by': rng.randint(100, 2_000_000), 'rank': rng.randint(1, 20000), 'popularity': rng.randint(1, 20000),
+        'members': rng.randint(100, 3_000_000), 'favorites': rng.randint(0, 200_000),
+        'background': 'Background notes. ' * rng.randint(0, 20),
+        'season': 'spring', 'year': 2020,
+        'broadcast': {'day': 'Saturdays', 'time': '01:28', 'timezone': 'Asia/Tokyo', 'string': 'Saturdays at 01:28 (JST)'},
+        'producers': [{'mal_id': rng.randint(1, 2000), 'type': 'anime', 'name': f"Producer {i}", 'url': 'https://myanimelist.net/anime/producer/1'} for i in range(rng.randint(1, 8))],
+        'licensors': [{'mal_id': rng.randint(1, 2000), 'type': 'anime', 'name': 'Licensor', 'url': 'https://myanimelist.net/anime/producer/2'}],
+        'studios': names('studios'), 'genres': names('genres'), 'themes': names('themes'),
+        'explicit_genres': names('explicit_genres'), 'demographics': names('demographics'),
+    }
+
+def bench_pages(cassette_dir, pages, seed):
+    """Raw page bytes: recorded top/anime cassettes if available, else padded pages built from the snapshot or seed catalog."""
+    if cassette_dir:
+        raws = []
+        for path in sorted(glob.glob(os.path.join(cassette_dir, '*.json'))):
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('status') == 200 and isinstance((entry.get('body') or {}).get('data'), list):
+                raws.append(json.dumps(entry['body']).encode('utf-8'))
+        if raws:
+            return raws[:pages], f"{cassette_dir}/"
+
+    from autoinsert3 import load_maps, RAW_SNAPSHOT_FILE
+    from synth_catalog import CatalogModel, load_snapshot, seed_catalog
+    rng = random.Random(seed)
+    studio_map, tag_map = load_maps()
+    if os.path.exists(RAW_SNAPSHOT_FILE):
+        model, source = CatalogModel(load_snapshot(RAW_SNAPSHOT_FILE), studio_map), f"padded samples of {RAW_SNAPSHOT_FILE}"
+    else:
+        model, source = CatalogModel(seed_catalog(studio_map, tag_map, rng), studio_map), "padded seed catalog"
+    raws = []
+    for page in range(pages):
+        data = [full_anime(model.sample(rng, page * BENCH_PER_PAGE + i + 1), rng) for i in range(BENCH_PER_PAGE)]
+        body = {'pagination': {'last_visible_page': pages, 'has_next_page': page + 1 < pages, 'current_page': page + 1}, 'data': data}
+        raws.append(json.dumps(body).encode('utf-8'))
+    return raws, source
+
+def measure(decode, raws, repeat):
+    """(best seconds per page, retained KB per page, peak KB per page)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for raw in raws:
+            decode(raw)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    kept = [decode(raw) for raw in raws]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return best / len(raws), current / len(raws) / 1024, peak / len(raws) / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full vs projected decoding of Jikan anime pages.")
+    parser.add_argument('--cassettes', help="Use recorded pages from this cassette directory")
+    parser.add_argument('--pages', type=int, default=BENCH_PAGES)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    raws, source = bench_pages(args.cassettes, args.pages, args.seed)
+    print(f"📄 {len(raws)} pages from {source}, {sum(map(len, raws)) / len(raws) / 1024:.1f} KB raw per page")
+
+    reference = decode_json(raws[0])
+    for name in AVAILABLE:
+        if decode_page(raws[0], name) != reference:
+            print(f"❌ {name} decodes differently from the json fallback")
+
+    candidates = [('json.loads (full)', json.loads)]
+    if orjson is not None:
+        candidates.append(('orjson.loads (full)', orjson.loads))
+    candidates += [(f"{name} (projected)", DECODERS[name]) for name in AVAILABLE]
+
+    print(f"\n{'decoder':<24}{'ms/page':>10}{'KB kept/page':>15}{'KB peak/page':>15}")
+    for label, decode in candidates:
+        seconds, kept, peak = measure(decode, raws, args.repeat)
+        print(f"{label:<24}{seconds * 1000:>10.3f}{kept:>15.1f}{peak:>15.1f}")
+    print(f"\n✅ Pipeline default: {DEFAULT_DECODER} (set JIKAN_DECODER to override)")
+
+if __name__ == "__main__":
+    main()
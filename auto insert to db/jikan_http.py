@@ -0,0 +1,148 @@
+import aiohttp
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+
+# Record/replay layer for Jikan requests.
+#
+# The crawlers (autoinsert3.py, studiocatcher2.py, tagcatcher.py) open a
+# JikanSession instead of a plain aiohttp.ClientSession. Its behaviour is
+# chosen with environment variables, so the scripts themselves don't change:
+#
+#   JIKAN_HTTP_MODE=live    (default) talk to the API
+#   JIKAN_HTTP_MODE=record  talk to the API and save every successful JSON
+#                           response to JIKAN_CASSETTE_DIR
+#   JIKAN_HTTP_MODE=replay  serve responses from JIKAN_CASSETTE_DIR only,
+#                           no network at all; unknown requests get a 404
+#   JIKAN_API_ROOT=http://localhost:8900/v4
+#                           send requests to another server, e.g. jikan_stub.py
+#
+# Cassettes are keyed by the original api.jikan.moe URL and query, so a
+# recording made against the stub replays the same way as a real one.
+
+JIKAN_ROOT = "https://api.jikan.moe/v4"
+MODE = os.environ.get('JIKAN_HTTP_MODE', 'live')
+CASSETTE_DIR = os.environ.get('JIKAN_CASSETTE_DIR', 'jikan_cassettes')
+API_ROOT = os.environ.get('JIKAN_API_ROOT', '').rstrip('/')
+
+if MODE not in ('live', 'record', 'replay'):
+    raise ValueError(f"JIKAN_HTTP_MODE must be live, record or replay (got {MODE!r})")
+
+def resolve_url(url):
+    if API_ROOT and url.startswith(JIKAN_ROOT):
+        return API_ROOT + url[len(JIKAN_ROOT):]
+    return url
+
+def cassette_path(url, params):
+    query = urllib.parse.urlencode(sorted((params or {}).items()))
+    key = hashlib.sha1(f"{url}?{query}".encode('utf-8')).hexdigest()[:20]
+    return os.path.join(CASSETTE_DIR, f"{key}.json")
+
+def save_cassette(url, params, status, body):
+    os.makedirs(CASSETTE_DIR, exist_ok=True)
+    path = cassette_path(url, params)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'url': url, 'params': params, 'status': status, 'body': body}, f)
+    os.replace(tmp_path, path)
+
+def load_cassette(url, params):
+    path = cassette_path(url, params)
+    if not os.path.exists(path):
+        print(f"⚠️ No recording for {url} {params or ''}")
+        return 404, None
+    with open(path, 'r', encoding='utf-8') as f:
+        entry = json.load(f)
+    return entry['status'], entry['body']
+
+class ReplayResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+
+    async def json(self):
+        return self.body
+
+    async def read(self):
+        return json.dumps(self.body).encode('utf-8')
+
+class RecordingResponse:
+    def __init__(self, response, url, params):
+        self.response = response
+        self.status = response.status
+        self.url = url
+        self.params = params
+
+    async def json(self):
+        body = await self.response.json()
+        # Only responses the caller actually consumed are saved, so 429s and
+        # errors are never replayed.
+        save_cassette(self.url, self.params, self.status, body)
+        return body
+
+    async def read(self):
+        raw = await self.response.read()
+        save_cassette(self.url, self.params, self.status, json.loads(raw))
+        return raw
+
+class JikanRequest:
+    def __init__(self, session, url, params):
+        self.session = session
+        self.url = url
+        self.params = params
+        self.request = None
+
+    async def __aenter__(self):
+        if MODE == 'replay':
+            return ReplayResponse(*load_cassette(self.url, self.params))
+        self.request = self.session.get(resolve_url(self.url), params=self.params)
+        response = await self.request.__aenter__()
+        if MODE == 'record':
+            return RecordingResponse(response, self.url, self.params)
+        return response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.request is not None:
+            return await self.request.__aexit__(exc_type, exc, tb)
+        return False
+
+class JikanSession:
+    """Drop-in for the `async with aiohttp.ClientSession() as session: session.get(...)` pattern."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.session = None
+
+    async def __aenter__(self):
+        if MODE != 'replay':
+            self.session = aiohttp.ClientSession(**self.kwargs)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.session is not None:
+            await self.session.close()
+        return False
+
+    def get(self, url, params=None):
+        return JikanRequest(self.session, url, params)
+
+def get_json(url, params=None, timeout=30):
+    """Blocking GET for simple one-off scripts. Returns (status, body or None)."""
+    if MODE == 'replay':
+        return load_cassette(url, params)
+
+    full_url = resolve_url(url)
+    if params:
+        full_url += '?' + urllib.parse.urlencode(params)
+    try:
+        with urllib.request.urlopen(full_url, timeout=timeout) as response:
+            status, body = response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, None
+
+    if MODE == 'record':
+        save_cassette(url, params, status, body)
+    return status, body
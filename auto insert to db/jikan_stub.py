@@ -0,0 +1,215 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+from aiohttp import web
+from autoinsert3 import load_maps, RAW_SNAPSHOT_FILE
+from synth_catalog import CatalogModel, load_snapshot, seed_catalog
+
+# Local stand-in for the parts of the Jikan API the crawlers use, so the fetch
+# path can be load-tested offline and at any catalog size.
+#
+#   GET /v4/top/anime?page=N   synthetic anime pages with Jikan's pagination block
+#   GET /v4/genres/anime       the genres from tag_map.txt
+#   GET /v4/seasons/now        the catalog's airing anime, paginated (airing_refresh.py)
+#   GET /v4/seasons/upcoming   the catalog's not yet aired anime, paginated
+#   GET /v4/anime/{id}         one anime by mal_id
+#   GET /v4/producers?page=N   the studios from studio_map.txt (studiocatcher2.py --from-producers)
+#
+# Anime come from synth_catalog.CatalogModel (learned from the raw snapshot, or
+# from a seed catalog built from the maps), and a page always has the same
+# content for the same --seed. Latency, random 5xx errors and 429 bursts can be
+# configured to see how the crawlers behave under throttling.
+#
+# Usage:
+#   python jikan_stub.py --pages 2000 --latency-ms 150 --error-rate 0.01 --burst-every 200 --burst-length 20
+#   JIKAN_API_ROOT=http://localhost:8900/v4 python autoinsert3.py
+
+DEFAULT_PORT = 8900
+PER_PAGE = 25
+
+class StubState:
+    def __init__(self, model, tag_names, studio_ids, args):
+        self.model = model
+        self.tag_names = tag_names
+        self.studio_ids = studio_ids
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.requests = 0
+        self.served = 0
+        self.throttled = 0
+        self.failed = 0
+        self.seasons = {}
+
+    def page(self, number):
+        rng = random.Random(self.args.seed * 1_000_003 + number)
+        first = (number - 1) * PER_PAGE
+        total = self.args.pages * PER_PAGE
+        count = max(0, min(PER_PAGE, total - first))
+        return {
+            'pagination': {
+                'last_visible_page': self.args.pages,
+                'has_next_page': number < self.args.pages,
+                'current_page': number,
+                'items': {'count': count, 'total': total, 'per_page': PER_PAGE},
+            },
+            'data': [self.anime(rng, first + i + 1) for i in range(count)],
+        }
+
+    def anime_by_id(self, mal_id):
+        if not 1 <= mal_id <= self.args.pages * PER_PAGE:
+            return None
+        page = self.page((mal_id - 1) // PER_PAGE + 1)
+        return page['data'][(mal_id - 1) % PER_PAGE]
+
+    def season(self, status):
+        """All catalog anime with `status`, computed once per stub run."""
+        if status not in self.seasons:
+            self.seasons[status] = [a for number in range(1, self.args.pages + 1)
+                                    for a in self.page(number)['data'] if a.get('status') == status]
+        return self.seasons[status]
+
+    def anime(self, rng, index):
+        anime = self.model.sample(rng, index)
+        anime['mal_id'] = index
+        anime['rank'] = index
+        anime['explicit_genres'] = []
+        anime['demographics'] = []
+        for studio in anime['studios']:
+            studio['mal_id'] = self.studio_ids.get(studio['name'])
+        return anime
+
+    async def throttle(self):
+        """Returns an error response to send instead of the real one, if any."""
+        self.requests += 1
+        args = self.args
+        if args.latency_ms:
+            jitter = self.rng.uniform(-args.jitter_ms, args.jitter_ms)
+            await asyncio.sleep(max(0.0, args.latency_ms + jitter) / 1000)
+        # Every burst_every requests, the next burst_length requests are rate limited.
+        if args.burst_every and (self.requests - 1) % args.burst_every < args.burst_length:
+            self.throttled += 1
+            return web.json_response({'status': 429, 'type': 'RateLimitException', 'message': 'Too Many Requests'}, status=429)
+        if args.error_rate and self.rng.random() < args.error_rate:
+            self.failed += 1
+            return web.json_response({'status': 500, 'type': 'InternalException'}, status=500)
+        return None
+
+async def top_anime(request):
+    state = request.app['state']
+    error = await state.throttle()
+    if error:
+        return error
+    try:
+        number = max(1, int(request.query.get('page', 1)))
+    except ValueError:
+        return web.json_response({'status': 400, 'type': 'ValidationException'}, status=400)
+    state.served += 1
+    return web.json_response(state.page(number))
+
+def season_handler(status):
+    async def handler(request):
+        state = request.app['state']
+        error = await state.throttle()
+        if error:
+            return error
+        try:
+            number = max(1, int(request.query.get('page', 1)))
+        except ValueError:
+            return web.json_response({'status': 400, 'type': 'ValidationException'}, status=400)
+        anime = state.season(status)
+        last_page = max(1, -(-len(anime) // PER_PAGE))
+        data = anime[(number - 1) * PER_PAGE:number * PER_PAGE]
+        state.served += 1
+        return web.json_response({
+            'pagination': {
+                'last_visible_page': last_page,
+                'has_next_page': number < last_page,
+                'current_page': number,
+                'items': {'count': len(data), 'total': len(anime), 'per_page': PER_PAGE},
+            },
+            'data': data,
+        })
+    return handler
+
+async def anime_by_id(request):
+    state = request.app['state']
+    error = await state.throttle()
+    if error:
+        return error
+    anime = state.anime_by_id(int(request.match_info['mal_id']))
+    if anime is None:
+        return web.json_response({'status': 404, 'type': 'BadResponseException'}, status=404)
+    state.served += 1
+    return web.json_response({'data': anime})
+
+async def producers(request):
+    state = request.app['state']
+    error = await state.throttle()
+    if error:
+        return error
+    try:
+        number = max(1, int(request.query.get('page', 1)))
+    except ValueError:
+        return web.json_response({'status': 400, 'type': 'ValidationException'}, status=400)
+    studios = sorted(state.studio_ids.items(), key=lambda item: item[1])
+    last_page = max(1, -(-len(studios) // PER_PAGE))
+    data = [{'mal_id': mal_id, 'titles': [{'type': 'Default', 'title': name}], 'count': 0}
+            for name, mal_id in studios[(number - 1) * PER_PAGE:number * PER_PAGE]]
+    state.served += 1
+    return web.json_response({
+        'pagination': {'last_visible_page': last_page, 'has_next_page': number < last_page, 'current_page': number},
+        'data': data,
+    })
+
+async def genres(request):
+    state = request.app['state']
+    error = await state.throttle()
+    if error:
+        return error
+    state.served += 1
+    return web.json_response({'data': [{'mal_id': i + 1, 'name': name, 'count': 0} for i, name in enumerate(state.tag_names)]})
+
+async def report(app):
+    state = app['state']
+    print(f"\n📊 {state.requests} requests: {state.served} served, {state.throttled} rate limited, {state.failed} failed")
+
+def build_model(studio_map, tag_map):
+    if os.path.exists(RAW_SNAPSHOT_FILE):
+        print(f"📂 Learning catalog shape from {RAW_SNAPSHOT_FILE}...")
+        return CatalogModel(load_snapshot(RAW_SNAPSHOT_FILE), studio_map)
+    print(f"⚠️ {RAW_SNAPSHOT_FILE} not found, using a seed catalog built from the maps.")
+    return CatalogModel(seed_catalog(studio_map, tag_map, random.Random(0)), studio_map)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic Jikan /v4/top/anime pages for offline crawl tests.")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--pages', type=int, default=600, help="Value of pagination.last_visible_page")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Mean added latency per request")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="Uniform +/- jitter around --latency-ms")
+    parser.add_argument('--error-rate', type=float, default=0, help="Fraction of requests answered with a 500")
+    parser.add_argument('--burst-every', type=int, default=0, help="Start a 429 burst every N requests (0 = never)")
+    parser.add_argument('--burst-length', type=int, default=0, help="Requests rate limited per burst")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    studio_map, tag_map = load_maps()
+    if not studio_map:
+        sys.exit(1)
+
+    app = web.Application()
+    app['state'] = StubState(build_model(studio_map, tag_map), [t for t in tag_map if t != 'NO TAGS'], dict(studio_map), args)
+    app.router.add_get('/v4/top/anime', top_anime)
+    app.router.add_get('/v4/genres/anime', genres)
+    app.router.add_get('/v4/seasons/now', season_handler('Currently Airing'))
+    app.router.add_get('/v4/seasons/upcoming', season_handler('Not yet aired'))
+    app.router.add_get(r'/v4/anime/{mal_id:\d+}', anime_by_id)
+    app.router.add_get('/v4/producers', producers)
+    app.on_cleanup.append(report)
+
+    print(f"🧪 Jikan stub with {args.pages} pages on http://localhost:{args.port}/v4")
+    web.run_app(app, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
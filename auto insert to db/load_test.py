@@ -0,0 +1,196 @@
+import aiohttp
+import argparse
+import asyncio
+import random
+import re
+import time
+from collections import defaultdict
+import numpy as np
+from autoinsert3 import load_map_from_text
+from randomcomments import ANIME_IDS, USER_IDS
+
+# Async load generator for the Express app.
+#
+# Replays a weighted traffic mix against a running server, drawing anime IDs
+# from the seeded ANIME_IDS with a Zipf skew (low IDs are the top-ranked
+# anime from /top/anime, so they get most of the traffic) and acting as the
+# seeded users from insert_users.sql. Each user logs in once; its JWT cookie is
+# reused for every authenticated request.
+#
+# Usage:
+#   python load_test.py --base-url http://localhost:3000 --duration 60 --concurrency 50
+#   python load_test.py --mix search=5,focus=5,carousel=2
+
+DEFAULT_MIX = {
+    'search': 25,
+    'focus': 30,
+    'carousel': 30,
+    'watchlist_add': 5,
+    'watchlist_update': 5,
+    'watchlist_delete': 5,
+}
+CAROUSEL_ROUTES = [
+    '/anime/animespotlight-animes',
+    '/anime/new-animes',
+    '/anime/upcoming-animes',
+    '/anime/recommended-animes',
+    '/anime/random-animes',
+    '/anime/mostwatchlist-animes',
+    '/anime/all-tags',
+]
+WATCHLIST_STATUSES = ['Completed', 'Watching', 'Plan to Watch']
+SEED_PASSWORD = '123' # Password of every user in insert_users.sql
+ZIPF_EXPONENT = 1.3
+EXPECTED_STATUSES = {404, 409} # Normal answers for random watchlist adds/updates/deletes
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in DEFAULT_MIX or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"Invalid mix entry: {part} (routes: {', '.join(DEFAULT_MIX)})")
+        mix[name] = int(weight)
+    return mix
+
+def load_usernames(path='insert_users.sql'):
+    """Usernames in insert order, so usernames[i] has UserID i + 1."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return re.findall(r"^\('([^']+)'", f.read(), flags=re.MULTILINE)
+
+def load_filter_values():
+    tag_map = load_map_from_text('tag_map.txt', 'tag_map') or {}
+    studio_map = load_map_from_text('studio_map.txt', 'studio_map') or {}
+    tags = [t for t in tag_map if t not in ('NO TAGS', 'Hentai', 'Erotica')]
+    return tags, list(studio_map)
+
+class TrafficModel:
+    def __init__(self, seed, tags, studios):
+        self.rng = np.random.default_rng(seed)
+        self.random = random.Random(seed)
+        self.anime_ids = ANIME_IDS
+        self.tags = tags
+        self.studios = studios
+
+    def anime_id(self):
+        rank = int(self.rng.zipf(ZIPF_EXPONENT))
+        return self.anime_ids[(rank - 1) % len(self.anime_ids)]
+
+    def search_params(self):
+        # Most searches stay on the first page, a few paginate deep.
+        params = {'q': '', 'page': str(min(int(self.rng.zipf(2.0)), 20))}
+        roll = self.random.random()
+        if roll < 0.4 and self.tags:
+            params['tags'] = ','.join(self.random.sample(self.tags, self.random.randint(1, 2)))
+        elif roll < 0.6 and self.studios:
+            params['studio'] = self.random.choice(self.studios)
+        elif roll < 0.8:
+            params['rating'] = str(self.random.randint(5, 9))
+        else:
+            params['q'] = self.random.choice(['no', 'a', 'gintama', 'one', 'love', 'kimi'])
+        return params
+
+async def login(session, base_url, username):
+    data = {'username': username, 'password': SEED_PASSWORD}
+    async with session.post(f"{base_url}/login", data=data, allow_redirects=False) as response:
+        cookie = response.cookies.get('jwt')
+        return cookie.value if cookie else None
+
+async def authenticate_users(session, base_url, usernames):
+    print(f"🔐 Logging in {len(usernames)} seeded users...")
+    tokens = await asyncio.gather(*(login(session, base_url, u) for u in usernames))
+    cookies = [{'jwt': t} for t in tokens if t]
+    if len(cookies) < len(usernames):
+        print(f"⚠️ {len(usernames) - len(cookies)} users could not log in.")
+    return cookies
+
+def build_request(route, model, user_cookies):
+    """Returns (method, path, kwargs) for one request of the given route type."""
+    if route == 'search':
+        return 'GET', '/search', {'params': model.search_params()}
+    if route == 'focus':
+        return 'GET', f"/focusanime/{model.anime_id()}", {}
+    if route == 'carousel':
+        return 'GET', model.random.choice(CAROUSEL_ROUTES), {}
+
+    cookies = model.random.choice(user_cookies)
+    anime_id = model.anime_id()
+    if route == 'watchlist_add':
+        body = {'animeId': anime_id, 'status': model.random.choice(WATCHLIST_STATUSES)}
+        return 'POST', '/api/user/watchlist', {'json': body, 'cookies': cookies}
+    if route == 'watchlist_update':
+        body = {'status': model.random.choice(WATCHLIST_STATUSES)}
+        return 'PUT', f"/api/user/watchlist/{anime_id}", {'json': body, 'cookies': cookies}
+    return 'DELETE', f"/api/user/watchlist/{anime_id}", {'cookies': cookies}
+
+async def worker(session, base_url, mix, model, user_cookies, deadline, stats):
+    routes = list(mix)
+    weights = [mix[r] for r in routes]
+    while time.perf_counter() < deadline:
+        route = model.random.choices(routes, weights)[0]
+        method, path, kwargs = build_request(route, model, user_cookies)
+        cookies = kwargs.pop('cookies', None)
+        headers = {'Cookie': f"jwt={cookies['jwt']}"} if cookies else None
+
+        start = time.perf_counter()
+        try:
+            async with session.request(method, f"{base_url}{path}", headers=headers, **kwargs) as response:
+                await response.read()
+                status = response.status
+        except Exception:
+            status = 0
+        stats[route].append((time.perf_counter() - start, status))
+
+def report(stats, elapsed):
+    print(f"\n📊 Results over {elapsed:.1f}s")
+    header = f"{'route':<18}{'requests':>10}{'req/s':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print('-' * len(header))
+    total = 0
+    for route in sorted(stats):
+        samples = stats[route]
+        latencies = np.array([s[0] for s in samples]) * 1000
+        errors = sum(1 for _, status in samples if status == 0 or (status >= 400 and status not in EXPECTED_STATUSES))
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        print(f"{route:<18}{len(samples):>10}{len(samples) / elapsed:>9.1f}{errors:>8}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}")
+        total += len(samples)
+    print('-' * len(header))
+    print(f"{'total':<18}{total:>10}{total / elapsed:>9.1f}")
+
+async def main():
+    parser = argparse.ArgumentParser(description="Async load test for the anime tracker endpoints.")
+    parser.add_argument('--base-url', default='http://localhost:3000')
+    parser.add_argument('--duration', type=float, default=30, help="Seconds to run")
+    parser.add_argument('--concurrency', type=int, default=20, help="Concurrent virtual clients")
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX, help="Weighted route mix, e.g. search=5,focus=3")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    usernames = load_usernames()[:len(USER_IDS)]
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    # DummyCookieJar: the login responses must not leak one user's cookie into every request.
+    async with aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar()) as session:
+        mix = dict(args.mix)
+        user_cookies = []
+        if any(name.startswith('watchlist') for name in mix):
+            user_cookies = await authenticate_users(session, args.base_url, usernames)
+            if not user_cookies:
+                print("⚠️ No authenticated users, skipping watchlist routes.")
+                mix = {name: w for name, w in mix.items() if not name.startswith('watchlist')}
+        if not mix:
+            print("❌ Nothing left to run.")
+            return
+
+        tags, studios = load_filter_values()
+
+        print(f"🚀 Running {args.concurrency} clients for {args.duration:.0f}s against {args.base_url}...")
+        stats = defaultdict(list)
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            worker(session, args.base_url, mix, TrafficModel(args.seed + i, tags, studios), user_cookies, deadline, stats)
+            for i in range(args.concurrency)
+        ))
+        report(stats, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    asyncio.run(main())
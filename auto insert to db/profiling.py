@@ -0,0 +1,135 @@
+import cProfile
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+
+# Shared --profile switch for the seeding scripts.
+#
+# With --profile a script runs under cProfile and tracemalloc, and writes next
+# to its other output:
+#   profile_<script>.prof       pstats dump (snakeviz, `python -m pstats`)
+#   profile_<script>.collapsed  collapsed stacks for flamegraph.pl / speedscope
+#   profile_<script>.memory.txt top allocation sites at every checkpoint
+#
+# Scripts call profiler.checkpoint("<stage>") at their stage boundaries.
+# Without --profile, Profiler is a no-op and checkpoint() returns immediately.
+#
+# Usage (inside a script):
+#   parser = argparse.ArgumentParser()
+#   add_profile_argument(parser)
+#   args = parser.parse_args()
+#   with Profiler(args.profile, 'autoinsert3') as profiler:
+#       ...
+#       profiler.checkpoint('fetch')
+
+TOP_ALLOCATIONS = 15
+TRACEMALLOC_FRAMES = 1
+COLLAPSED_MAX_DEPTH = 64
+COLLAPSED_MIN_US = 10 # Stacks below this many microseconds are dropped
+
+def add_profile_argument(parser):
+    parser.add_argument('--profile', action='store_true',
+                        help="Write a CPU profile and tracemalloc snapshots next to the output")
+
+class Profiler:
+    def __init__(self, enabled, name):
+        self.enabled = enabled
+        self.prefix = f"profile_{name}"
+        self.cpu = None
+        self.snapshots = []
+        self.stage_start = None
+
+    def __enter__(self):
+        if self.enabled:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self.stage_start = time.perf_counter()
+            self.cpu = cProfile.Profile()
+            self.cpu.enable()
+        return self
+
+    def checkpoint(self, stage):
+        """Records the memory state at the end of `stage`."""
+        if not self.enabled:
+            return
+        self.cpu.disable()
+        now = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        self.snapshots.append((stage, now - self.stage_start, current, peak, tracemalloc.take_snapshot()))
+        tracemalloc.reset_peak()
+        # Snapshot time is excluded from both the stage timing and the CPU profile.
+        self.stage_start = time.perf_counter()
+        self.cpu.enable()
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.enabled:
+            return False
+        self.cpu.disable()
+        tracemalloc.stop()
+
+        stats = pstats.Stats(self.cpu)
+        stats.dump_stats(f"{self.prefix}.prof")
+        with open(f"{self.prefix}.collapsed", 'w', encoding='utf-8') as f:
+            for stack, micros in collapsed_stacks(stats):
+                f.write(f"{stack} {micros}\n")
+        with open(f"{self.prefix}.memory.txt", 'w', encoding='utf-8') as f:
+            write_memory_report(f, self.snapshots)
+
+        print(f"🔬 Profile written to {self.prefix}.prof / .collapsed / .memory.txt", file=sys.stderr)
+        return False
+
+def frame_label(func):
+    filename, line, name = func
+    if filename == '~':
+        return name # Builtins, e.g. <method 'append' of 'list' objects>
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+def collapsed_stacks(stats):
+    """
+    Approximates call stacks from cProfile's caller/callee graph in the
+    collapsed "a;b;c <microseconds>" format. cProfile keeps one level of
+    callers, so time of a function reached along several paths is split in
+    proportion to each edge's cumulative time (same approach as flameprof).
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    totals = {}
+    roots = [func for func, entry in stats.stats.items() if not entry[4]]
+    # Walk iteratively: deep async call chains would overflow the recursion limit.
+    pending = [((func,), stats.stats[func][3]) for func in roots]
+    while pending:
+        path, cumulative = pending.pop()
+        func = path[-1]
+        _, _, self_time, func_cumulative, _ = stats.stats[func]
+        share = cumulative / func_cumulative if func_cumulative else 0
+        micros = int(self_time * share * 1_000_000)
+        if micros >= COLLAPSED_MIN_US:
+            key = ';'.join(frame_label(f) for f in path)
+            totals[key] = totals.get(key, 0) + micros
+        if len(path) >= COLLAPSED_MAX_DEPTH:
+            continue
+        for callee, edge_cumulative in callees.get(func, []):
+            if callee in path:
+                continue # Recursion, already counted in the outer frame
+            child = edge_cumulative * share
+            if child * 1_000_000 >= COLLAPSED_MIN_US:
+                pending.append((path + (callee,), child))
+    return sorted(totals.items())
+
+def write_memory_report(f, snapshots):
+    previous = None
+    for stage, seconds, current, peak, snapshot in snapshots:
+        f.write(f"=== {stage}: {seconds:.2f}s, current {current / 1024 ** 2:.1f} MiB, peak {peak / 1024 ** 2:.1f} MiB\n")
+        f.write("Top allocation sites (live):\n")
+        for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+            f.write(f"  {stat}\n")
+        if previous is not None:
+            f.write("Growth since previous checkpoint:\n")
+            for stat in snapshot.compare_to(previous, 'lineno')[:TOP_ALLOCATIONS]:
+                f.write(f"  {stat}\n")
+        f.write("\n")
+        previous = snapshot
@@ -0,0 +1,358 @@
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import subprocess
+import time
+from db_connection import get_connection, load_env
+
+# Query plan benchmark for the SQL in controllers/animeController.js and
+# controllers/userController.js.
+#
+# For every scale factor the seed output is loaded into a scratch database
+# (never the real one), the catalog is multiplied in SQL (copies of every anime
+# with offset IDs, plus their tags, watchlist entries and comments), and each
+# application query is run with representative parameters. The report records
+# the median time, EXPLAIN ANALYZE output and plan warnings (full table scans,
+# filesorts, temporary tables).
+#
+# With --try-indexes every CREATE INDEX from add_indexes.sql is applied on its
+# own and the timing delta per query is reported.
+#
+# Requires the `mysql` command line client to load the seed files.
+
+BENCH_DATABASE = 'anime_tracker_bench'
+SCALE_FACTORS = [1, 10, 100]
+REPETITIONS = 5
+REPORT_FILE = 'query_benchmark_report.md'
+INDEX_FILE = os.path.join('..', 'add_indexes.sql')
+
+SEED_FILES = [
+    'insert_studios.sql',
+    'insert_tags.sql',
+    None, # insert_anime_N.sql, resolved at runtime
+    'insert_users.sql',
+    'insert_watchlists.sql',
+    'insert_comments.sql',
+]
+
+CARD_COLUMNS = """
+    a.AnimeID, a.title, a.type, a.episodes, a.status, a.airing_start,
+    a.airing_end, a.rating, a.synopsis, a.image_url,
+    s.studio_name, s.rating AS studio_rating
+"""
+
+# name -> (sql, params). Mirrors the queries in the controllers.
+QUERIES = {
+    'focus_anime': (f"""
+        SELECT {CARD_COLUMNS}, GROUP_CONCAT(DISTINCT t.tag ORDER BY t.tag SEPARATOR ', ') AS genres
+        FROM Anime a
+        JOIN Studio s ON a.StudioID = s.StudioID
+        LEFT JOIN Anime_Tags at ON a.AnimeID = at.AnimeID
+        LEFT JOIN Tags t ON at.TagID = t.TagID
+        WHERE a.AnimeID = %s
+    """, (1,)),
+    'search_title': (f"""
+        SELECT {CARD_COLUMNS}, GROUP_CONCAT(DISTINCT t2.tag ORDER BY t2.tag SEPARATOR ', ') AS genres
+        FROM Anime a
+        JOIN Studio s ON a.StudioID = s.StudioID
+        JOIN Anime_Tags at2 ON a.AnimeID = at2.AnimeID
+        JOIN Tags t2 ON at2.TagID = t2.TagID
+        WHERE a.title LIKE %s
+        GROUP BY a.AnimeID
+        ORDER BY a.title ASC
+        LIMIT 51 OFFSET 0
+    """, ('%one%',)),
+    'search_tags_studio': (f"""
+        SELECT {CARD_COLUMNS}, GROUP_CONCAT(DISTINCT t2.tag ORDER BY t2.tag SEPARATOR ', ') AS genres
+        FROM Anime a
+        JOIN Studio s ON a.StudioID = s.StudioID
+        JOIN (
+            SELECT at.AnimeID
+            FROM Anime_Tags at
+            JOIN Tags t ON at.TagID = t.TagID
+            WHERE t.tag IN (%s, %s)
+            GROUP BY at.AnimeID
+            HAVING COUNT(DISTINCT t.tag) = %s
+        ) filtered_anime ON a.AnimeID = filtered_anime.AnimeID
+        JOIN Anime_Tags at2 ON a.AnimeID = at2.AnimeID
+        JOIN Tags t2 ON at2.TagID = t2.TagID
+        WHERE a.title LIKE %s AND s.studio_name = %s AND a.rating = %s
+        GROUP BY a.AnimeID
+        ORDER BY a.title ASC
+        LIMIT 51 OFFSET 0
+    """, ('Action', 'Fantasy', 2, '%%', 'MAPPA', '8')),
+    'search_count': ("""
+        SELECT COUNT(DISTINCT a.AnimeID) as count
+        FROM Anime a
+        JOIN Studio s ON a.StudioID = s.StudioID
+        WHERE a.title LIKE %s
+    """, ('%one%',)),
+    'spotlight': (f"""
+        SELECT {CARD_COLUMNS}, GROUP_CONCAT(t.tag ORDER BY t.tag SEPARATOR ', ') AS genres
+        FROM Anime a
+        JOIN Studio s ON a.StudioID = s.StudioID
+        JOIN Anime_Tags at ON a.AnimeID = at.AnimeID
+        JOIN Tags t ON at.TagID = t.TagID
+        WHERE a.rating >= 10
+        GROUP BY a.AnimeID
+        ORDER BY a.title ASC
+        LIMIT 10
+    """, ()),
+    'new_animes': (f"""
+        SELECT {CARD_COLUMNS}, GROUP_CONCAT(t.tag ORDER BY t.tag SEPARATOR ', ') AS genres
+        FROM Anime a
+        JOIN Studio s ON a.StudioID = s.StudioID
+        JOIN Anime_Tags at ON a.AnimeID = at.AnimeID
+        JOIN Tags t ON at.TagID = t.TagID
+        WHERE a.status = 'Airing'
+        GROUP BY a.AnimeID
+        ORDER BY a.airing_start DESC
+    """, ()),
+    'recommended': (f"""
+        SELECT {CARD_COLUMNS}, GROUP_CONCAT(t.tag ORDER BY t.tag SEPARATOR ', ') AS genres
+        FROM Anime a
+        JOIN Studio s ON a.StudioID = s.StudioID
+        JOIN Anime_Tags at ON a.AnimeID = at.AnimeID
+        JOIN Tags t ON at.TagID = t.TagID
+        WHERE a.rating IN ('8','9')
+        GROUP BY a.AnimeID
+        ORDER BY a.rating DESC
+        LIMIT 15
+    """, ()),
+    'random_order_by_rand': (f"""
+        SELECT {CARD_COLUMNS}, GROUP_CONCAT(t.tag ORDER BY t.tag SEPARATOR ', ') AS genres
+        FROM Anime a
+        JOIN Studio s ON a.StudioID = s.StudioID
+        JOIN Anime_Tags at ON a.AnimeID = at.AnimeID
+        JOIN Tags t ON at.TagID = t.TagID
+        GROUP BY a.AnimeID
+        ORDER BY RAND()
+        LIMIT 5
+    """, ()),
+    'most_watchlisted': (f"""
+        SELECT {CARD_COLUMNS}, GROUP_CONCAT(t.tag ORDER BY t.tag SEPARATOR ', ') AS genres,
+            COUNT(w.WatchlistID) AS watchlist_count
+        FROM Anime a
+        JOIN Studio s ON a.StudioID = s.StudioID
+        JOIN Watchlist w ON a.AnimeID = w.AnimeID
+        JOIN Anime_Tags at ON a.AnimeID = at.AnimeID
+        JOIN Tags t ON at.TagID = t.TagID
+        GROUP BY a.AnimeID
+        ORDER BY watchlist_count DESC
+        LIMIT 30
+    """, ()),
+    'user_top_tags': ("""
+        SELECT t.tag, COUNT(*) AS tag_count
+        FROM watchlist w
+        JOIN anime_tags at ON w.AnimeID = at.AnimeID
+        JOIN tags t ON at.TagID = t.TagID
+        WHERE w.UserID = %s
+        GROUP BY t.tag
+        ORDER BY tag_count DESC
+    """, (2,)),
+    'user_watchlist': (f"""
+        SELECT u.UserID, u.username, {CARD_COLUMNS},
+            GROUP_CONCAT(t.tag ORDER BY t.tag SEPARATOR ', ') AS genres,
+            w.status AS watchlist_status, w.date_added, w.last_updated
+        FROM watchlist w
+        LEFT JOIN user u ON w.UserID = u.UserID
+        LEFT JOIN anime a ON w.AnimeID = a.AnimeID
+        LEFT JOIN studio s ON a.StudioID = s.StudioID
+        LEFT JOIN anime_tags at ON a.AnimeID = at.AnimeID
+        LEFT JOIN tags t ON at.TagID = t.TagID
+        WHERE u.UserID = %s AND (w.status = 'Plan to Watch' OR w.status = 'Watching')
+        GROUP BY a.AnimeID, w.status, w.last_updated, w.date_added
+        ORDER BY w.last_updated DESC
+    """, (2,)),
+    'comments_by_anime': ("""
+        SELECT c.CommentID, c.comment_text, c.created_at, u.display_name, u.UserID, u.role
+        FROM comments c
+        JOIN user u ON c.UserID = u.UserID
+        WHERE c.AnimeID = %s
+        ORDER BY c.created_at ASC
+    """, (1,)),
+}
+
+def run_mysql_file(path, database, mysql_bin):
+    load_env()
+    cmd = [mysql_bin, f"--host={os.environ.get('HOST', 'localhost')}", f"--user={os.environ.get('USER')}"]
+    if database:
+        cmd.append(database)
+    env = dict(os.environ, MYSQL_PWD=os.environ.get('PASSWORD', ''))
+    with open(path, 'rb') as f:
+        subprocess.run(cmd, stdin=f, env=env, check=True)
+
+def create_bench_schema(mysql_bin):
+    with open('database_creation.sql', 'r', encoding='utf-8') as f:
+        ddl = f.read().replace('`anime_tracker`', f'`{BENCH_DATABASE}`')
+    tmp_path = 'database_creation.bench.sql'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(ddl)
+    try:
+        run_mysql_file(tmp_path, None, mysql_bin)
+    finally:
+        os.remove(tmp_path)
+
+def load_seed(anime_sql, mysql_bin):
+    print(f"📥 Loading seed data into {BENCH_DATABASE}...")
+    create_bench_schema(mysql_bin)
+    for name in SEED_FILES:
+        run_mysql_file(name or anime_sql, BENCH_DATABASE, mysql_bin)
+
+def amplify(conn, factor):
+    """Multiplies the catalog in place: copy k gets AnimeID + k * max_id."""
+    if factor <= 1:
+        return
+    print(f"📈 Amplifying catalog x{factor}...")
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT MAX(AnimeID) FROM anime")
+        max_id = cursor.fetchone()[0]
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for k in range(1, factor):
+            offset = k * max_id
+            cursor.execute(f"""
+                INSERT INTO anime (AnimeID, title, type, episodes, status, airing_start, airing_end, rating, synopsis, StudioID, image_url)
+                SELECT AnimeID + {offset}, CONCAT(title, ' #{k}'), type, episodes, status, airing_start, airing_end, rating, synopsis, StudioID, image_url
+                FROM anime WHERE AnimeID <= {max_id}
+            """)
+            cursor.execute(f"INSERT INTO anime_tags (AnimeID, TagID) SELECT AnimeID + {offset}, TagID FROM anime_tags WHERE AnimeID <= {max_id}")
+            cursor.execute(f"INSERT INTO watchlist (UserID, AnimeID, status) SELECT UserID, AnimeID + {offset}, status FROM watchlist WHERE AnimeID <= {max_id}")
+            cursor.execute(f"INSERT INTO comments (AnimeID, UserID, comment_text) SELECT AnimeID + {offset}, UserID, comment_text FROM comments WHERE AnimeID <= {max_id}")
+            conn.commit()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.execute("ANALYZE TABLE anime, anime_tags, watchlist, comments")
+        cursor.fetchall()
+
+def plan_warnings(plan):
+    """Walks EXPLAIN FORMAT=JSON output and collects full scans, filesorts and temporary tables."""
+    warnings = set()
+
+    def walk(node):
+        if isinstance(node, dict):
+            if node.get('access_type') == 'ALL':
+                warnings.add(f"full scan on {node.get('table_name', '?')}")
+            if node.get('using_filesort'):
+                warnings.add('filesort')
+            if node.get('using_temporary_table'):
+                warnings.add('temporary table')
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(plan)
+    return sorted(warnings)
+
+def benchmark_query(conn, sql, params, repetitions):
+    timings = []
+    with conn.cursor() as cursor:
+        for _ in range(repetitions):
+            start = time.perf_counter()
+            cursor.execute(sql, params)
+            cursor.fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def explain(conn, sql, params):
+    with conn.cursor() as cursor:
+        cursor.execute("EXPLAIN FORMAT=JSON " + sql, params)
+        plan = json.loads(cursor.fetchone()[0])
+        cursor.execute("EXPLAIN ANALYZE " + sql, params)
+        analyze = cursor.fetchone()[0]
+    return plan_warnings(plan), analyze
+
+def run_queries(conn, repetitions):
+    results = {}
+    for name, (sql, params) in QUERIES.items():
+        median_ms = benchmark_query(conn, sql, params, repetitions)
+        warnings, analyze = explain(conn, sql, params)
+        results[name] = {'median_ms': median_ms, 'warnings': warnings, 'analyze': analyze}
+        flag = f"  ⚠️ {', '.join(warnings)}" if warnings else ''
+        print(f"   {name:<24}{median_ms:>10.1f} ms{flag}")
+    return results
+
+def load_candidate_indexes(path=INDEX_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return re.findall(r"^(CREATE (?:UNIQUE )?INDEX (\w+) ON (\w+)\s*\([^)]*\));", content, flags=re.MULTILINE | re.IGNORECASE)
+
+def try_indexes(conn, baseline, repetitions):
+    deltas = {}
+    for statement, index_name, table in load_candidate_indexes():
+        print(f"🧪 Trying {index_name}...")
+        with conn.cursor() as cursor:
+            try:
+                cursor.execute(statement)
+            except Exception as e:
+                print(f"   ⚠️ Skipped: {e}")
+                continue
+            try:
+                deltas[index_name] = {
+                    name: benchmark_query(conn, sql, params, repetitions) - baseline[name]['median_ms']
+                    for name, (sql, params) in QUERIES.items()
+                }
+            finally:
+                cursor.execute(f"DROP INDEX {index_name} ON {table}")
+    return deltas
+
+def write_report(all_results, index_deltas, path=REPORT_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# Query Benchmark Report\n\n")
+        factors = list(all_results)
+        f.write("| Query | " + " | ".join(f"x{sf} (ms)" for sf in factors) + " | Plan warnings (largest scale) |\n")
+        f.write("|---|" + "---|" * len(factors) + "---|\n")
+        for name in QUERIES:
+            times = " | ".join(f"{all_results[sf][name]['median_ms']:.1f}" for sf in factors)
+            warnings = ', '.join(all_results[factors[-1]][name]['warnings']) or '-'
+            f.write(f"| {name} | {times} | {warnings} |\n")
+
+        if index_deltas:
+            f.write(f"\n## Candidate indexes (delta vs. no index at x{factors[-1]}, ms)\n\n")
+            f.write("| Index | " + " | ".join(QUERIES) + " |\n")
+            f.write("|---|" + "---|" * len(QUERIES) + "\n")
+            for index_name, deltas in index_deltas.items():
+                f.write(f"| {index_name} | " + " | ".join(f"{deltas[q]:+.1f}" for q in QUERIES) + " |\n")
+
+        for sf in factors:
+            f.write(f"\n## EXPLAIN ANALYZE at x{sf}\n")
+            for name in QUERIES:
+                f.write(f"\n### {name}\n\n```\n{all_results[sf][name]['analyze']}\n```\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark application queries across data scale factors.")
+    parser.add_argument('--scale', type=int, action='append', help="Scale factor, repeatable (default: 1, 10, 100)")
+    parser.add_argument('--anime-sql', help="insert_anime_N.sql to load (default: newest in this folder)")
+    parser.add_argument('--repetitions', type=int, default=REPETITIONS)
+    parser.add_argument('--try-indexes', action='store_true', help="Measure each CREATE INDEX from add_indexes.sql")
+    parser.add_argument('--mysql-bin', default='mysql')
+    args = parser.parse_args()
+
+    anime_sql = args.anime_sql or max(glob.glob('insert_anime_*.sql'), key=os.path.getmtime, default=None)
+    if not anime_sql:
+        print("❌ No insert_anime_*.sql found. Run autoinsert3.py first or pass --anime-sql.")
+        return
+
+    all_results = {}
+    index_deltas = {}
+    factors = sorted(args.scale or SCALE_FACTORS)
+    for sf in factors:
+        load_seed(anime_sql, args.mysql_bin)
+        conn = get_connection(database=BENCH_DATABASE)
+        try:
+            amplify(conn, sf)
+            print(f"⏱️ Running queries at x{sf}...")
+            all_results[sf] = run_queries(conn, args.repetitions)
+            if args.try_indexes and sf == factors[-1]:
+                index_deltas = try_indexes(conn, all_results[sf], args.repetitions)
+        finally:
+            conn.close()
+
+    write_report(all_results, index_deltas)
+    print(f"✅ Report written to {REPORT_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import time
+import numpy as np
+import tqdm
+from db_connection import get_connection
+
+# Maintains the `anime_random_rank` table used by getRandomAnimes.
+# Every anime gets a position in a shuffled permutation, so "5 random animes"
+# becomes an indexed range read (random_rank >= ? LIMIT 5) instead of
+# ORDER BY RAND() over the whole joined catalog.
+#
+# Modes:
+#   full   - rebuilds the whole permutation from scratch.
+#   rotate - reshuffles only a slice of the ranks (ROTATE_FRACTION of the rows)
+#            and appends anime that were added since the last run.
+
+ROTATE_FRACTION = 0.1
+BATCH_SIZE = 5000
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS `anime_random_rank` (
+  `AnimeID` int NOT NULL,
+  `random_rank` int NOT NULL,
+  PRIMARY KEY (`AnimeID`),
+  KEY `idx_random_rank` (`random_rank`),
+  CONSTRAINT `anime_random_rank_ibfk_1`
+        FOREIGN KEY (`AnimeID`) REFERENCES `anime` (`AnimeID`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+"""
+
+UPSERT_SQL = """
+INSERT INTO anime_random_rank (AnimeID, random_rank) VALUES (%s, %s)
+ON DUPLICATE KEY UPDATE random_rank = VALUES(random_rank)
+"""
+
+def write_ranks(cursor, anime_ids, ranks, desc):
+    rows = list(zip(anime_ids.tolist(), ranks.tolist()))
+    for i in tqdm.tqdm(range(0, len(rows), BATCH_SIZE), desc=desc, unit="batch"):
+        cursor.executemany(UPSERT_SQL, rows[i:i + BATCH_SIZE])
+
+def full_shuffle(cursor, rng):
+    cursor.execute("SELECT AnimeID FROM anime ORDER BY AnimeID")
+    anime_ids = np.fromiter((row[0] for row in cursor.fetchall()), dtype=np.int64)
+    ranks = rng.permutation(len(anime_ids))
+
+    cursor.execute("DELETE FROM anime_random_rank")
+    write_ranks(cursor, anime_ids, ranks, "🔀 Writing permutation")
+    return len(anime_ids)
+
+def rotate_slice(cursor, rng, fraction):
+    cursor.execute("SELECT AnimeID, random_rank FROM anime_random_rank")
+    existing = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 2)
+
+    # Reshuffle a random subset of rows among their own ranks. The set of
+    # ranks in use does not change, so the table stays a valid permutation.
+    touched = 0
+    if len(existing):
+        slice_size = max(1, int(len(existing) * fraction))
+        picked = rng.choice(len(existing), size=slice_size, replace=False)
+        anime_ids = existing[picked, 0]
+        ranks = rng.permutation(existing[picked, 1])
+        write_ranks(cursor, anime_ids, ranks, "🔄 Rotating slice")
+        touched += slice_size
+
+    # New anime are appended after the current maximum rank, in random order.
+    cursor.execute("""
+        SELECT a.AnimeID FROM anime a
+        LEFT JOIN anime_random_rank r ON a.AnimeID = r.AnimeID
+        WHERE r.AnimeID IS NULL
+    """)
+    new_ids = np.fromiter((row[0] for row in cursor.fetchall()), dtype=np.int64)
+    if len(new_ids):
+        start = int(existing[:, 1].max()) + 1 if len(existing) else 0
+        ranks = start + rng.permutation(len(new_ids))
+        write_ranks(cursor, new_ids, ranks, "➕ Appending new anime")
+        touched += len(new_ids)
+
+    return touched
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or rotate the anime_random_rank permutation.")
+    parser.add_argument('--mode', choices=['full', 'rotate'], default='rotate')
+    parser.add_argument('--seed', type=int, default=None,
+                        help="RNG seed (defaults to the current time, printed for reproducibility)")
+    parser.add_argument('--fraction', type=float, default=ROTATE_FRACTION,
+                        help="Share of rows reshuffled in rotate mode")
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else int(time.time())
+    rng = np.random.default_rng(seed)
+    print(f"🎲 Random pool job ({args.mode} mode, seed={seed})")
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(CREATE_TABLE_SQL)
+
+            cursor.execute("SELECT COUNT(*) FROM anime_random_rank")
+            if args.mode == 'full' or cursor.fetchone()[0] == 0:
+                touched = full_shuffle(cursor, rng)
+            else:
+                touched = rotate_slice(cursor, rng, args.fraction)
+        conn.commit()
+    finally:
+        conn.close()
+
+    print(f"✅ Updated {touched} ranks.")
+
+if __name__ == "__main__":
+    main()
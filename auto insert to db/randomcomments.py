@@ -1,5 +1,9 @@
+import argparse
 import random
 import tqdm
+from collections import Counter
+from profiling import Profiler, add_profile_argument
+from id_registry import seeded_anime_ids
 
 def generate_unique_comments(num_comments=500):
     """
@@ -63,41 +67,74 @@ def generate_unique_comments(num_comments=500):
 
 # Define constants for user IDs and the range of anime IDs
 USER_IDS = range(1, 11) # Total Users + 1
-ANIME_IDS = range(1, 15193) # Total Animes + 1
+LEGACY_ANIME_IDS = range(1, 15193) # Dense AnimeIDs of databases seeded before id_registry.py
+ANIME_IDS = seeded_anime_ids() or LEGACY_ANIME_IDS # Registry IDs can have gaps and go past 15192
 
-def generate_comment_inserts(unique_comments):
+def generate_comment_inserts(unique_comments, anime_ids=ANIME_IDS, user_ids=USER_IDS):
     """
     Generates SQL INSERT statements for comments, assigning 1-5 random comments
-    to every anime in the ANIME_IDS range.
+    to every anime in ANIME_IDS (or `anime_ids`). Also returns the per-anime comment
+    counts so anime_counters can be seeded without a COUNT(*) pass.
     """
     values = []
+    comment_counts = Counter()
     
-    # NOTE: This will generate comments for ALL animes in the ANIME_IDS range,
+    # NOTE: This will generate comments for ALL animes in ANIME_IDS,
     # which will create a very large SQL file (15k to 75k entries).
-    for anime_id in tqdm.tqdm(ANIME_IDS, desc="✍️ Generating Comments for Animes", unit="anime"):
+    for anime_id in tqdm.tqdm(anime_ids, desc="✍️ Generating Comments for Animes", unit="anime"):
         num_comments_for_anime = random.randint(1, 5)
+        comment_counts[anime_id] = num_comments_for_anime
         
         for _ in range(num_comments_for_anime):
-            user_id = random.choice(USER_IDS)
+            user_id = random.choice(user_ids)
             comment_text = random.choice(unique_comments).replace("'", "''") 
             values.append(f"({anime_id}, {user_id}, '{comment_text}')")
 
     if not values:
-        return ""
+        return "", comment_counts
 
     sql_statement = f"INSERT INTO comments (AnimeID, UserID, comment_text) VALUES\n" + ",\n".join(values) + ";"
-    return sql_statement
+    return sql_statement, comment_counts
+
+def generate_counter_upsert(comment_counts):
+    """
+    Generates an upsert for the comment_count column of anime_counters.
+    """
+    if not comment_counts:
+        return ""
+
+    values = [f"({anime_id}, {count})" for anime_id, count in sorted(comment_counts.items())]
+    return (
+        "INSERT INTO anime_counters (AnimeID, comment_count) VALUES\n"
+        + ",\n".join(values)
+        + "\nON DUPLICATE KEY UPDATE comment_count = VALUES(comment_count);"
+    )
 
 if __name__ == "__main__":
-    output_file = "insert_comments.sql"
+    parser = argparse.ArgumentParser(description="Generate random comments for every anime.")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with Profiler(args.profile, "randomcomments") as profiler:
+        output_file = "insert_comments.sql"
+        counters_file = "insert_comment_counters.sql"
     
-    print("✍️ Generating 500 unique comments...")
-    unique_comments = generate_unique_comments(500)
+        print("✍️ Generating 500 unique comments...")
+        unique_comments = generate_unique_comments(500)
+        profiler.checkpoint("unique_comments")
     
-    print(f"💾 Generating SQL insert statements for all {len(list(ANIME_IDS))} animes...")
-    sql_inserts = generate_comment_inserts(unique_comments)
+        if ANIME_IDS is LEGACY_ANIME_IDS:
+            print("⚠️ No catalog/ or id_registry.sqlite3 found, assuming AnimeIDs 1-15192.")
+        print(f"💾 Generating SQL insert statements for all {len(ANIME_IDS)} animes...")
+        sql_inserts, comment_counts = generate_comment_inserts(unique_comments)
+        profiler.checkpoint("comment_inserts")
     
-    with open(output_file, 'w', encoding='utf-8') as file:
-        file.write(sql_inserts)
+        with open(output_file, 'w', encoding='utf-8') as file:
+            file.write(sql_inserts)
+
+        with open(counters_file, 'w', encoding='utf-8') as file:
+            file.write(generate_counter_upsert(comment_counts))
+        profiler.checkpoint("write_sql")
 
-    print(f"✅ SQL statements for random comments have been written to {output_file}")
+        print(f"✅ SQL statements for random comments have been written to {output_file}")
+        print(f"✅ Comment counters have been written to {counters_file}")
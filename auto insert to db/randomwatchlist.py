@@ -1,40 +1,86 @@
+import argparse
 import random
+from collections import defaultdict
+from profiling import Profiler, add_profile_argument
+from id_registry import seeded_anime_ids
 
 # Import the random module for generating random numbers and choices.
 
 # Define constants for user IDs, anime IDs, watchlist statuses, and maximum entries per user.
 USER_IDS = range(1, 11)  # Total Users + 1
-ANIME_IDS = range(1, 15193)  # Total Animes + 1
+LEGACY_ANIME_IDS = range(1, 15193)  # Dense AnimeIDs of databases seeded before id_registry.py
+ANIME_IDS = seeded_anime_ids() or LEGACY_ANIME_IDS  # Registry IDs can have gaps and go past 15192
 STATUS_OPTIONS = ['Completed', 'Watching', 'Plan to Watch']  # Status options
 MAX_WATCHLIST_PER_USER = 500  # Max watchlist entries per user
 
 # Generates a single SQL INSERT statement for populating the 'watchlist' table with random data.
-def generate_watchlist_insert():
+# Also returns the per-anime counters (total and per status) tallied while generating the rows.
+def generate_watchlist_insert(user_ids=USER_IDS, anime_ids=ANIME_IDS, max_per_user=MAX_WATCHLIST_PER_USER):
     # List to store all value sets for the single INSERT statement
     values = []
+    # AnimeID -> {status: count}
+    counters = defaultdict(lambda: defaultdict(int))
 
     # Generate watchlist for each user
-    for user_id in USER_IDS:
+    for user_id in user_ids:
         # Randomly determine how many anime to add (up to 100 per user)
-        num_entries = random.randint(1, MAX_WATCHLIST_PER_USER)
-        anime_ids = random.sample(ANIME_IDS, num_entries)  # Randomly select anime IDs
+        num_entries = random.randint(1, min(max_per_user, len(anime_ids)))
+        picked_ids = random.sample(anime_ids, num_entries)  # Randomly select anime IDs
         statuses = random.choices(STATUS_OPTIONS, k=num_entries)  # Random statuses for each anime
 
         # Add each value set to the values list
-        for anime_id, status in zip(anime_ids, statuses):
+        for anime_id, status in zip(picked_ids, statuses):
             values.append(f"({user_id}, {anime_id}, '{status}')")
+            counters[anime_id][status] += 1
 
     # Create the final SQL statement with all values
     sql_statement = f"INSERT INTO watchlist (UserID, AnimeID, status) VALUES\n" + ",\n".join(values) + ";"
 
-    return sql_statement
+    return sql_statement, counters
 
-# Define the output file path for the SQL insert statement.
-output_file = "insert_watchlists.sql"
+# Generates an upsert for the watchlist columns of 'anime_counters' from the tallied counts.
+def generate_counter_upsert(counters):
+    values = []
+    for anime_id in sorted(counters):
+        by_status = counters[anime_id]
+        total = sum(by_status.values())
+        values.append(
+            f"({anime_id}, {total}, {by_status['Completed']}, {by_status['Watching']}, {by_status['Plan to Watch']})"
+        )
+
+    if not values:
+        return ""
+
+    return (
+        "INSERT INTO anime_counters (AnimeID, watchlist_count, completed_count, watching_count, plan_to_watch_count) VALUES\n"
+        + ",\n".join(values)
+        + "\nON DUPLICATE KEY UPDATE watchlist_count = VALUES(watchlist_count), completed_count = VALUES(completed_count),"
+        + " watching_count = VALUES(watching_count), plan_to_watch_count = VALUES(plan_to_watch_count);"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate random watchlists for the seeded users.")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with Profiler(args.profile, "randomwatchlist") as profiler:
+        # Define the output file paths for the SQL insert statement and the counters.
+        output_file = "insert_watchlists.sql"
+        counters_file = "insert_watchlist_counters.sql"
+
+        if ANIME_IDS is LEGACY_ANIME_IDS:
+            print("⚠️ No catalog/ or id_registry.sqlite3 found, assuming AnimeIDs 1-15192.")
+        watchlist_sql, watchlist_counters = generate_watchlist_insert()
+        profiler.checkpoint("watchlist_inserts")
+
+        # Open the output file in write mode and write the generated SQL statement to it.
+        with open(output_file, 'w') as file:
+            file.write(watchlist_sql)
 
-# Open the output file in write mode and write the generated SQL statement to it.
-with open(output_file, 'w') as file:
-    file.write(generate_watchlist_insert())
+        with open(counters_file, 'w') as file:
+            file.write(generate_counter_upsert(watchlist_counters))
+        profiler.checkpoint("write_sql")
 
-# Print a confirmation message indicating where the SQL statement was written.
-print(f"SQL statement has been written to {output_file}")
+        # Print a confirmation message indicating where the SQL statements were written.
+        print(f"SQL statement has been written to {output_file}")
+        print(f"Counter upsert has been written to {counters_file}")
@@ -0,0 +1,96 @@
+import argparse
+from collections import defaultdict
+import tqdm
+from db_connection import get_connection
+
+# Recomputes the anime_counters table from the live watchlist and comments
+# tables and writes back only the rows whose counters drifted.
+#
+# Each source table is read exactly once through an unbuffered cursor, so
+# memory is proportional to the number of anime, not the number of rows.
+
+COUNTER_COLUMNS = ['watchlist_count', 'completed_count', 'watching_count', 'plan_to_watch_count', 'comment_count']
+STATUS_COLUMNS = {
+    'Completed': 'completed_count',
+    'Watching': 'watching_count',
+    'Plan to Watch': 'plan_to_watch_count',
+}
+BATCH_SIZE = 5000
+
+UPSERT_SQL = f"""
+INSERT INTO anime_counters (AnimeID, {', '.join(COUNTER_COLUMNS)})
+VALUES (%s, {', '.join(['%s'] * len(COUNTER_COLUMNS))})
+ON DUPLICATE KEY UPDATE {', '.join(f'{c} = VALUES({c})' for c in COUNTER_COLUMNS)}
+"""
+
+def stream_rows(conn, query, desc):
+    with conn.cursor() as cursor:
+        cursor.execute(query)
+        for row in tqdm.tqdm(cursor, desc=desc, unit="row"):
+            yield row
+
+def compute_counters(conn):
+    """
+    Single streaming pass over watchlist and comments.
+    Returns {AnimeID: [watchlist, completed, watching, plan_to_watch, comments]}.
+    """
+    counters = defaultdict(lambda: [0] * len(COUNTER_COLUMNS))
+    status_index = {status: COUNTER_COLUMNS.index(col) for status, col in STATUS_COLUMNS.items()}
+
+    for anime_id, status in stream_rows(conn, "SELECT AnimeID, status FROM watchlist", "📋 Scanning watchlist"):
+        row = counters[anime_id]
+        row[0] += 1
+        if status in status_index:
+            row[status_index[status]] += 1
+
+    comment_index = COUNTER_COLUMNS.index('comment_count')
+    for (anime_id,) in stream_rows(conn, "SELECT AnimeID FROM comments", "💬 Scanning comments"):
+        counters[anime_id][comment_index] += 1
+
+    return counters
+
+def load_stored_counters(conn):
+    stored = {}
+    query = f"SELECT AnimeID, {', '.join(COUNTER_COLUMNS)} FROM anime_counters"
+    for row in stream_rows(conn, query, "📦 Loading stored counters"):
+        stored[row[0]] = list(row[1:])
+    return stored
+
+def diff_counters(live, stored):
+    """
+    Returns the rows that need to be written. Anime that lost all their
+    watchlist entries/comments are reset to zero instead of being left stale.
+    """
+    zero = [0] * len(COUNTER_COLUMNS)
+    changes = []
+    for anime_id in live.keys() | stored.keys():
+        current = live.get(anime_id, zero)
+        if stored.get(anime_id, zero) != current:
+            changes.append((anime_id, *current))
+    return sorted(changes)
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile anime_counters with the live watchlist/comments tables.")
+    parser.add_argument('--dry-run', action='store_true', help="Only report how many rows would change")
+    args = parser.parse_args()
+
+    print("🧮 Reconciling anime counters...")
+    conn = get_connection(streaming=True)
+    try:
+        live = compute_counters(conn)
+        stored = load_stored_counters(conn)
+        changes = diff_counters(live, stored)
+        print(f"🔍 {len(changes)} of {len(live.keys() | stored.keys())} anime have drifted counters.")
+
+        if changes and not args.dry_run:
+            with conn.cursor() as cursor:
+                for i in tqdm.tqdm(range(0, len(changes), BATCH_SIZE), desc="💾 Applying changes", unit="batch"):
+                    cursor.executemany(UPSERT_SQL, changes[i:i + BATCH_SIZE])
+            conn.commit()
+    finally:
+        conn.close()
+
+    print("✅ All done!")
+
+if __name__ == "__main__":
+    main()
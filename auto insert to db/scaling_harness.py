@@ -0,0 +1,238 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from autoinsert3 import load_maps, transform_anime, write_anime_inserts, ANIME_COLUMNS, RAW_SNAPSHOT_FILE
+from synth_catalog import CatalogModel, load_snapshot, seed_catalog
+from studiomapcreator2 import parse_studio_sql
+from tagmapcreator import generate_tag_map
+from randomcomments import generate_unique_comments, generate_comment_inserts
+from randomwatchlist import generate_watchlist_insert
+
+# Scaling curve harness for the seeding pipeline.
+#
+# Runs each seeding stage at geometrically growing input sizes, records wall
+# time and peak traced memory per run, and fits the growth exponent k of
+# cost ~ size^k with a log-log least squares fit (k ~ 1 is linear, k ~ 2 is
+# quadratic). The exponents can be saved as a baseline; later runs fail if a
+# stage's exponent grows past the baseline by more than the tolerance.
+#
+# Input records come from synth_catalog.CatalogModel, learned from
+# raw_anime_snapshot.json when present and otherwise from a small seed catalog
+# built from studio_map / tag_map, so the harness runs without a crawl.
+#
+# Usage:
+#   python scaling_harness.py
+#   python scaling_harness.py --start 2000 --factor 4 --steps 4 --save-baseline
+#   python scaling_harness.py --stages transform,emit_sql --fail-on-regression
+
+BASELINE_FILE = 'scaling_baseline.json'
+REPORT_FILE = 'scaling_report.json'
+DEFAULT_START, DEFAULT_FACTOR, DEFAULT_STEPS = 1000, 4, 4
+EXPONENT_TOLERANCE = 0.15 # Allowed growth of the fitted exponent over the baseline
+SUPERLINEAR_WARNING = 1.2 # Exponents above this are reported even without a baseline
+WATCHLIST_ANIME_PER_USER = 50 # Users scale with size so watchlist rows grow linearly
+
+class Stages:
+    """
+    Each stage has setup_<name>(size) building its input (not measured) and
+    run_<name>(data) doing the measured work.
+    """
+
+    def __init__(self, model, studio_map, tag_map, workdir):
+        self.model = model
+        self.studio_map = studio_map
+        self.tag_map = tag_map
+        self.workdir = workdir
+        self.unique_comments = generate_unique_comments(500)
+
+    def raw_records(self, size):
+        rng = random.Random(size)
+        return [self.model.sample(rng, i) for i in range(1, size + 1)]
+
+    def setup_transform(self, size):
+        return self.raw_records(size)
+
+    def run_transform(self, records):
+        seen_titles = set()
+        for anime in records:
+            transform_anime(anime, self.studio_map, self.tag_map, seen_titles)
+
+    def setup_emit_sql(self, size):
+        records = []
+        seen_titles = set()
+        for anime in self.raw_records(size):
+            record, skip_reason = transform_anime(anime, self.studio_map, self.tag_map, seen_titles)
+            if not skip_reason:
+                records.append(record)
+        return records
+
+    def run_emit_sql(self, records):
+        with open(os.path.join(self.workdir, 'insert_anime.sql'), 'w', encoding='utf-8') as f:
+            f.write("START TRANSACTION;\n")
+            write_anime_inserts(f, ANIME_COLUMNS, records)
+            f.write("COMMIT;\n")
+
+    def setup_studio_map(self, size):
+        path = os.path.join(self.workdir, 'insert_studios.sql')
+        values = [f"('Studio ''{i}'' Works', {i % 5 + 1})" for i in range(size)]
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("INSERT INTO Studio (studio_name, rating) VALUES\n" + ",\n".join(values) + ";")
+        return path
+
+    def run_studio_map(self, path):
+        parse_studio_sql(path, os.path.join(self.workdir, 'studio_map.txt'))
+
+    def setup_tag_map(self, size):
+        path = os.path.join(self.workdir, 'insert_tags.sql')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("INSERT INTO Tags (tag)\nVALUES\n" + ",\n".join(f"('Tag {i}')" for i in range(size)) + ";\n")
+        return path
+
+    def run_tag_map(self, path):
+        generate_tag_map(path, os.path.join(self.workdir, 'tag_map.txt'))
+
+    def setup_comments(self, size):
+        return range(1, size + 1)
+
+    def run_comments(self, anime_ids):
+        generate_comment_inserts(self.unique_comments, anime_ids=anime_ids)
+
+    def setup_watchlist(self, size):
+        return range(1, max(1, size // WATCHLIST_ANIME_PER_USER) + 1), range(1, size + 1)
+
+    def run_watchlist(self, data):
+        user_ids, anime_ids = data
+        generate_watchlist_insert(user_ids=user_ids, anime_ids=anime_ids, max_per_user=WATCHLIST_ANIME_PER_USER * 2)
+
+STAGES = ['transform', 'emit_sql', 'studio_map', 'tag_map', 'comments', 'watchlist']
+
+def measure(stages, name, size, repeat):
+    """Returns (best wall seconds, peak traced bytes) for one stage at one size."""
+    setup = getattr(stages, f"setup_{name}")
+    run = getattr(stages, f"run_{name}")
+    data = setup(size)
+    quiet = io.StringIO()
+
+    best = float('inf')
+    for _ in range(repeat):
+        random.seed(size)
+        gc.collect()
+        with contextlib.redirect_stdout(quiet), contextlib.redirect_stderr(quiet):
+            start = time.perf_counter()
+            run(data)
+            best = min(best, time.perf_counter() - start)
+
+    # Memory in a separate pass: tracemalloc slows allocation-heavy code down a lot.
+    random.seed(size)
+    gc.collect()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(quiet), contextlib.redirect_stderr(quiet):
+        run(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def fit_exponent(sizes, values):
+    """Slope of log(value) over log(size)."""
+    values = np.maximum(np.asarray(values, dtype=float), 1e-9)
+    slope, _ = np.polyfit(np.log(sizes), np.log(values), 1)
+    return float(slope)
+
+def load_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how each seeding stage scales with input size.")
+    parser.add_argument('--start', type=int, default=DEFAULT_START, help="Smallest input size")
+    parser.add_argument('--factor', type=int, default=DEFAULT_FACTOR, help="Growth factor between sizes")
+    parser.add_argument('--steps', type=int, default=DEFAULT_STEPS, help="Number of sizes")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing runs per size (best is kept)")
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"Comma-separated subset of: {', '.join(STAGES)}")
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run's exponents as the new baseline")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with status 1 on a regression")
+    args = parser.parse_args()
+
+    selected = [s for s in args.stages.split(',') if s]
+    unknown = [s for s in selected if s not in STAGES]
+    if unknown or args.steps < 2:
+        print(f"❌ Unknown stages: {', '.join(unknown)}" if unknown else "❌ Need at least 2 steps to fit a curve.")
+        sys.exit(1)
+
+    studio_map, tag_map = load_maps()
+    if not studio_map:
+        sys.exit(1)
+
+    if os.path.exists(RAW_SNAPSHOT_FILE):
+        print(f"📂 Learning input shape from {RAW_SNAPSHOT_FILE}...")
+        model = CatalogModel(load_snapshot(RAW_SNAPSHOT_FILE), studio_map)
+    else:
+        print(f"⚠️ {RAW_SNAPSHOT_FILE} not found, using a seed catalog built from the maps.")
+        model = CatalogModel(seed_catalog(studio_map, tag_map, random.Random(0)), studio_map)
+
+    sizes = [args.start * args.factor ** i for i in range(args.steps)]
+    print(f"📏 Sizes: {', '.join(f'{s:,}' for s in sizes)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        stages = Stages(model, studio_map, tag_map, workdir)
+        for name in selected:
+            runs = []
+            for size in sizes:
+                seconds, peak = measure(stages, name, size, args.repeat)
+                runs.append({'size': size, 'seconds': seconds, 'peak_bytes': peak})
+                print(f"  {name:<12}{size:>10,}{seconds * 1000:>12.1f} ms{peak / 1024 ** 2:>10.1f} MiB")
+            results[name] = {
+                'runs': runs,
+                'time_exponent': fit_exponent(sizes, [r['seconds'] for r in runs]),
+                'memory_exponent': fit_exponent(sizes, [r['peak_bytes'] for r in runs]),
+            }
+
+    baseline = load_json(args.baseline) or {}
+    regressions = []
+    print(f"\n{'stage':<12}{'time k':>9}{'base':>8}{'mem k':>9}{'base':>8}")
+    for name, result in results.items():
+        base = baseline.get(name, {})
+        row = f"{name:<12}"
+        for key in ('time_exponent', 'memory_exponent'):
+            value, base_value = result[key], base.get(key)
+            row += f"{value:>9.2f}" + (f"{base_value:>8.2f}" if base_value is not None else f"{'-':>8}")
+            if base_value is not None and value > base_value + EXPONENT_TOLERANCE:
+                regressions.append(f"{name}: {key} {base_value:.2f} -> {value:.2f}")
+            elif base_value is None and value > SUPERLINEAR_WARNING:
+                print(f"⚠️ {name}: {key} is {value:.2f} (superlinear), no baseline to compare against.")
+        print(row)
+
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'sizes': sizes, 'stages': results}, f, indent=2)
+    print(f"\n💾 Report written to {REPORT_FILE}")
+
+    if args.save_baseline:
+        baseline.update({name: {k: r[k] for k in ('time_exponent', 'memory_exponent')} for name, r in results.items()})
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+
+    if regressions:
+        print("\n🚨 Scaling regressions against baseline")
+        for line in regressions:
+            print(f"  {line}")
+        if args.fail_on_regression:
+            sys.exit(1)
+    elif baseline:
+        print("\n✅ No scaling regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
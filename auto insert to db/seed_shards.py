@@ -0,0 +1,154 @@
+import argparse
+import datetime
+import json
+import os
+import shutil
+import sys
+from collections import Counter
+import tqdm
+from seed_validator import parse_schema, resolve_files, statements, Var, DEFAULT_FILES, SCHEMA_FILE
+
+# Turns the generated seed SQL into primary-key-ordered shards for shard_loader.py.
+#
+# The generators keep writing their usual files; this step streams them in
+# load order through seed_validator's parser, gives every row the id MySQL
+# would assign (AUTO_INCREMENT, @anime_id_N variables), merges the
+# anime_counters upserts into one row per anime, and writes each table sorted
+# by primary key into shards of ROWS_PER_SHARD rows:
+#
+#   shards/manifest.json
+#   shards/anime/anime_0001.sql, anime_0002.sql, ...
+#
+# Every shard line is one multi-row INSERT with explicit ids, so shards of the
+# same table can be loaded concurrently and in any order.
+#
+# Usage:
+#   python seed_shards.py
+#   python seed_shards.py insert_studios.sql insert_tags.sql insert_users.sql insert_anime_15192.sql --rows-per-shard 20000
+
+SHARD_DIR = 'shards'
+MANIFEST_FILE = 'manifest.json'
+ROWS_PER_SHARD = 50000
+ROWS_PER_STATEMENT = 1000
+ESCAPES = str.maketrans({'\\': '\\\\', "'": "\\'", '\n': '\\n', '\r': '\\r', '\0': '\\0', '\x1a': '\\Z'})
+
+def sql_literal(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, str):
+        # Newlines are escaped too, so every statement stays on one line.
+        return "'" + value.translate(ESCAPES) + "'"
+    return str(value)
+
+def collect_rows(files, schema):
+    """Returns {table: {'columns': set, 'rows': {pk tuple: {column: value}}}} in the ids MySQL would assign."""
+    tables = {}
+    auto_ids = Counter()
+    variables = {}
+    last_insert_id = None
+
+    for path in files:
+        for event in tqdm.tqdm(statements(path), desc=f"📖 {os.path.basename(path)}", unit="stmt", leave=False):
+            if event[0] == 'set':
+                _, variable, expression = event
+                if expression == 'LAST_INSERT_ID()':
+                    variables[variable] = last_insert_id
+                continue
+
+            _, table_name, columns, rows, upsert = event
+            table = schema[table_name]
+            auto = table.auto_column
+            entry = tables.setdefault(table_name, {'columns': set(), 'rows': {}})
+            entry['columns'].update(columns)
+            if auto:
+                entry['columns'].add(auto)
+
+            for _, values in rows:
+                row = dict(zip(columns, (variables.get(v) if isinstance(v, Var) else v for v in values)))
+                if auto and not upsert:
+                    if row.get(auto) is None:
+                        auto_ids[table_name] += 1
+                        row[auto] = auto_ids[table_name]
+                    else:
+                        auto_ids[table_name] = max(auto_ids[table_name], row[auto])
+                    last_insert_id = row[auto]
+
+                pk = tuple(row[c] for c in table.primary_key)
+                if upsert and pk in entry['rows']:
+                    entry['rows'][pk].update(row)
+                else:
+                    entry['rows'][pk] = row
+    return tables
+
+def write_shards(tables, schema, out_dir, rows_per_shard):
+    manifest_tables = []
+    # Schema order is also a valid foreign key order.
+    for table_name, table in schema.items():
+        entry = tables.get(table_name)
+        if not entry:
+            continue
+        columns = [c for c in table.columns if c in entry['columns']]
+        column_list = ', '.join(f"`{c}`" for c in columns)
+        keys = sorted(entry['rows'])
+        table_dir = os.path.join(out_dir, table_name)
+        os.makedirs(table_dir, exist_ok=True)
+
+        shards = []
+        for number, start in enumerate(range(0, len(keys), rows_per_shard), start=1):
+            shard_keys = keys[start:start + rows_per_shard]
+            file_name = os.path.join(table_name, f"{table_name}_{number:04d}.sql")
+            with open(os.path.join(out_dir, file_name), 'w', encoding='utf-8') as f:
+                for i in range(0, len(shard_keys), ROWS_PER_STATEMENT):
+                    tuples = []
+                    for key in shard_keys[i:i + ROWS_PER_STATEMENT]:
+                        row = entry['rows'][key]
+                        # Columns a row never got (e.g. comment_count on a watchlist-only counter row) use the column default.
+                        tuples.append('(' + ', '.join(sql_literal(row[c]) if c in row else 'DEFAULT' for c in columns) + ')')
+                    f.write(f"INSERT INTO `{table_name}` ({column_list}) VALUES {', '.join(tuples)};\n")
+            shards.append({'file': file_name, 'rows': len(shard_keys), 'first_pk': list(shard_keys[0]), 'last_pk': list(shard_keys[-1])})
+
+        manifest_tables.append({
+            'table': table_name,
+            'columns': columns,
+            'primary_key': table.primary_key,
+            'rows': len(keys),
+            'shards': shards,
+        })
+        print(f"  {table_name:<18}{len(keys):>10,} rows in {len(shards)} shard(s)")
+    return manifest_tables
+
+def main():
+    parser = argparse.ArgumentParser(description="Split the generated seed SQL into primary-key-ordered shards.")
+    parser.add_argument('files', nargs='*', help="SQL files in load order (default: the usual seed files)")
+    parser.add_argument('--schema', default=SCHEMA_FILE)
+    parser.add_argument('--out', default=SHARD_DIR)
+    parser.add_argument('--rows-per-shard', type=int, default=ROWS_PER_SHARD)
+    args = parser.parse_args()
+
+    files = args.files or resolve_files(DEFAULT_FILES)
+    if not files:
+        print("❌ No seed files found.")
+        sys.exit(1)
+
+    if os.path.isdir(args.out):
+        if not os.path.exists(os.path.join(args.out, MANIFEST_FILE)):
+            print(f"❌ {args.out} exists and is not a shard directory, refusing to overwrite it.")
+            sys.exit(1)
+        shutil.rmtree(args.out)
+
+    schema = parse_schema(args.schema)
+    print(f"📖 Reading {len(files)} file(s)...")
+    tables = collect_rows(files, schema)
+
+    print(f"✂️ Writing shards to {args.out}/")
+    manifest = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'sources': files,
+        'tables': write_shards(tables, schema, args.out, args.rows_per_shard),
+    }
+    with open(os.path.join(args.out, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"✅ Manifest written to {os.path.join(args.out, MANIFEST_FILE)}")
+
+if __name__ == "__main__":
+    main()
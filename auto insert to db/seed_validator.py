@@ -0,0 +1,442 @@
+import argparse
+import datetime
+import glob
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from collation import collation_key
+
+# Pre-load validator for the generated seed SQL.
+#
+# Parses the CREATE TABLE statements in database_creation.sql once, compiles a
+# check per column (varchar/char length, enum members, integer ranges, dates,
+# decimal precision, NOT NULL) plus the primary, unique and foreign keys, then
+# streams the generated insert files through a small SQL tokenizer and checks
+# every row the way MySQL would on a fresh database:
+#
+# - AUTO_INCREMENT ids are assigned like MySQL (explicit ids, e.g. from
+#   id_registry.py, move the counter forward), and foreign keys to
+#   studio/tags/user/anime must name an id loaded so far (gaps are caught).
+# - `SET @anime_id_N = LAST_INSERT_ID()` variables are resolved like MySQL.
+# - UNIQUE keys compare with collation_key (utf8mb4_0900_ai_ci semantics).
+# - String literals are unescaped like MySQL does, including backslashes.
+#
+# Files must be given in load order (studios, tags, users before anime, anime
+# before anime_tags/watchlist/comments). With no arguments the usual seed files
+# in this folder are validated in that order.
+#
+# Usage:
+#   python seed_validator.py
+#   python seed_validator.py insert_studios.sql insert_tags.sql insert_users.sql insert_anime_15192.sql
+
+SCHEMA_FILE = 'database_creation.sql'
+DEFAULT_FILES = [
+    'insert_studios.sql', 'insert_tags.sql', 'insert_users.sql', 'insert_anime_*.sql',
+    'insert_watchlists.sql', 'insert_comments.sql', 'insert_watchlist_counters.sql', 'insert_comment_counters.sql',
+]
+MAX_REPORTED_PER_KIND = 20
+READ_CHUNK = 1 << 20
+
+INT_RANGES = {
+    'tinyint': (-2 ** 7, 2 ** 7 - 1), 'smallint': (-2 ** 15, 2 ** 15 - 1), 'mediumint': (-2 ** 23, 2 ** 23 - 1),
+    'int': (-2 ** 31, 2 ** 31 - 1), 'bigint': (-2 ** 63, 2 ** 63 - 1),
+}
+TEXT_BYTES = {'tinytext': 255, 'text': 65535, 'mediumtext': 2 ** 24 - 1, 'longtext': 2 ** 32 - 1}
+DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+MYSQL_ESCAPES = {'0': '\0', "'": "'", '"': '"', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a', '\\': '\\', '%': '\\%', '_': '\\_'}
+ESCAPE_RE = re.compile(r"''|\\(.)", re.DOTALL)
+
+class Var(str):
+    """A @user_variable reference inside VALUES."""
+
+# --- SCHEMA ---
+
+class Column:
+    def __init__(self, name, definition):
+        self.name = name
+        lowered = definition.lower()
+        type_match = re.match(r"(\w+)(?:\((.*?)\))?", lowered)
+        self.kind = type_match.group(1)
+        self.args = type_match.group(2)
+        self.unsigned = ' unsigned' in lowered
+        self.auto_increment = 'auto_increment' in lowered
+        self.not_null = 'not null' in lowered
+        self.has_default = ' default ' in f" {lowered} " or self.auto_increment
+        self.enum_values = None
+        if self.kind == 'enum':
+            self.enum_values = {collation_key(v.replace("''", "'")) for v in re.findall(r"'((?:[^']|'')*)'", definition)}
+        self.check = self.compile()
+
+    def compile(self):
+        """Returns check(value) -> error message or None, for a non-NULL value."""
+        kind, args = self.kind, self.args
+        if kind in ('varchar', 'char'):
+            limit = int(args)
+            return lambda v: None if isinstance(v, str) and len(v) <= limit else (
+                f"longer than {kind}({limit}) ({len(v)} chars)" if isinstance(v, str) else f"expected a string, got {v!r}")
+        if kind in TEXT_BYTES:
+            limit = TEXT_BYTES[kind]
+            return lambda v: None if isinstance(v, str) and len(v.encode('utf-8')) <= limit else f"exceeds {kind} ({limit} bytes)"
+        if kind == 'enum':
+            allowed = self.enum_values
+            def check_enum(v):
+                if isinstance(v, str):
+                    ok = collation_key(v) in allowed
+                else:
+                    # A number is the 1-based member index (rating 4 -> '4' in insert_studios.sql).
+                    ok = isinstance(v, int) and 1 <= v <= len(allowed)
+                return None if ok else f"{v!r} is not an enum value"
+            return check_enum
+        if kind in INT_RANGES:
+            low, high = INT_RANGES[kind]
+            if self.unsigned:
+                low, high = 0, high * 2 + 1
+            return lambda v: None if isinstance(v, int) and low <= v <= high else f"{v!r} outside {kind}{' unsigned' if self.unsigned else ''} range"
+        if kind == 'decimal':
+            precision, scale = (int(x) for x in args.split(','))
+            bound = 10 ** (precision - scale)
+            return lambda v: None if isinstance(v, (int, float)) and abs(v) < bound else f"{v!r} does not fit decimal({precision},{scale})"
+        if kind == 'date':
+            return check_date
+        if kind in ('double', 'float'):
+            return lambda v: None if isinstance(v, (int, float)) else f"expected a number, got {v!r}"
+        return lambda v: None # timestamp and anything else is left to MySQL
+
+def check_date(value):
+    if not isinstance(value, str) or not DATE_RE.match(value):
+        return f"{value!r} is not a YYYY-MM-DD date"
+    try:
+        datetime.date.fromisoformat(value)
+    except ValueError:
+        return f"{value!r} is not a valid date"
+    return None
+
+class Table:
+    def __init__(self, name):
+        self.name = name
+        self.columns = {}
+        self.primary_key = []
+        self.unique_keys = []
+        self.foreign_keys = [] # (columns, referenced table, referenced columns)
+
+    @property
+    def auto_column(self):
+        return next((c.name for c in self.columns.values() if c.auto_increment), None)
+
+def split_top_level(body):
+    parts, depth, start, in_quote = [], 0, 0, False
+    for i, ch in enumerate(body):
+        if ch == "'":
+            in_quote = not in_quote
+        elif in_quote:
+            continue
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == ',' and depth == 0:
+            parts.append(body[start:i])
+            start = i + 1
+    parts.append(body[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+def key_columns(text):
+    return [c.lower() for c in re.findall(r'`(\w+)`', text)]
+
+def parse_schema(path=SCHEMA_FILE):
+    """Returns {table name (lowercase): Table} from the CREATE TABLE statements."""
+    with open(path, 'r', encoding='utf-8') as f:
+        ddl = re.sub(r'--[^\n]*', '', f.read())
+
+    tables = {}
+    for name, body in re.findall(r'CREATE TABLE `(\w+)` \((.*?)\n\)\s*ENGINE', ddl, flags=re.DOTALL):
+        table = Table(name.lower())
+        for part in split_top_level(body):
+            upper = part.upper()
+            if part.startswith('`'):
+                column_name, definition = re.match(r'`(\w+)`\s+(.*)', part, flags=re.DOTALL).groups()
+                table.columns[column_name.lower()] = Column(column_name.lower(), definition)
+            elif upper.startswith('PRIMARY KEY'):
+                table.primary_key = key_columns(part)
+            elif upper.startswith('UNIQUE KEY'):
+                table.unique_keys.append(key_columns(part)[1:]) # First backticked name is the index name
+            elif 'FOREIGN KEY' in upper:
+                local, remote = part[upper.index('FOREIGN KEY'):].split('REFERENCES')
+                remote_table = re.match(r'\s*`(\w+)`', remote).group(1).lower()
+                table.foreign_keys.append((key_columns(local), remote_table, key_columns(remote)[1:]))
+        tables[table.name] = table
+    return tables
+
+# --- SQL STREAM ---
+
+TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+|--[^\n]*)
+  | (?P<str>'(?:[^'\\]|''|\\.)*')
+  | (?P<var>@\w+)
+  | (?P<num>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+  | (?P<ident>`[^`]+`|\w+)
+  | (?P<punct>[(),;=])
+""", re.VERBOSE | re.DOTALL)
+
+def unescape(literal):
+    return ESCAPE_RE.sub(lambda m: "'" if m.group(1) is None else MYSQL_ESCAPES.get(m.group(1), m.group(1)), literal[1:-1])
+
+def tokens(path):
+    """Yields (kind, value, line) from a SQL file, reading it in chunks."""
+    line = 1
+    with open(path, 'r', encoding='utf-8') as f:
+        buf, pos, eof = '', 0, False
+        while True:
+            m = TOKEN_RE.match(buf, pos)
+            # A match touching the end of the buffer may continue in the next chunk.
+            if (m is None or m.end() == len(buf)) and not eof:
+                chunk = f.read(READ_CHUNK)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            if m is None:
+                if pos < len(buf):
+                    raise SyntaxError(f"{path}:{line}: cannot tokenize near {buf[pos:pos + 40]!r}")
+                return
+            kind, text = m.lastgroup, m.group()
+            pos = m.end()
+            if kind == 'ws':
+                line += text.count('\n')
+                continue
+            if kind == 'str':
+                yield kind, unescape(text), line
+                line += text.count('\n')
+            elif kind == 'num':
+                yield kind, float(text) if ('.' in text or 'e' in text.lower()) else int(text), line
+            elif kind == 'var':
+                yield kind, Var(text.lower()), line
+            elif kind == 'ident':
+                word = text.strip('`')
+                yield ('null', None, line) if word.upper() == 'NULL' else (kind, word, line)
+            else:
+                yield kind, text, line
+
+def statements(path):
+    """
+    Yields ('insert', table, columns, rows, upsert) and ('set', variable, expression)
+    events. rows is a list of (line, values).
+    """
+    stream = tokens(path)
+    for kind, value, line in stream:
+        word = value.upper() if kind == 'ident' else None
+        if word == 'INSERT':
+            yield parse_insert(stream)
+        elif word == 'SET':
+            _, variable, _ = next(stream)
+            next(stream) # =
+            expression = []
+            for kind, value, _ in stream:
+                if value == ';':
+                    break
+                expression.append(str(value))
+            yield ('set', variable, ''.join(expression).upper())
+        elif value != ';':
+            skip_statement(stream) # START TRANSACTION, COMMIT, DDL...
+
+def skip_statement(stream):
+    for kind, value, _ in stream:
+        if kind == 'punct' and value == ';':
+            return
+
+def parse_insert(stream):
+    _, into, _ = next(stream)
+    _, table, _ = next(stream) if into.upper() == 'INTO' else (None, into, None)
+    columns = []
+    for kind, value, _ in stream:
+        if value == ')':
+            break
+        if kind == 'ident':
+            columns.append(value.lower())
+    kind, value, line = next(stream) # VALUES
+    if kind == 'ident' and value.upper() == 'SELECT':
+        # INSERT ... SELECT <literals> FROM DUAL WHERE NOT EXISTS (...) (delta_anime.sql):
+        # a conditional row, checked like an upsert.
+        values = []
+        for kind, value, _ in stream:
+            if kind == 'ident' and value.upper() == 'FROM':
+                break
+            if kind != 'punct':
+                values.append(value)
+        skip_statement(stream)
+        return ('insert', table.lower(), columns, [(line, values)], True)
+
+    rows, upsert = [], False
+    for kind, value, line in stream:
+        if value == '(':
+            values = []
+            for kind, value, _ in stream:
+                if kind == 'punct':
+                    if value == ')':
+                        break
+                    continue
+                values.append(value)
+            rows.append((line, values))
+        elif value == ';':
+            break
+        elif kind == 'ident' and value.upper() == 'ON':
+            upsert = True
+            skip_statement(stream)
+            break
+    return ('insert', table.lower(), columns, rows, upsert)
+
+# --- VALIDATION ---
+
+class Validator:
+    def __init__(self, schema):
+        self.schema = schema
+        self.row_counts = Counter() # AUTO_INCREMENT high-water mark per table
+        self.ids = defaultdict(set) # AUTO_INCREMENT ids loaded per table
+        self.loaded = set()
+        self.unique_seen = defaultdict(set)
+        self.variables = {}
+        self.last_insert_id = None
+        self.violations = Counter()
+        self.reported = Counter()
+        self.rows = 0
+        self.unchecked_fks = set()
+
+    def report(self, kind, location, message):
+        self.violations[kind] += 1
+        if self.reported[kind] < MAX_REPORTED_PER_KIND:
+            self.reported[kind] += 1
+            print(f"  ❌ {location}: {message}")
+
+    def validate_file(self, path):
+        try:
+            for event in statements(path):
+                if event[0] == 'set':
+                    _, variable, expression = event
+                    if expression == 'LAST_INSERT_ID()':
+                        self.variables[variable] = self.last_insert_id
+                    else:
+                        # e.g. (SELECT AnimeID FROM Anime WHERE mal_id = N) in delta_anime.sql:
+                        # set, but only MySQL knows the value, so rows using it are not checked.
+                        self.variables[variable] = variable
+                else:
+                    self.validate_insert(path, *event[1:])
+        except (SyntaxError, StopIteration) as e:
+            self.report('syntax', path, str(e) or "unexpected end of file")
+
+    def validate_insert(self, path, table_name, columns, rows, upsert):
+        table = self.schema.get(table_name)
+        if table is None:
+            self.report('unknown table', path, f"table `{table_name}` is not in {SCHEMA_FILE}")
+            return
+        unknown = [c for c in columns if c not in table.columns]
+        if unknown:
+            self.report('unknown column', path, f"`{table_name}` has no column(s) {', '.join(unknown)}")
+            return
+
+        missing_required = [c.name for c in table.columns.values()
+                            if c.not_null and not c.has_default and c.name not in columns]
+        checks = [table.columns[c] for c in columns]
+        index = {c: i for i, c in enumerate(columns)}
+        auto = table.auto_column
+        unique_keys = [] if upsert else [k for k in [table.primary_key] + table.unique_keys if all(c in index for c in k)]
+        foreign_keys = [(index[cols[0]], ref, cols[0]) for cols, ref, _ in table.foreign_keys if cols[0] in index]
+        self.loaded.add(table_name)
+
+        for line, values in rows:
+            self.rows += 1
+            location = f"{os.path.basename(path)}:{line}"
+            if len(values) != len(columns):
+                self.report('column count', location, f"{len(values)} values for {len(columns)} columns")
+                continue
+            if missing_required:
+                self.report('not null', location, f"required column(s) {', '.join(missing_required)} not given")
+
+            resolved = list(values)
+            for i, (column, value) in enumerate(zip(checks, values)):
+                if isinstance(value, Var):
+                    value = self.variables.get(value)
+                    if value is None:
+                        self.report('variable', location, f"{values[i]} is not set")
+                        continue
+                    resolved[i] = value
+                    if isinstance(value, Var):
+                        continue
+                if value is None:
+                    if column.not_null and not column.auto_increment:
+                        self.report('not null', location, f"{table_name}.{column.name} is NULL")
+                    continue
+                error = column.check(value)
+                if error:
+                    self.report(f"{table_name}.{column.name}", location, f"{table_name}.{column.name}: {error}")
+
+            for position, ref_table, column_name in foreign_keys:
+                value = resolved[position]
+                if value is None or isinstance(value, Var):
+                    continue
+                if ref_table not in self.loaded:
+                    self.unchecked_fks.add(f"{table_name}.{column_name} -> {ref_table}")
+                elif value not in self.ids[ref_table]:
+                    self.report('foreign key', location, f"{table_name}.{column_name}={value!r} has no {ref_table} row")
+
+            for key in unique_keys:
+                values_key = tuple(collation_key(resolved[index[c]]) if isinstance(resolved[index[c]], str) else resolved[index[c]]
+                                   for c in key)
+                seen = self.unique_seen[(table_name, tuple(key))]
+                if values_key in seen:
+                    self.report('duplicate key', location, f"duplicate {table_name} ({', '.join(key)}) = {values_key}")
+                seen.add(values_key)
+
+            if auto and not upsert:
+                given = resolved[index[auto]] if auto in index else None
+                row_id = given or self.row_counts[table_name] + 1
+                self.row_counts[table_name] = max(self.row_counts[table_name], row_id)
+                self.ids[table_name].add(row_id)
+                self.last_insert_id = row_id
+            elif auto and auto in index and isinstance(resolved[index[auto]], int):
+                # Upsert with an explicit id (delta_anime.sql): the row exists afterwards either way.
+                self.ids[table_name].add(resolved[index[auto]])
+
+def resolve_files(patterns):
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern), key=os.path.getmtime)
+        if '*' in pattern and matches:
+            matches = matches[-1:] # Newest generated file
+        files.extend(matches)
+    return files
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate generated seed SQL against database_creation.sql before loading it.")
+    parser.add_argument('files', nargs='*', help="SQL files in load order (default: the usual seed files)")
+    parser.add_argument('--schema', default=SCHEMA_FILE)
+    args = parser.parse_args()
+
+    files = args.files or resolve_files(DEFAULT_FILES)
+    if not files:
+        print("❌ No seed files found.")
+        sys.exit(1)
+
+    schema = parse_schema(args.schema)
+    print(f"📐 Loaded {len(schema)} tables from {args.schema}")
+    validator = Validator(schema)
+    start = time.perf_counter()
+    for path in files:
+        before = validator.rows
+        print(f"🔎 {path}")
+        validator.validate_file(path)
+        print(f"   {validator.rows - before:,} rows")
+    elapsed = time.perf_counter() - start
+
+    print(f"\n⏱️ {validator.rows:,} rows in {elapsed:.1f}s ({validator.rows / max(elapsed, 1e-9) * 60:,.0f} rows/min)")
+    for fk in sorted(validator.unchecked_fks):
+        print(f"⚠️ Not checked (referenced table not in the given files): {fk}")
+    if validator.violations:
+        print("\n🚨 Violations")
+        for kind, count in validator.violations.most_common():
+            print(f"  {kind}: {count:,}")
+        sys.exit(1)
+    print("✅ All rows are valid.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import tqdm
+from db_connection import get_connection
+from seed_shards import SHARD_DIR, MANIFEST_FILE
+from seed_validator import SCHEMA_FILE
+
+# Parallel loader for the shards written by seed_shards.py.
+#
+#   1. (optional) recreate the schema from database_creation.sql
+#   2. drop the secondary indexes that no foreign key depends on, so the load
+#      only maintains primary keys
+#   3. load all shards over --workers connections, each session with
+#      FOREIGN_KEY_CHECKS / UNIQUE_CHECKS off and one commit per shard
+#   4. rebuild the dropped indexes plus the add_indexes.sql indexes, one
+#      ALTER TABLE per table
+#   5. compare row counts with the manifest
+#
+# Checks are off during the load, so validate the seed first (seed_validator.py).
+#
+# Usage:
+#   python shard_loader.py --recreate-schema --workers 8
+#   python shard_loader.py --shards shards --workers 4 --skip-indexes
+
+INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'add_indexes.sql')
+DEFAULT_WORKERS = 4
+INDEX_RE = re.compile(r"CREATE\s+(UNIQUE\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)\s*\(([^)]*)\)", re.IGNORECASE)
+
+def load_manifest(shard_dir):
+    with open(os.path.join(shard_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def recreate_schema(conn, path=SCHEMA_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        ddl = re.sub(r'--[^\n]*', '', f.read())
+    with conn.cursor() as cursor:
+        for statement in ddl.split(';'):
+            if statement.strip():
+                cursor.execute(statement)
+    conn.commit()
+
+def table_indexes(cursor, table):
+    """Returns {index name: (unique, [columns])} for the secondary indexes of `table`."""
+    cursor.execute("""
+        SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME <> 'PRIMARY'
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+    """, (table,))
+    indexes = {}
+    for name, non_unique, column in cursor.fetchall():
+        indexes.setdefault(name, (not non_unique, []))[1].append(column)
+    return indexes
+
+def foreign_key_columns(cursor, table):
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND REFERENCED_TABLE_NAME IS NOT NULL
+    """, (table,))
+    return {row[0].lower() for row in cursor.fetchall()}
+
+def drop_secondary_indexes(conn, tables):
+    """
+    Drops every secondary index whose leading column is not a foreign key
+    column (InnoDB needs those for the constraints). Returns
+    {table: {name: (unique, columns)}} to recreate after the load.
+    """
+    dropped = {}
+    with conn.cursor() as cursor:
+        for table in tables:
+            fk_columns = foreign_key_columns(cursor, table)
+            deferrable = {name: spec for name, spec in table_indexes(cursor, table).items()
+                          if spec[1][0].lower() not in fk_columns}
+            if deferrable:
+                cursor.execute(f"ALTER TABLE `{table}` " + ', '.join(f"DROP INDEX `{name}`" for name in deferrable))
+                dropped[table] = deferrable
+                print(f"  {table}: dropped {', '.join(deferrable)}")
+    return dropped
+
+def add_index_file_specs(path=INDEX_FILE):
+    """Indexes from add_indexes.sql as {table: {name: (unique, columns)}}."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        text = re.sub(r'--[^\n]*', '', f.read())
+    specs = {}
+    for unique, name, table, columns in INDEX_RE.findall(text):
+        specs.setdefault(table.lower(), {})[name] = (bool(unique), [c.strip() for c in columns.split(',')])
+    return specs
+
+def build_indexes(conn, wanted):
+    """Adds all missing indexes of a table in a single ALTER TABLE."""
+    with conn.cursor() as cursor:
+        for table, specs in tqdm.tqdm(wanted.items(), desc="🏗️ Building indexes", unit="table"):
+            existing = table_indexes(cursor, table)
+            clauses = [
+                f"ADD {'UNIQUE ' if unique else ''}INDEX `{name}` ({', '.join(f'`{c}`' for c in columns)})"
+                for name, (unique, columns) in specs.items() if name not in existing
+            ]
+            if clauses:
+                cursor.execute(f"ALTER TABLE `{table}` " + ', '.join(clauses))
+
+class ShardWorker:
+    """One connection per thread, configured for bulk loading."""
+
+    def __init__(self):
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = get_connection()
+            with conn.cursor() as cursor:
+                cursor.execute("SET SESSION foreign_key_checks = 0")
+                cursor.execute("SET SESSION unique_checks = 0")
+                cursor.execute("SET SESSION autocommit = 0")
+            self.local.conn = conn
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    def load(self, path):
+        conn = self.connection()
+        rows = 0
+        try:
+            with conn.cursor() as cursor, open(path, 'r', encoding='utf-8') as f:
+                for statement in f:
+                    rows += cursor.execute(statement)
+            conn.commit()
+        except Exception:
+            # autocommit is off: without this the next shard on this connection would commit our partial rows.
+            conn.rollback()
+            raise
+        return rows
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+
+def row_counts(conn, tables):
+    with conn.cursor() as cursor:
+        counts = {}
+        for table in tables:
+            cursor.execute(f"SELECT COUNT(*) FROM `{table}`")
+            counts[table] = cursor.fetchone()[0]
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Load seed shards concurrently with deferred secondary indexes.")
+    parser.add_argument('--shards', default=SHARD_DIR, help="Directory written by seed_shards.py")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Concurrent connections")
+    parser.add_argument('--recreate-schema', action='store_true', help="Run database_creation.sql first (drops the database!)")
+    parser.add_argument('--skip-indexes', action='store_true', help="Leave secondary indexes dropped after the load")
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.shards)
+    tables = [t['table'] for t in manifest['tables']]
+    expected = {t['table']: t['rows'] for t in manifest['tables']}
+    shards = [(t['table'], os.path.join(args.shards, s['file']), s['rows']) for t in manifest['tables'] for s in t['shards']]
+
+    if args.recreate_schema:
+        print(f"🧱 Recreating schema from {SCHEMA_FILE}...")
+        # The target database may not exist yet; the DDL's USE switches to it.
+        schema_conn = get_connection(database='information_schema')
+        try:
+            recreate_schema(schema_conn)
+        finally:
+            schema_conn.close()
+
+    conn = get_connection()
+    try:
+        before = row_counts(conn, tables)
+        print("🪓 Dropping deferrable secondary indexes...")
+        dropped = drop_secondary_indexes(conn, tables)
+
+        print(f"🚚 Loading {len(shards)} shard(s) with {args.workers} worker(s)...")
+        start = time.perf_counter()
+        worker = ShardWorker()
+        loaded_rows = 0
+        failed = []
+        try:
+            with ThreadPoolExecutor(max_workers=args.workers) as pool, tqdm.tqdm(total=sum(s[2] for s in shards), desc="🚚 Loading", unit="row") as bar:
+                futures = {pool.submit(worker.load, path): (table, path, rows) for table, path, rows in shards}
+                for future in as_completed(futures):
+                    table, path, rows = futures[future]
+                    try:
+                        loaded_rows += future.result()
+                    except Exception as e:
+                        failed.append((path, e))
+                    bar.update(rows)
+        finally:
+            worker.close()
+        elapsed = time.perf_counter() - start
+        print(f"⏱️ {loaded_rows:,} rows in {elapsed:.1f}s ({loaded_rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+        if not args.skip_indexes:
+            wanted = {table: dict(specs) for table, specs in dropped.items()}
+            for table, specs in add_index_file_specs().items():
+                if table in tables:
+                    wanted.setdefault(table, {}).update(specs)
+            start = time.perf_counter()
+            build_indexes(conn, wanted)
+            print(f"⏱️ Indexes built in {time.perf_counter() - start:.1f}s")
+
+        after = row_counts(conn, tables)
+    finally:
+        conn.close()
+
+    print("\n🔢 Row counts")
+    mismatches = 0
+    for table in tables:
+        loaded = after[table] - before[table]
+        ok = loaded == expected[table]
+        mismatches += not ok
+        print(f"  {'✅' if ok else '❌'} {table:<18}{loaded:>10,} / {expected[table]:,}")
+
+    for path, error in failed:
+        print(f"❌ {path}: {error}")
+    if failed or mismatches:
+        sys.exit(1)
+    print("✅ Load complete.")
+
+if __name__ == "__main__":
+    main()
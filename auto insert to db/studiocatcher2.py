@@ -1,72 +1,158 @@
-import aiohttp
+import argparse
 import asyncio
+import json
+import os
+import time
 import tqdm
 from collections import defaultdict
+from collation import collation_key
+from jikan_http import JikanSession
+from jikan_decode import decode_page
+from profiling import Profiler, add_profile_argument
+from id_registry import IdRegistry, export_maps
+from autoinsert3 import RAW_SNAPSHOT_FILE
+from crawl_coordinator import SharedTokenBucket, DEFAULT_RATE, DEFAULT_BURST, DEFAULT_PER_MINUTE, COOL_DOWN_SECONDS
 
 # GLOBAL CONFIGURATION
 # Updated to the "Top Anime" endpoint
 BASE_URL = "https://api.jikan.moe/v4/top/anime"
 MAX_CONCURRENT_REQUESTS = 3
 
+# --from-producers: studio names and frequencies from raw_anime_snapshot.json
+# instead of the whole top/anime crawl; the producers listing (~80 pages) only
+# adds each studio's current title as a registry alias
+PRODUCERS_URL = "https://api.jikan.moe/v4/producers"
+PRODUCER_CACHE_DIR = "producers_cache"
+PRODUCER_CACHE_TTL = 7 * 24 * 3600 # Seconds a cached listing page stays valid
+
 async def fetch_page(session, page, semaphore):
     async with semaphore: 
         # We pass parameters as a dictionary now.
         # 'sfw': 'true' asks the server to filter out Hentai before sending data.
         params = {'page': page, 'sfw': 'true'}
         
-        try:
-            async with session.get(BASE_URL, params=params) as response:
-                if response.status == 429:
-                    print(f"⚠️ Rate limit hit on page {page}. Cooling down...")
-                    await asyncio.sleep(2)
-                    return await fetch_page(session, page, semaphore)
-                
-                if response.status != 200:
-                    print(f"❌ Failed to fetch page {page}: {response.status}")
-                    return []
-
-                payload = await response.json()
-                await asyncio.sleep(0.5) 
-                return payload.get('data', [])
-                
-        except Exception as e:
-            print(f"⚠️ Error on page {page}: {e}")
-            return []
+        # Retry 429s in place (see autoinsert3.fetch_page).
+        while True:
+            try:
+                async with session.get(BASE_URL, params=params) as response:
+                    if response.status == 429:
+                        print(f"⚠️ Rate limit hit on page {page}. Cooling down...")
+                        await asyncio.sleep(2)
+                        continue
+                    
+                    if response.status != 200:
+                        print(f"❌ Failed to fetch page {page}: {response.status}")
+                        return []
+
+                    payload = decode_page(await response.read())
+                    await asyncio.sleep(0.5) 
+                    return payload.get('data') or []
+                    
+            except Exception as e:
+                print(f"⚠️ Error on page {page}: {e}")
+                return []
 
 async def get_pagination_limit():
     """
     Fetches Page 1 to see how many total pages of 'Top Anime' exist.
     """
-    async with aiohttp.ClientSession() as session:
+    async with JikanSession() as session:
         # We must include sfw=true here too, or the page count might be different
         # (e.g. including hentai pages)
         params = {'page': 1, 'sfw': 'true'}
-        async with session.get(BASE_URL, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                return data['pagination']['last_visible_page']
-            return 1
-
-async def main():
-    print("🔍 Checking total pages for Top Anime (SFW)...")
-    total_pages = await get_pagination_limit()
-    print(f"📄 Found {total_pages} pages. Starting parallel fetch...")
-
+        while True:
+            async with session.get(BASE_URL, params=params) as response:
+                if response.status == 429:
+                    await asyncio.sleep(2)
+                    continue
+                if response.status == 200:
+                    data = await response.json()
+                    return data['pagination']['last_visible_page']
+                return 1
+
+async def fetch_producer_page(session, page, bucket):
+    """One producers listing page, from PRODUCER_CACHE_DIR while it is fresh."""
+    cache_path = os.path.join(PRODUCER_CACHE_DIR, f"page_{page}.json")
+    if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < PRODUCER_CACHE_TTL:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    while True:
+        await bucket.acquire()
+        try:
+            async with session.get(PRODUCERS_URL, params={'page': page}) as response:
+                if response.status == 429:
+                    bucket.cool_down(COOL_DOWN_SECONDS)
+                    continue
+                if response.status != 200:
+                    print(f"❌ Failed to fetch producers page {page}: {response.status}")
+                    return None
+                payload = await response.json()
+        except Exception as e:
+            print(f"⚠️ Error on producers page {page}: {e}")
+            return None
+        os.makedirs(PRODUCER_CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        return payload
+
+async def fetch_producers():
+    """{mal_id: default name} for every producer/studio Jikan lists."""
+    bucket = SharedTokenBucket(DEFAULT_RATE, DEFAULT_BURST, DEFAULT_PER_MINUTE)
+    async with JikanSession() as session:
+        first = await fetch_producer_page(session, 1, bucket)
+        if first is None:
+            return {}
+        last_page = first.get('pagination', {}).get('last_visible_page', 1)
+        tasks = [fetch_producer_page(session, page, bucket) for page in range(2, last_page + 1)]
+        payloads = [first]
+        for f in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="🏢 Producers", unit="page"):
+            payloads.append(await f)
+
+    producers = {}
+    for payload in payloads:
+        for producer in (payload or {}).get('data', []):
+            titles = producer.get('titles') or []
+            name = next((t['title'] for t in titles if t.get('type') == 'Default'), titles[0]['title'] if titles else None)
+            if name:
+                producers[producer['mal_id']] = name
+    return producers
+
+async def main(profiler, from_producers=False):
+    producers = {}
+    if from_producers:
+        # Frequencies come from the anime autoinsert3.py / crawl_coordinator.py already downloaded.
+        with open(RAW_SNAPSHOT_FILE, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+        print(f"📂 Counting studios in {len(results)} anime from {RAW_SNAPSHOT_FILE}...")
+        producers = await fetch_producers()
+        print(f"🏢 {len(producers)} producers listed.")
+    else:
+        print("🔍 Checking total pages for Top Anime (SFW)...")
+        total_pages = await get_pagination_limit()
+        print(f"📄 Found {total_pages} pages. Starting parallel fetch...")
+
+    # Counted per collation key: studio_name is UNIQUE under utf8mb4_0900_ai_ci,
+    # so spellings differing only by case/accents are one studio (first spelling wins).
     studio_count = defaultdict(int)
+    studio_names = {}
+    studio_mal_ids = {}
     skipped_studios = defaultdict(list)
     
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    if not from_producers:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for page in range(1, total_pages + 1):
-            tasks.append(fetch_page(session, page, semaphore))
+        async with JikanSession() as session:
+            tasks = []
+            for page in range(1, total_pages + 1):
+                tasks.append(fetch_page(session, page, semaphore))
 
-        results = []
-        for f in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="🚀 Downloading", unit="page"):
-            page_data = await f
-            results.extend(page_data)
+            results = []
+            for f in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="🚀 Downloading", unit="page"):
+                page_data = await f
+                results.extend(page_data)
 
+    profiler.checkpoint("fetch")
     print("📥 Processing data...")
 
     for anime in results:
@@ -89,13 +175,29 @@ async def main():
             continue
 
         for studio in anime.get('studios', []):
+            # The anime payload's spelling, which is what autoinsert3.py looks up.
             name = studio.get('name')
             if name:
-                studio_count[name] += 1
-
+                key = collation_key(name)
+                studio_names.setdefault(key, name)
+                studio_mal_ids.setdefault(key, studio.get('mal_id'))
+                studio_count[key] += 1
+
+    # Permanent StudioIDs, so a new studio never shifts the IDs of existing ones.
+    with IdRegistry() as registry:
+        # New studios are numbered in name order, like the old positional maps.
+        studio_ids = {key: registry.resolve('studio', name, studio_mal_ids[key])
+                      for key, name in sorted(studio_names.items(), key=lambda item: item[1])}
+        # The producers listing's title is only an alias, so name lookups of either spelling work.
+        for key, studio_id in studio_ids.items():
+            if studio_mal_ids[key] in producers:
+                registry.add_alias('studio', producers[studio_mal_ids[key]], studio_id)
+        export_maps(registry)
+
+    profiler.checkpoint("count_studios")
     print("💾 Writing SQL insert statements...")
     with open("insert_studios.sql", "w", encoding="utf-8") as sql_file:
-        sql_file.write("INSERT INTO Studio (studio_name, rating) VALUES\n")
+        sql_file.write("INSERT INTO Studio (StudioID, studio_name, rating) VALUES\n")
         values = []
         
         def calculate_rating(freq):
@@ -105,15 +207,21 @@ async def main():
             elif freq >= 1: return 2
             return 1
             
-        for studio_name in sorted(studio_count.keys()):
-            rating = calculate_rating(studio_count[studio_name])
-            name = studio_name.replace("'", "''")
-            values.append(f"('{name}', {rating})")
+        for key, studio_id in sorted(studio_ids.items(), key=lambda item: item[1]):
+            rating = calculate_rating(studio_count[key])
+            name = studio_names[key].replace("'", "''")
+            values.append(f"({studio_id}, '{name}', {rating})")
         
         if values:
             sql_file.write(",\n".join(values) + ";\n")
 
+    profiler.checkpoint("write_sql")
     print("✅ All done!")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Count studios across the Jikan top anime catalog and generate insert_studios.sql.")
+    parser.add_argument('--from-producers', action='store_true', help=f"Use the producers listing and the studio counts in {RAW_SNAPSHOT_FILE} instead of crawling top/anime")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    with Profiler(args.profile, "studiocatcher2") as profiler:
+        asyncio.run(main(profiler, from_producers=args.from_producers))
\ No newline at end of file
@@ -2,8 +2,11 @@
 # Updated to be compatible with studiocatcher's sanitized SQL output.
 # Handles unescaping of SQL quotes (e.g., "''" -> "'") and robust parsing.
 # Outputs to 'studio_map.txt'.
+# Once id_registry.sqlite3 exists the map is exported from the registry instead,
+# since positions in the SQL file are not stable IDs.
 
 import os
+from id_registry import IdRegistry, write_map_file, REGISTRY_FILE
 
 def parse_studio_sql(file_path, output_path):
     studio_map = {} 
@@ -81,6 +84,12 @@ def parse_studio_sql(file_path, output_path):
         print(f"❌ An error occurred: {e}")
 
 if __name__ == '__main__':
+    if os.path.exists(REGISTRY_FILE):
+        print(f"📂 Exporting from {REGISTRY_FILE}...")
+        with IdRegistry() as registry:
+            write_map_file(registry.name_map('studio'), 'studio_map.txt', 'studio_map')
+        raise SystemExit
+
     # Checks for the new file name first, falls back to the old one
     input_file = 'insert_studios.sql' if os.path.exists('insert_studios.sql') else 'studio_inserts.sql'
     
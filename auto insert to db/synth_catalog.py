@@ -0,0 +1,209 @@
+import argparse
+import json
+import random
+import re
+import sys
+from collections import Counter
+import tqdm
+from autoinsert3 import (
+    load_maps, transform_anime, write_anime_inserts,
+    ANIME_COLUMNS, RAW_SNAPSHOT_FILE,
+)
+
+# Synthetic catalog amplifier for scale testing.
+#
+# The Jikan catalog tops out around 25k anime, which is too small to see how
+# the seeding scripts, the SQL load and the Express queries behave at 10x or
+# 100x. This job learns the shape of the real catalog from the raw snapshot
+# written by autoinsert3.py (type/status mix, episodes per type, scores, air
+# dates, studio popularity, genre/theme combinations, synopsis lengths) and
+# synthesizes as many extra anime as requested.
+#
+# Synthetic entries are built as Jikan-shaped records and go through the same
+# transform_anime / write_anime_inserts code as the real pipeline, so the
+# output is exactly what autoinsert3.py would have produced for them. Records
+# are generated and written in chunks, each chunk in its own transaction, so
+# memory stays flat no matter how many rows are requested.
+#
+# Usage:
+#   python synth_catalog.py --count 250000
+#   python synth_catalog.py --count 1000000 --chunk-size 20000 --seed 7 --output insert_anime_synth.sql
+
+DEFAULT_CHUNK_SIZE = 10000
+TITLE_WORDS_MIN, TITLE_WORDS_MAX = 1, 4
+SYNTHETIC_MAL_ID_OFFSET = 10_000_000 # Keeps synthetic mal_ids clear of real ones
+SYNTHETIC_TITLE_MARKER = '⟪synth #{}⟫' # Keeps synthetic titles clear of real ones ("Mob Psycho" + 100)
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z'\-]+")
+SEED_CATALOG_SIZE = 500
+SYNOPSIS_SEED_WORDS = "A young hero leaves home to find the truth about a world at war with itself".split()
+
+class CatalogModel:
+    """
+    Empirical distributions learned from a raw Jikan snapshot. Joint
+    properties that matter for queries (type + episodes, genre/theme
+    combinations, start + end date) are sampled together from real entries
+    instead of independently, so their correlations survive.
+    """
+
+    def __init__(self, raw_anime, studio_map):
+        self.types = Counter()
+        self.statuses = Counter()
+        self.episodes_by_type = {}
+        self.scores = []
+        self.airings = []
+        self.tag_sets = []
+        self.studios = Counter()
+        self.synopsis_lengths = []
+        self.image_urls = []
+        title_words = Counter()
+        synopsis_words = Counter()
+
+        for anime in raw_anime:
+            type_ = anime.get('type')
+            if not type_:
+                continue
+            self.types[type_] += 1
+            self.statuses[anime.get('status')] += 1
+            self.episodes_by_type.setdefault(type_, []).append(anime.get('episodes'))
+            self.scores.append(anime.get('score'))
+
+            aired = anime.get('aired') or {}
+            self.airings.append((aired.get('from'), aired.get('to')))
+
+            self.tag_sets.append((
+                [g['name'] for g in anime.get('genres', [])],
+                [t['name'] for t in anime.get('themes', [])],
+            ))
+
+            # Only studios the target database knows, otherwise every sample would be skipped.
+            for studio in anime.get('studios') or []:
+                if studio['name'] in studio_map:
+                    self.studios[studio['name']] += 1
+
+            synopsis = anime.get('synopsis') or ''
+            words = WORD_RE.findall(synopsis)
+            self.synopsis_lengths.append(len(words))
+            synopsis_words.update(words)
+            title_words.update(WORD_RE.findall(anime.get('title') or ''))
+
+            url = (anime.get('images') or {}).get('jpg', {}).get('image_url')
+            if url:
+                self.image_urls.append(url)
+
+        if not self.types or not self.studios:
+            raise ValueError("Snapshot has no usable anime (or none of its studios are in studio_map)")
+
+        self.title_words = list(title_words)
+        self.synopsis_vocab, self.synopsis_weights = zip(*synopsis_words.items()) if synopsis_words else (['Lorem'], [1])
+        self.type_names, self.type_weights = zip(*self.types.items())
+        self.status_names, self.status_weights = zip(*self.statuses.items())
+        self.studio_names, self.studio_weights = zip(*self.studios.items())
+
+    def sample(self, rng, index):
+        """Returns one Jikan-shaped anime dict. `index` makes the title unique."""
+        type_ = rng.choices(self.type_names, self.type_weights)[0]
+        genres, themes = rng.choice(self.tag_sets)
+        start, end = rng.choice(self.airings)
+
+        words = rng.sample(self.title_words, min(len(self.title_words), rng.randint(TITLE_WORDS_MIN, TITLE_WORDS_MAX)))
+        title = f"{' '.join(words)} {SYNTHETIC_TITLE_MARKER.format(index)}"
+
+        length = rng.choice(self.synopsis_lengths)
+        synopsis = ' '.join(rng.choices(self.synopsis_vocab, self.synopsis_weights, k=length)) + '.' if length else None
+
+        return {
+            'mal_id': SYNTHETIC_MAL_ID_OFFSET + index,
+            'title': title,
+            'type': type_,
+            'status': rng.choices(self.status_names, self.status_weights)[0],
+            'episodes': rng.choice(self.episodes_by_type[type_]),
+            'score': rng.choice(self.scores),
+            'aired': {'from': start, 'to': end},
+            'synopsis': synopsis,
+            'images': {'jpg': {'image_url': rng.choice(self.image_urls) if self.image_urls else ''}},
+            'studios': [{'name': rng.choices(self.studio_names, self.studio_weights)[0]}],
+            'genres': [{'name': name} for name in genres],
+            'themes': [{'name': name} for name in themes],
+        }
+
+def seed_catalog(studio_map, tag_map, rng):
+    """Minimal Jikan-shaped records used to train CatalogModel when there is no snapshot."""
+    studios = list(studio_map)
+    tags = [t for t in tag_map if t not in ('NO TAGS', 'Hentai', 'Erotica')]
+    catalog = []
+    for i in range(SEED_CATALOG_SIZE):
+        year = rng.randint(1980, 2025)
+        catalog.append({
+            'title': f"Seed Anime {i}",
+            'type': rng.choice(['TV', 'TV', 'Movie', 'OVA', 'ONA', 'Special']),
+            'status': rng.choice(['Finished Airing', 'Finished Airing', 'Currently Airing', 'Not yet aired']),
+            'episodes': rng.choice([1, 12, 13, 24, 26, None]),
+            'score': round(rng.uniform(5, 9.2), 2),
+            'aired': {'from': f"{year}-04-01T00:00:00+00:00", 'to': f"{year}-09-30T00:00:00+00:00"},
+            'synopsis': ' '.join(rng.choices(SYNOPSIS_SEED_WORDS, k=rng.randint(20, 120))),
+            'images': {'jpg': {'image_url': f"https://cdn.myanimelist.net/images/anime/{i}/{i}.jpg"}},
+            'studios': [{'name': rng.choice(studios)}],
+            'genres': [{'name': t} for t in rng.sample(tags, rng.randint(1, 4))],
+            'themes': [],
+        })
+    return catalog
+
+def load_snapshot(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesize a large anime catalog shaped like the real one.")
+    parser.add_argument('--count', type=int, required=True, help="Number of anime to generate")
+    parser.add_argument('--snapshot', default=RAW_SNAPSHOT_FILE, help="Raw Jikan snapshot written by autoinsert3.py")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows generated and committed per chunk")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Output SQL file (default: insert_anime_synth_<count>.sql)")
+    args = parser.parse_args()
+
+    studio_map, tag_map = load_maps()
+    if not studio_map:
+        sys.exit(1)
+
+    print(f"📂 Learning catalog shape from {args.snapshot}...")
+    try:
+        model = CatalogModel(load_snapshot(args.snapshot), studio_map)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not build catalog model: {e}")
+        sys.exit(1)
+    print(f"✅ Learned from {sum(model.types.values())} anime, {len(model.studios)} studios, {len(model.tag_sets)} tag sets.")
+
+    rng = random.Random(args.seed)
+    output_filename = args.output or f"insert_anime_synth_{args.count}.sql"
+    written = 0
+    skip_reasons = Counter()
+
+    with open(output_filename, "w", encoding="utf-8") as f, tqdm.tqdm(total=args.count, desc="🧪 Synthesizing", unit="anime", colour="green") as bar:
+        index = 0
+        while written < args.count:
+            records = []
+            # Titles are unique by construction (the marked index), also against the real
+            # catalog, so a per-chunk set keeps memory flat.
+            seen_titles = set()
+            while len(records) < min(args.chunk_size, args.count - written):
+                index += 1
+                record, skip_reason = transform_anime(model.sample(rng, index), studio_map, tag_map, seen_titles)
+                if skip_reason:
+                    # Real NSFW/Music entries are sampled too; they are dropped exactly as in autoinsert3.py.
+                    skip_reasons[skip_reason.rsplit(' - ', 1)[-1].split(':')[0]] += 1
+                    continue
+                records.append(record)
+
+            f.write("START TRANSACTION;\n")
+            write_anime_inserts(f, ANIME_COLUMNS, records, first_id=written + 1)
+            f.write("COMMIT;\n")
+            written += len(records)
+            bar.update(len(records))
+
+    print(f"✅ Synthetic insert script generated as: {output_filename}")
+    print(f"📦 Total Entries: {written}")
+    if skip_reasons:
+        print(f"⏭️ Resampled: {', '.join(f'{reason} x{n}' for reason, n in skip_reasons.most_common())}")
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,39 @@
-import requests
+from jikan_http import get_json
+from id_registry import IdRegistry, export_maps
 
 # Jikan API endpoint for anime genres/tags
 url = "https://api.jikan.moe/v4/genres/anime"
 
-# Send GET request
-response = requests.get(url)
+# Send GET request (goes through jikan_http, so it can be recorded/replayed)
+status, data = get_json(url)
 
 # Check if the request was successful
-if response.status_code == 200:
-    data = response.json()
+if status == 200:
     genres = data.get("data", [])
 
     # Start building SQL
     sql_lines = ["-- Insert statements for anime tags/genres"]
-    sql_lines.append("INSERT INTO Tags (tag)")
+    sql_lines.append("INSERT INTO Tags (TagID, tag)")
     sql_lines.append("VALUES")
 
+    # Permanent TagIDs from the registry, so new genres never renumber existing tags
+    tags = {}
+    with IdRegistry() as registry:
+        for genre in genres:
+            # tags.tag is UNIQUE under utf8mb4_0900_ai_ci, so skip case/accent-only variants
+            name = genre.get("name", "")
+            tag_id = registry.resolve('tag', name, genre.get("mal_id"))
+            tags.setdefault(tag_id, name)
+        tags.setdefault(registry.resolve('tag', "NO TAGS"), "NO TAGS")
+        export_maps(registry)
+
     values = []
-    for genre in genres:
-        tag_name = genre.get("name", "").replace("'", "''")  # Escape single quotes
-        values.append(f"('{tag_name}')")
+    for tag_id, tag in sorted(tags.items()):
+        tag_name = tag.replace("'", "''")  # Escape single quotes
+        values.append(f"({tag_id}, '{tag_name}')")
 
     # Join values with commas, add semicolon at end
-    sql_lines.append(",\n".join(values) + ",\n('NO TAGS');")
+    sql_lines.append(",\n".join(values) + ";")
 
     # Write to file
     with open("insert_tags.sql", "w", encoding="utf-8") as f:
@@ -30,4 +41,4 @@ if response.status_code == 200:
 
     print("✅ SQL file 'insert_tags.sql' created successfully.")
 else:
-    print(f"❌ Failed to fetch genres: HTTP {response.status_code}")
+    print(f"❌ Failed to fetch genres: HTTP {status}")
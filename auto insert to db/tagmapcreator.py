@@ -1,3 +1,6 @@
+import os
+from id_registry import IdRegistry, write_map_file, REGISTRY_FILE
+
 def generate_tag_map(sql_file, output_file):
     tag_map = {}
     with open(sql_file, 'r', encoding='utf-8') as file:
@@ -31,4 +34,10 @@ def generate_tag_map(sql_file, output_file):
 
 # Run the script
 if __name__ == "__main__":
-    generate_tag_map("insert_tags.sql", "tag_map.txt")
+    # Positions in insert_tags.sql are not stable IDs once the registry assigns them.
+    if os.path.exists(REGISTRY_FILE):
+        with IdRegistry() as registry:
+            write_map_file(registry.name_map('tag'), "tag_map.txt", "tag_map")
+        print("Tag map exported from", REGISTRY_FILE)
+    else:
+        generate_tag_map("insert_tags.sql", "tag_map.txt")
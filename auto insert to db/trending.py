@@ -0,0 +1,131 @@
+import argparse
+import numpy as np
+import tqdm
+from db_connection import get_connection
+
+# Computes time-decayed trending scores per anime from watchlist activity and
+# stores the top entries per window in the small `anime_trending` table, so
+# the homepage carousels can read a few dozen pre-ranked rows instead of
+# counting the whole watchlist table.
+#
+# Every watchlist row contributes two events: being added (date_added) and,
+# if it changed later, a status update (last_updated, weighted lower).
+# An event of age t inside a window W is worth exp(-ln2 * t / (W / 2)),
+# i.e. it loses half its weight every half window. Events older than W are ignored.
+
+# Must match the window whitelist in controllers/animeController.js getTrendingAnimes.
+WINDOWS = {'24h': 24 * 3600, '7d': 7 * 24 * 3600, '30d': 30 * 24 * 3600}
+UPDATE_WEIGHT = 0.5
+TOP_N = 30
+CHUNK_SIZE = 50000
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS `anime_trending` (
+  `window_name` varchar(8) NOT NULL,
+  `trend_rank` int NOT NULL,
+  `AnimeID` int NOT NULL,
+  `score` double NOT NULL,
+  `computed_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`window_name`, `trend_rank`),
+  KEY `AnimeID` (`AnimeID`),
+  CONSTRAINT `anime_trending_ibfk_1`
+        FOREIGN KEY (`AnimeID`) REFERENCES `anime` (`AnimeID`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
+"""
+
+def parse_window(text):
+    """Returns (name, seconds) for one of the served WINDOWS; other windows would never be read."""
+    if text not in WINDOWS:
+        raise argparse.ArgumentTypeError(f"Invalid window: {text} (the API serves {', '.join(WINDOWS)})")
+    return text, WINDOWS[text]
+
+def decay(ages, window):
+    weights = np.exp(-np.log(2) * ages / (window / 2))
+    weights[(ages < 0) | (ages > window)] = 0.0
+    return weights
+
+def accumulate(scores, anime_ids, weights):
+    """Adds per-event weights into the dense per-AnimeID score array, growing it as needed."""
+    needed = int(anime_ids.max()) + 1
+    if needed > len(scores):
+        scores = np.concatenate([scores, np.zeros(needed - len(scores))])
+    scores[:needed] += np.bincount(anime_ids, weights=weights, minlength=needed)
+    return scores
+
+def compute_scores(conn, windows):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT UNIX_TIMESTAMP()")
+        now = float(cursor.fetchone()[0])
+
+    scores = {name: np.zeros(0) for name in windows}
+    longest = max(windows.values())
+
+    with conn.cursor() as cursor:
+        # Rows that have not been touched within the longest window cannot contribute.
+        cursor.execute("""
+            SELECT AnimeID, UNIX_TIMESTAMP(date_added), UNIX_TIMESTAMP(last_updated)
+            FROM watchlist
+            WHERE GREATEST(COALESCE(date_added, 0), COALESCE(last_updated, 0)) >= FROM_UNIXTIME(%s)
+        """, (int(now - longest),))
+
+        progress = tqdm.tqdm(desc="📈 Scanning watchlist", unit="row")
+        while True:
+            chunk = cursor.fetchmany(CHUNK_SIZE)
+            if not chunk:
+                break
+            data = np.array(chunk, dtype=np.float64)
+            data = np.nan_to_num(data, nan=0.0)
+            anime_ids = data[:, 0].astype(np.int64)
+            added_age = now - data[:, 1]
+            updated_age = now - data[:, 2]
+            # Only count the update event when it is a real change after the insert.
+            has_update = data[:, 2] > data[:, 1]
+
+            for name, window in windows.items():
+                weights = decay(added_age, window)
+                weights += np.where(has_update, UPDATE_WEIGHT * decay(updated_age, window), 0.0)
+                scores[name] = accumulate(scores[name], anime_ids, weights)
+
+            progress.update(len(chunk))
+        progress.close()
+
+    return scores
+
+def top_entries(scores, top_n):
+    if not len(scores):
+        return []
+    candidates = np.flatnonzero(scores > 0)
+    order = candidates[np.argsort(-scores[candidates], kind='stable')][:top_n]
+    return [(rank, int(anime_id), float(scores[anime_id])) for rank, anime_id in enumerate(order, start=1)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute decayed trending scores into anime_trending.")
+    parser.add_argument('--window', type=parse_window, action='append',
+                        help="Trending window, repeatable (default: 24h, 7d, 30d)")
+    parser.add_argument('--top', type=int, default=TOP_N, help="Entries kept per window")
+    args = parser.parse_args()
+
+    windows = dict(args.window) if args.window else WINDOWS
+    print(f"🔥 Computing trending scores for windows: {', '.join(windows)}")
+
+    conn = get_connection(streaming=True)
+    try:
+        scores = compute_scores(conn, windows)
+        with conn.cursor() as cursor:
+            cursor.execute(CREATE_TABLE_SQL)
+            for name in windows:
+                entries = top_entries(scores[name], args.top)
+                cursor.execute("DELETE FROM anime_trending WHERE window_name = %s", (name,))
+                cursor.executemany(
+                    "INSERT INTO anime_trending (window_name, trend_rank, AnimeID, score) VALUES (%s, %s, %s, %s)",
+                    [(name, *entry) for entry in entries]
+                )
+                print(f"   {name}: {len(entries)} trending anime")
+        conn.commit()
+    finally:
+        conn.close()
+
+    print("✅ All done!")
+
+if __name__ == "__main__":
+    main()
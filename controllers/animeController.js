@@ -57,7 +57,7 @@ const searchAnime = async (req, res) => {
         const [results] = await db.query(`
             SELECT 
                 a.AnimeID, a.title, a.type, a.episodes, a.status, a.airing_start, 
-                a.airing_end, a.rating, a.synopsis, a.image_url,
+                a.airing_end, a.rating, a.synopsis_short AS synopsis, a.image_url,
                 s.studio_name, s.rating AS studio_rating, 
                 GROUP_CONCAT(DISTINCT t2.tag ORDER BY t2.tag SEPARATOR ', ') AS genres
             FROM Anime a
@@ -125,7 +125,7 @@ const getAnimeSpotlight = async (req, res) => {
             a.airing_start,
             a.airing_end,
             a.rating,
-            a.synopsis,
+            a.synopsis_short AS synopsis,
             a.image_url,
             s.studio_name,
             s.rating AS studio_rating,
@@ -161,7 +161,7 @@ const getNewAnimes = async (req, res) => {
             a.airing_start,
             a.airing_end,
             a.rating,
-            a.synopsis,
+            a.synopsis_short AS synopsis,
             a.image_url,
             s.studio_name,
             s.rating AS studio_rating,
@@ -196,7 +196,7 @@ const getUpcomingAnimes = async (req, res) => {
             a.airing_start,
             a.airing_end,
             a.rating,
-            a.synopsis,
+            a.synopsis_short AS synopsis,
             a.image_url,
             s.studio_name,
             s.rating AS studio_rating,
@@ -231,7 +231,7 @@ const getRecommendedAnimes = async (req, res) => {
             a.airing_start,
             a.airing_end,
             a.rating,
-            a.synopsis,
+            a.synopsis_short AS synopsis,
             a.image_url,
             s.studio_name,
             s.rating AS studio_rating,
@@ -257,6 +257,39 @@ const getRecommendedAnimes = async (req, res) => {
 };
 
 const getRandomAnimes = async (req, res) => {
+    // Random picks are a range read over the shuffled permutation kept in
+    // anime_random_rank by "auto insert to db/random_pool.py".
+    const poolQuery = `
+        SELECT 
+            a.AnimeID,
+            a.title,
+            a.type,
+            a.episodes,
+            a.status,
+            a.airing_start,
+            a.airing_end,
+            a.rating,
+            a.synopsis_short AS synopsis,
+            a.image_url,
+            s.studio_name,
+            s.rating AS studio_rating,
+            GROUP_CONCAT(t.tag ORDER BY t.tag SEPARATOR ', ') AS genres
+        FROM (
+            SELECT AnimeID, random_rank
+            FROM anime_random_rank
+            WHERE random_rank >= ?
+            ORDER BY random_rank
+            LIMIT 5
+        ) r
+        JOIN Anime a ON a.AnimeID = r.AnimeID
+        JOIN Studio s ON a.StudioID = s.StudioID
+        JOIN Anime_Tags at ON a.AnimeID = at.AnimeID
+        JOIN Tags t ON at.TagID = t.TagID
+        GROUP BY a.AnimeID, r.random_rank
+        ORDER BY r.random_rank;
+    `;
+
+    // Fallback for databases where the pool has not been built yet.
     const query = `
         SELECT 
             a.AnimeID,
@@ -267,7 +300,7 @@ const getRandomAnimes = async (req, res) => {
             a.airing_start,
             a.airing_end,
             a.rating,
-            a.synopsis,
+            a.synopsis_short AS synopsis,
             a.image_url,
             s.studio_name,
             s.rating AS studio_rating,
@@ -282,6 +315,23 @@ const getRandomAnimes = async (req, res) => {
     `;
 
     try {
+        let maxRank = null;
+        try {
+            [[{ maxRank }]] = await db.query('SELECT MAX(random_rank) AS maxRank FROM anime_random_rank');
+        } catch (err) {
+            // random_pool.py is optional, so the table may not exist at all.
+            if (err.code !== 'ER_NO_SUCH_TABLE') {
+                throw err;
+            }
+        }
+        if (maxRank !== null) {
+            const start = Math.floor(Math.random() * Math.max(maxRank - 3, 1));
+            const [results] = await db.query(poolQuery, [start]);
+            if (results.length > 0) {
+                return res.json(results);
+            }
+        }
+
         const [results] = await db.query(query);
         res.json(results);
     } catch (err) {
@@ -301,7 +351,7 @@ const getAllAnimes = async (req, res) => {
             a.airing_start,
             a.airing_end,
             a.rating,
-            a.synopsis,
+            a.synopsis_short AS synopsis,
             a.image_url,
             s.studio_name,
             s.rating AS studio_rating,
@@ -350,7 +400,7 @@ const getMostWatchlistedAnimes = async (req, res) => {
             a.airing_start,
             a.airing_end,
             a.rating,
-            a.synopsis,
+            a.synopsis_short AS synopsis,
             a.image_url,
             s.studio_name,
             s.rating AS studio_rating,
@@ -375,6 +425,44 @@ const getMostWatchlistedAnimes = async (req, res) => {
     }
 };
 
+const getTrendingAnimes = async (req, res) => {
+    // Scores are precomputed per window by "auto insert to db/trending.py".
+    const windowName = ['24h', '7d', '30d'].includes(req.query.window) ? req.query.window : '7d';
+    const query = `
+        SELECT 
+            a.AnimeID,
+            a.title,
+            a.type,
+            a.episodes,
+            a.status,
+            a.airing_start,
+            a.airing_end,
+            a.rating,
+            a.synopsis_short AS synopsis,
+            a.image_url,
+            s.studio_name,
+            s.rating AS studio_rating,
+            GROUP_CONCAT(t.tag ORDER BY t.tag SEPARATOR ', ') AS genres,
+            tr.score AS trending_score
+        FROM anime_trending tr
+        JOIN Anime a ON a.AnimeID = tr.AnimeID
+        JOIN Studio s ON a.StudioID = s.StudioID
+        JOIN Anime_Tags at ON a.AnimeID = at.AnimeID
+        JOIN Tags t ON at.TagID = t.TagID
+        WHERE tr.window_name = ?
+        GROUP BY a.AnimeID, tr.trend_rank, tr.score
+        ORDER BY tr.trend_rank ASC;
+    `;
+
+    try {
+        const [results] = await db.query(query, [windowName]);
+        res.json(results);
+    } catch (err) {
+        console.error(err);
+        res.status(500).json({ error: 'Database error' });
+    }
+};
+
 module.exports = {
     getFocusAnime,
     searchAnime,
@@ -386,4 +474,5 @@ module.exports = {
     getAllAnimes,
     getAllTags,
     getMostWatchlistedAnimes,
+    getTrendingAnimes,
 };
\ No newline at end of file
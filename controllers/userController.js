@@ -23,7 +23,7 @@ const getUserSpotlight = async (req, res) => {
                     a.airing_start,
                     a.airing_end,
                     a.rating,
-                    a.synopsis,
+                    a.synopsis_short AS synopsis,
                     a.image_url,
                     s.studio_name,
                     s.rating AS studio_rating,
@@ -73,7 +73,7 @@ const getUserSpotlight = async (req, res) => {
                 a.airing_start,
                 a.airing_end,
                 a.rating,
-                a.synopsis,
+                a.synopsis_short AS synopsis,
                 a.image_url,
                 s.studio_name,
                 s.rating AS studio_rating,
@@ -112,7 +112,7 @@ const getUserSpotlight = async (req, res) => {
                     a.airing_start,
                     a.airing_end,
                     a.rating,
-                    a.synopsis,
+                    a.synopsis_short AS synopsis,
                     a.image_url,
                     s.studio_name,
                     s.rating AS studio_rating,
@@ -157,7 +157,7 @@ const getWatchlist = async (req, res) => {
             a.airing_start, 
             a.airing_end, 
             a.rating, 
-            a.synopsis, 
+            a.synopsis_short AS synopsis, 
             a.image_url,
             s.studio_name, 
             s.rating AS studio_rating,
@@ -201,7 +201,7 @@ const getCompletedWatchlist = async (req, res) => {
             a.airing_start, 
             a.airing_end, 
             a.rating, 
-            a.synopsis, 
+            a.synopsis_short AS synopsis, 
             a.image_url,
             s.studio_name, 
             s.rating AS studio_rating,
@@ -0,0 +1,213 @@
+import argparse
+import glob
+import json
+import os
+import sys
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Compares the Lighthouse JSON reports in this folder run over run.
+#
+# Reports are streamed with ijson: only the handful of audits we care about are
+# materialized, the rest of each multi-MB file (screenshots, traces, stack
+# packs) is skipped event by event. ijson is required
+# (performance_reports/requirements.txt); the script refuses to run without it
+# rather than loading whole reports.
+#
+# Usage:
+#   pip install -r performance_reports/requirements.txt
+#   python performance_reports/lighthouse_trends.py
+#   python performance_reports/lighthouse_trends.py --baseline localhost_3000-20251206T213724.json --fail-on-regression
+
+REPORT_GLOB = 'localhost_3000-*.json'
+SLOWEST_REQUESTS = 5
+
+# audit id -> (label, unit)
+METRIC_AUDITS = {
+    'first-contentful-paint': ('FCP', 'ms'),
+    'largest-contentful-paint': ('LCP', 'ms'),
+    'total-blocking-time': ('TBT', 'ms'),
+    'cumulative-layout-shift': ('CLS', ''),
+    'speed-index': ('Speed Index', 'ms'),
+    'interactive': ('TTI', 'ms'),
+    'total-byte-weight': ('Total bytes', 'B'),
+}
+DETAIL_AUDITS = {'resource-summary', 'network-requests'}
+
+# label -> (relative increase, absolute increase); both must be exceeded to flag a regression.
+REGRESSION_THRESHOLDS = {
+    'FCP': (0.10, 100),
+    'LCP': (0.10, 100),
+    'TBT': (0.20, 50),
+    'CLS': (0.25, 0.02),
+    'Speed Index': (0.10, 100),
+    'TTI': (0.10, 100),
+    'Total bytes': (0.10, 50_000),
+    'Performance score': (0.05, 0.03), # Checked as a decrease, see is_regression
+}
+
+def read_report(path):
+    """
+    Returns {'fetchTime', 'score', 'audits': {id: audit}} with only the audits
+    listed in METRIC_AUDITS / DETAIL_AUDITS.
+    """
+    wanted = set(METRIC_AUDITS) | DETAIL_AUDITS
+    report = {'fetchTime': None, 'score': None, 'audits': {}}
+
+    builders = {}
+    with open(path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == 'fetchTime':
+                report['fetchTime'] = value
+            elif prefix == 'categories.performance.score':
+                report['score'] = value
+            elif prefix.startswith('audits.'):
+                audit_id = prefix.split('.', 2)[1]
+                if audit_id in wanted:
+                    builders.setdefault(audit_id, ijson.ObjectBuilder()).event(event, value)
+
+    report['audits'] = {audit_id: builder.value for audit_id, builder in builders.items()}
+    return report
+
+def extract_metrics(report):
+    metrics = {}
+    for audit_id, (label, _) in METRIC_AUDITS.items():
+        audit = report['audits'].get(audit_id)
+        if audit and audit.get('numericValue') is not None:
+            metrics[label] = float(audit['numericValue'])
+    if report['score'] is not None:
+        metrics['Performance score'] = float(report['score'])
+
+    summary = report['audits'].get('resource-summary', {}).get('details', {}).get('items', [])
+    for item in summary:
+        metrics[f"{item['label']} transfer"] = float(item.get('transferSize', 0))
+        metrics[f"{item['label']} requests"] = float(item.get('requestCount', 0))
+
+    return metrics
+
+def slowest_requests(report, limit=SLOWEST_REQUESTS):
+    items = report['audits'].get('network-requests', {}).get('details', {}).get('items', [])
+    timed = [
+        (item['networkEndTime'] - item['networkRequestTime'], item['url'], item.get('transferSize', 0))
+        for item in items
+        if item.get('networkEndTime') is not None and item.get('networkRequestTime') is not None
+    ]
+    return sorted(timed, reverse=True)[:limit]
+
+def is_regression(label, base, current):
+    if label not in REGRESSION_THRESHOLDS or base is None or current is None:
+        return False
+    relative, absolute = REGRESSION_THRESHOLDS[label]
+    delta = (base - current) if label == 'Performance score' else (current - base)
+    return delta > absolute and (base == 0 or delta / abs(base) > relative)
+
+def format_value(label, value):
+    if value is None:
+        return '-'
+    if label in ('CLS', 'Performance score'):
+        return f"{value:.3f}"
+    if 'transfer' in label or label == 'Total bytes':
+        return f"{value / 1024:,.1f} KiB"
+    if 'requests' in label:
+        return f"{value:.0f}"
+    return f"{value:,.0f} ms"
+
+def format_delta(label, base, current):
+    if base is None or current is None:
+        return ''
+    delta = current - base
+    pct = f" ({delta / base:+.1%})" if base else ''
+    if label in ('CLS', 'Performance score'):
+        return f"{delta:+.3f}{pct}"
+    if 'transfer' in label or label == 'Total bytes':
+        return f"{delta / 1024:+,.1f} KiB{pct}"
+    return f"{delta:+,.0f}{pct}"
+
+def print_table(runs, baseline_name):
+    names = [name for name, _, _ in runs]
+    labels = list(dict.fromkeys(label for _, metrics, _ in runs for label in metrics))
+    base_metrics = next(metrics for name, metrics, _ in runs if name == baseline_name)
+    regressions = []
+
+    width = max(len(label) for label in labels) + 2
+    print(f"Baseline: {baseline_name}\n")
+    print("".ljust(width) + "".join(name[-20:].rjust(24) for name in names))
+    for label in labels:
+        row = label.ljust(width)
+        for _, metrics, _ in runs:
+            row += format_value(label, metrics.get(label)).rjust(24)
+        print(row)
+
+    print("\nRun-over-run changes")
+    for (prev_name, prev, _), (name, current, _) in zip(runs, runs[1:]):
+        print(f"\n  {prev_name} -> {name}")
+        for label in labels:
+            delta = format_delta(label, prev.get(label), current.get(label))
+            if delta:
+                print(f"    {label.ljust(width)}{delta}")
+
+    for name, metrics, _ in runs:
+        if name == baseline_name:
+            continue
+        for label, value in metrics.items():
+            if is_regression(label, base_metrics.get(label), value):
+                regressions.append((name, label, base_metrics[label], value))
+
+    print("\nSlowest network requests")
+    for name, _, slow in runs:
+        print(f"\n  {name}")
+        for duration, url, size in slow:
+            print(f"    {duration:8,.0f} ms {size / 1024:9,.1f} KiB  {url[:100]}")
+
+    return regressions
+
+def main():
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Compare Lighthouse JSON reports run over run.")
+    parser.add_argument('reports', nargs='*', help=f"Report files (default: {REPORT_GLOB} in this folder)")
+    parser.add_argument('--baseline', help="Report to flag regressions against (default: the oldest run)")
+    parser.add_argument('--json', action='store_true', help="Print the extracted metrics as JSON instead of tables")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with status 1 if any regression is flagged")
+    args = parser.parse_args()
+
+    if ijson is None:
+        print("❌ ijson is required to stream the reports: pip install -r performance_reports/requirements.txt")
+        sys.exit(1)
+
+    paths = args.reports or sorted(glob.glob(os.path.join(here, REPORT_GLOB)))
+    if not paths:
+        print("❌ No Lighthouse reports found.")
+        sys.exit(1)
+
+    runs = []
+    for path in paths:
+        report = read_report(path)
+        runs.append((os.path.basename(path), extract_metrics(report), slowest_requests(report), report['fetchTime']))
+    # fetchTime is ISO-8601, so sorting it sorts the runs chronologically.
+    runs.sort(key=lambda run: run[3] or '')
+    runs = [(name, metrics, slow) for name, metrics, slow, _ in runs]
+
+    baseline_name = os.path.basename(args.baseline) if args.baseline else runs[0][0]
+    if baseline_name not in [name for name, _, _ in runs]:
+        report = read_report(args.baseline)
+        runs.insert(0, (baseline_name, extract_metrics(report), slowest_requests(report)))
+
+    if args.json:
+        print(json.dumps({name: {'metrics': metrics, 'slowest_requests': slow} for name, metrics, slow in runs}, indent=2))
+        return
+
+    regressions = print_table(runs, baseline_name)
+    if regressions:
+        print("\n🚨 Regressions against baseline")
+        for name, label, base, value in regressions:
+            print(f"  {name}: {label} {format_value(label, base)} -> {format_value(label, value)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+    else:
+        print("\n✅ No regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
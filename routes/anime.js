@@ -13,5 +13,6 @@ router.get('/anime/random-animes', animeController.getRandomAnimes);
 router.get('/anime/all-animes', animeController.getAllAnimes);
 router.get('/anime/all-tags', animeController.getAllTags);
 router.get('/anime/mostwatchlist-animes', animeController.getMostWatchlistedAnimes);
+router.get('/anime/trending-animes', animeController.getTrendingAnimes);
 
 module.exports = router;
\ No newline at end of file